@@ -1,4 +1,14 @@
 from .contact import Contact
+from .columnar import ColumnarContacts
+from .mmap_contacts import MmapContacts, write_mmap_file
+from .sqlite_contacts import SqliteContacts
 from .address_book import AddressBook
 
-__all__ = ["Contact", "AddressBook"]
+__all__ = [
+    "Contact",
+    "AddressBook",
+    "ColumnarContacts",
+    "MmapContacts",
+    "write_mmap_file",
+    "SqliteContacts",
+]
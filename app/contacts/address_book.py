@@ -1,5 +1,14 @@
+import threading
+from bisect import bisect_left, insort
 from collections import UserDict
-from .contact import Contact
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from .contact import Contact, normalize_name
+from .columnar import ColumnarContacts
+from .mmap_contacts import MmapContacts
+from .sqlite_contacts import SqliteContacts
+from .trigram_index import TrigramIndex
+from .secondary_index import SecondaryIndex, normalize_email, normalize_phone
 from utils.errors import ContactNotFoundError
 from app.logs import logger
 
@@ -10,12 +19,364 @@ class AddressBook(UserDict):
 
     Attributes:
         data (dict): A dictionary containing the user's contacts for later saving to a file.
+        mutations (int): Number of changes since the book was created; storage
+            handlers compare it with the value they last saved to skip unchanged books.
 
     Methods:
         add_contact(contact): Adds a new contact to the dictionary.
+        add_contacts(contacts): Adds many contacts at once, skipping duplicates.
         remove_contact(fullname): Removes a contact by the user's full name
+        get_by_fullname(fullname): Returns a contact by full name (case-insensitive) or None.
+        find_contact(fullname): Returns a contact by full name or raises ContactNotFoundError.
+        iter_sorted(prefix): Yields contacts sorted by full name, optionally filtered by a name prefix.
+        sorted_slice(start, stop): Yields the contacts at positions start..stop of the sorted order.
+        search_prefix(prefix, limit): Returns contacts whose full name starts with a prefix.
+        search_fuzzy(query, limit): Returns contacts with full names similar to a query.
+        get_by_phone(phone): Returns the contacts with a phone number (reverse lookup).
+        get_by_email(email): Returns the contacts with an email address (reverse lookup).
+        change_phone(fullname, phone): Changes the phone number of a contact.
+        change_email(fullname, email): Changes the email address of a contact.
+        subscribe(listener): Registers a callback notified about every mutation.
     """
 
+    ENGINES = {
+        "dict": dict,
+        "columnar": ColumnarContacts,
+    }
+
+    # Contacts read from storage on access; they bring their own name index and sorted order
+    FILE_BACKED = (MmapContacts, SqliteContacts)
+
+    def __init__(self, contacts=None, engine: str = "dict") -> None:
+        """
+        Initialize an AddressBook.
+
+        The normalized full name index maps a normalized full name (see
+        normalize_name) to the key under which the contact is stored in 'data',
+        so lookups do not have to scan every contact. It is built on first use
+        and then kept in sync by __setitem__ and __delitem__.
+
+        :param contacts: Initial contacts keyed by full name (optional).
+        :type contacts: Mapping[str, Contact], optional
+        :param engine: Storage engine for 'data': "dict" (one Contact object per entry)
+            or "columnar" (ColumnarContacts, materializes Contact objects on access).
+        :type engine: str
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f'Unknown engine "{engine}". Available: {", ".join(self.ENGINES)}.')
+
+        # Normalized full name -> key, built on first use (see _name_index)
+        self._names = None
+        # Sorted normalized names, built on first use and then kept in order on every change
+        self._sorted_names = None
+        # Trigram index for fuzzy search, built on first use and then kept in sync
+        self._trigram_index = None
+        # Reverse lookup indexes (SecondaryIndex), built on first use and then kept in sync
+        self._phone_index = None
+        self._email_index = None
+        # Builds the indexes above once when several threads need one at the same time,
+        # e.g. the reader threads of the daemon, which share a read lock
+        self._index_lock = threading.RLock()
+        self._listeners = []
+        self.mutations = 0
+        super().__init__()
+
+        storage = self.ENGINES[engine]
+        if isinstance(contacts, self.FILE_BACKED):
+            # File-backed contacts bring their own on-disk name index, so nothing is decoded here
+            self.data = contacts
+            self._names = contacts.name_index
+        elif isinstance(contacts, storage):
+            # Adopt loaded data of the same engine as is; the index is built when first needed
+            self.data = contacts
+        else:
+            self.data = storage()
+            if contacts is not None:
+                self.update(contacts)
+        # Loading the initial contacts is not a change
+        self.mutations = 0
+
+    normalize_name = staticmethod(normalize_name)
+
+    @property
+    def _name_index(self) -> dict:
+        """
+        Return the normalized full name index, building it on first use.
+
+        A one-shot command such as "phone John Smith" usually finds the contact
+        under its exact key (see _key_of) and never pays for indexing the whole book.
+        """
+        if self._names is None:
+            return self._build_once(
+                "_names", lambda: {self.normalize_name(key): key for key in self.data}
+            )
+        return self._names
+
+    def _build_once(self, attribute: str, build: Callable[[], object]):
+        """
+        Build a lazy index and store it in 'attribute', unless another thread just did.
+
+        The callers check the attribute for None first, so an index that
+        exists is used without taking the lock.
+        """
+        with self._index_lock:
+            index = getattr(self, attribute)
+            if index is None:
+                index = build()
+                setattr(self, attribute, index)
+            return index
+
+    def _key_of(self, fullname: Optional[str]) -> Optional[str]:
+        """
+        Return the key under which the contact with this full name is stored, or None.
+        """
+        if self._names is None and fullname in self.data:
+            # Exact key: no need to build the index yet
+            return fullname
+        return self._name_index.get(self.normalize_name(fullname))
+
+    def __setitem__(self, key: str, contact: Contact) -> None:
+        name = self.normalize_name(key)
+        # The sorted and trigram indexes only exist once the name index does
+        if self._names is not None and name not in self._names:
+            if self._sorted_names is not None:
+                insort(self._sorted_names, name)
+            if self._trigram_index is not None:
+                self._trigram_index.add(name)
+        if self._phone_index is not None or self._email_index is not None:
+            previous = self.data.get(key)
+            if previous is not None:
+                self._unindex_fields(key, previous.phone, previous.email)
+            self._index_fields(key, contact.phone, contact.email)
+        self.data[key] = contact
+        self.mutations += 1
+        if self._names is not None:
+            self._names[name] = key
+
+    def __delitem__(self, key: str) -> None:
+        name = self.normalize_name(key)
+        if self._phone_index is not None or self._email_index is not None:
+            contact = self.data[key]
+            self._unindex_fields(key, contact.phone, contact.email)
+        del self.data[key]
+        self.mutations += 1
+        if self._names is not None:
+            self._names.pop(name, None)
+        if self._sorted_names is not None:
+            position = bisect_left(self._sorted_names, name)
+            if position < len(self._sorted_names) and self._sorted_names[position] == name:
+                del self._sorted_names[position]
+        if self._trigram_index is not None:
+            self._trigram_index.remove(name)
+
+    def _index_fields(self, key: str, phone: Optional[str], email: Optional[str]) -> None:
+        if self._phone_index is not None:
+            self._phone_index.add(phone, key)
+        if self._email_index is not None:
+            self._email_index.add(email, key)
+
+    def _unindex_fields(self, key: str, phone: Optional[str], email: Optional[str]) -> None:
+        if self._phone_index is not None:
+            self._phone_index.remove(phone, key)
+        if self._email_index is not None:
+            self._email_index.remove(email, key)
+
+    def _sorted(self) -> list:
+        """
+        Return the sorted list of normalized names, sorting the index only the first time.
+        """
+        if self._sorted_names is None:
+            return self._build_once("_sorted_names", lambda: sorted(self._name_index))
+        return self._sorted_names
+
+    def subscribe(self, listener: Callable[[str, Contact], None]) -> None:
+        """
+        Register a callback that is called after every mutation of the address book.
+
+        The callback receives the operation name ("add", "update" or "delete")
+        and the affected Contact object. Storage backends use it to persist
+        single changes instead of rewriting the whole book.
+
+        :param listener: Callable taking (operation, contact).
+        :type listener: Callable[[str, Contact], None]
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, operation: str, contact: Contact) -> None:
+        for listener in self._listeners:
+            listener(operation, contact)
+
+    def get_by_fullname(self, fullname: Optional[str]) -> Optional[Contact]:
+        """
+        Return the contact with the given full name, or None if it does not exist.
+
+        The lookup goes through the normalized name index and is case-insensitive.
+
+        :param fullname: Full name of the contact to look up.
+        :type fullname: str | None
+        :return: The matching contact or None.
+        :rtype: Contact | None
+        """
+        key = self._key_of(fullname)
+        if key is None:
+            return None
+        return self.data.get(key)
+
+    def find_contact(self, fullname: Optional[str]) -> Contact:
+        """
+        Return the contact with the given full name.
+
+        :param fullname: Full name of the contact to look up.
+        :type fullname: str | None
+        :return: The matching contact.
+        :rtype: Contact
+        :raises ContactNotFoundError: If the contact does not exist.
+        """
+        person = self.get_by_fullname(fullname)
+        if person is None:
+            logger.warning('Contact "%s" does not exist.', fullname)
+            raise ContactNotFoundError(f'Contact "{fullname}" does not exist.')
+        return person
+
+    def iter_sorted(self, prefix: Optional[str] = None) -> Iterator[Contact]:
+        """
+        Yield contacts one at a time in normalized full name order.
+
+        The sorted order is kept incrementally, so the first matching name is
+        found by binary search and contacts are materialized while they are
+        yielded. A file-backed book (MmapContacts, SqliteContacts) is already
+        sorted on disk and is read sequentially.
+
+        :param prefix: Only yield contacts whose full name starts with this prefix (case-insensitive).
+        :type prefix: str, optional
+        """
+        prefix = self.normalize_name(prefix)
+
+        if isinstance(self.data, self.FILE_BACKED):
+            yield from self.data.iter_sorted(prefix)
+            return
+
+        names = self._sorted()
+        position = bisect_left(names, prefix)
+        while position < len(names) and names[position].startswith(prefix):
+            yield self.data[self._name_index[names[position]]]
+            position += 1
+
+    def sorted_slice(self, start: int, stop: Optional[int] = None) -> Iterator[Contact]:
+        """
+        Yield the contacts at positions start..stop of the sorted order (for paging).
+
+        For in-memory books this costs O(stop - start) because the sorted order
+        is already maintained; a file-backed book is read sequentially up to 'stop'.
+
+        :param start: Position of the first contact.
+        :type start: int
+        :param stop: Position after the last contact (None for the end of the book).
+        :type stop: int, optional
+        """
+        if isinstance(self.data, self.FILE_BACKED):
+            yield from islice(self.data.iter_sorted(), start, stop)
+            return
+
+        for name in self._sorted()[start:stop]:
+            yield self.data[self._name_index[name]]
+
+    def search_prefix(self, prefix: str, limit: Optional[int] = None) -> List[Contact]:
+        """
+        Return contacts whose full name starts with 'prefix' (case-insensitive), sorted by name.
+
+        The maintained sorted order is binary-searched, so a query costs
+        O(log n + number of results) instead of a scan over the book.
+
+        :param prefix: Beginning of the full name.
+        :type prefix: str
+        :param limit: Maximum number of results (None for all).
+        :type limit: int, optional
+        :return: Matching contacts.
+        :rtype: List[Contact]
+        """
+        return list(islice(self.iter_sorted(prefix), limit))
+
+    def search_fuzzy(self, query: str, limit: int = 10) -> List[Contact]:
+        """
+        Return contacts whose full names are most similar to 'query', best match first.
+
+        The trigram index is built the first time this method is called and is
+        then updated by every add and delete.
+
+        :param query: Approximate full name, e.g. "Jonh Smit".
+        :type query: str
+        :param limit: Maximum number of results.
+        :type limit: int
+        :return: Matching contacts.
+        :rtype: List[Contact]
+        """
+        trigram_index = self._trigram_index
+        if trigram_index is None:
+            trigram_index = self._build_once(
+                "_trigram_index", lambda: TrigramIndex(self._name_index)
+            )
+        results = trigram_index.search(self.normalize_name(query), limit)
+        return [self.data[self._name_index[name]] for _, name in results]
+
+    def get_by_phone(self, phone: Optional[str]) -> List[Contact]:
+        """
+        Return the contacts with the given phone number (reverse lookup, e.g. for caller ID).
+
+        Numbers are compared by their digits only (see normalize_phone), so
+        "+380501234567" and "+380 50 123 45 67" are the same number. The hash
+        index is built the first time this method is called and is then updated
+        by every add, change and delete. An SQLite book uses its own phone index.
+
+        :param phone: Phone number to look up.
+        :type phone: str | None
+        :return: Matching contacts sorted by full name (usually one or none).
+        :rtype: List[Contact]
+        """
+        if isinstance(self.data, SqliteContacts):
+            return self.data.get_by_phone(phone)
+        index = self._phone_index
+        if index is None:
+            index = self._build_once(
+                "_phone_index", lambda: self._build_index(normalize_phone, "phone")
+            )
+        return [self.data[key] for key in index.get(phone)]
+
+    def get_by_email(self, email: Optional[str]) -> List[Contact]:
+        """
+        Return the contacts with the given email address (case-insensitive reverse lookup).
+
+        The hash index is built the first time this method is called and is then
+        updated by every add, change and delete. An SQLite book uses its own email index.
+
+        :param email: Email address to look up.
+        :type email: str | None
+        :return: Matching contacts sorted by full name (usually one or none).
+        :rtype: List[Contact]
+        """
+        if isinstance(self.data, SqliteContacts):
+            return self.data.get_by_email(email)
+        index = self._email_index
+        if index is None:
+            index = self._build_once(
+                "_email_index", lambda: self._build_index(normalize_email, "email")
+            )
+        return [self.data[key] for key in index.get(email)]
+
+    def _build_index(self, normalize: Callable[[Optional[str]], str], field: str) -> SecondaryIndex:
+        """
+        Build a SecondaryIndex over one field of every contact with a single pass over the book.
+        """
+        index = SecondaryIndex(normalize)
+        if isinstance(self.data, self.FILE_BACKED):
+            # Decode the file sequentially; contacts are stored under their full names
+            for contact in self.data.iter_contacts():
+                index.add(getattr(contact, field), contact.fullname)
+        else:
+            for key, contact in self.data.items():
+                index.add(getattr(contact, field), key)
+        return index
+
     def add_contact(self, contact: Contact) -> None:
         """
         Add a Contact object to the 'data' dictionary (inherited from UserDict).
@@ -27,10 +388,66 @@ class AddressBook(UserDict):
         :param contact: Contact object to be added
         :type contact: Contact
         """
-        if contact.fullname in self.data:
-            logger.warning(f"Contact {contact.fullname} already exists.")
+        if self.get_by_fullname(contact.fullname) is not None:
+            logger.warning("Contact %s already exists.", contact.fullname)
             raise ValueError(f"Contact {contact.fullname} already exists.")
-        self.data[contact.fullname] = contact
+        self[contact.fullname] = contact
+        self._notify("add", contact)
+
+    def add_contacts(self, contacts: Iterable[Contact]) -> Tuple[int, List[Contact]]:
+        """
+        Add many Contact objects at once (bulk import).
+
+        Unlike add_contact, an existing full name does not raise an error and is
+        not logged; the contact is returned in the list of duplicates instead.
+
+        :param contacts: Contact objects to be added
+        :type contacts: Iterable[Contact]
+        :return: The number of added contacts and the list of skipped duplicates.
+        :rtype: Tuple[int, List[Contact]]
+        """
+        if isinstance(self.data, SqliteContacts):
+            return self._add_contacts_sqlite(contacts)
+        added = 0
+        duplicates = []
+        for contact in contacts:
+            if self._name_index.get(self.normalize_name(contact.fullname)) is not None:
+                duplicates.append(contact)
+                continue
+            self[contact.fullname] = contact
+            self._notify("add", contact)
+            added += 1
+        return added, duplicates
+
+    def _add_contacts_sqlite(self, contacts: Iterable[Contact]) -> Tuple[int, List[Contact]]:
+        """
+        add_contacts for SqliteContacts: one existence query per chunk and one transaction.
+
+        Adding the contacts one by one would commit every row on its own and
+        query the database twice per row.
+        """
+        new = {}
+        duplicates = []
+        contacts = list(contacts)
+        existing = self.data.existing_names(
+            self.normalize_name(contact.fullname) for contact in contacts
+        )
+        for contact in contacts:
+            name = self.normalize_name(contact.fullname)
+            if name in existing or name in new:
+                duplicates.append(contact)
+                continue
+            new[name] = contact
+        self.data.insert_many(new.values())
+        self.mutations += len(new)
+        for name, contact in new.items():
+            # The name index is the database's own; keep the in-memory ones in sync
+            if self._sorted_names is not None:
+                insort(self._sorted_names, name)
+            if self._trigram_index is not None:
+                self._trigram_index.add(name)
+            self._notify("add", contact)
+        return len(new), duplicates
 
     def remove_contact(self, fullname: str) -> None:
         """
@@ -43,8 +460,59 @@ class AddressBook(UserDict):
         :param fullname: Full name of the Contact object to remove
         :type fullname: str
         """
-        if fullname in self.data:
-            del self.data[fullname]
+        key = self._key_of(fullname)
+        if key is not None and key in self.data:
+            contact = self.data[key]
+            del self[key]
+            self._notify("delete", contact)
         else:
-            logger.warning(f"Contact not found: {fullname}")
+            logger.warning("Contact not found: %s", fullname)
             raise ContactNotFoundError(f'Contact "{fullname}" does not exist.')
+
+    def change_phone(self, fullname: str, phone: str) -> Contact:
+        """
+        Change the phone number of an existing contact.
+
+        :param fullname: Full name of the contact to change.
+        :type fullname: str
+        :param phone: New phone number.
+        :type phone: str
+        :return: The changed contact.
+        :rtype: Contact
+        :raises ContactNotFoundError: If the contact does not exist.
+        """
+        key = self._key_of(fullname)
+        person = self.find_contact(fullname)
+        if self._phone_index is not None:
+            self._phone_index.remove(person.phone, key)
+            self._phone_index.add(phone, key)
+        person.phone = phone
+        # Write back, since a columnar engine hands out materialized copies
+        self.data[key] = person
+        self.mutations += 1
+        self._notify("update", person)
+        return person
+
+    def change_email(self, fullname: str, email: str) -> Contact:
+        """
+        Change the email address of an existing contact.
+
+        :param fullname: Full name of the contact to change.
+        :type fullname: str
+        :param email: New email address.
+        :type email: str
+        :return: The changed contact.
+        :rtype: Contact
+        :raises ContactNotFoundError: If the contact does not exist.
+        """
+        key = self._key_of(fullname)
+        person = self.find_contact(fullname)
+        if self._email_index is not None:
+            self._email_index.remove(person.email, key)
+            self._email_index.add(email, key)
+        person.email = email
+        # Write back, since a columnar engine hands out materialized copies
+        self.data[key] = person
+        self.mutations += 1
+        self._notify("update", person)
+        return person
@@ -0,0 +1,193 @@
+from array import array
+from collections.abc import MutableMapping
+from typing import Iterator, Optional
+from .contact import Contact
+
+
+class _DictionaryColumn:
+    """
+    Column of strings that repeat a lot (first and last names).
+
+    Every distinct value is stored once in 'values'; rows keep a 4-byte id.
+    Id 0 is reserved for None.
+    """
+
+    __slots__ = ("ids", "values", "lookup")
+
+    def __init__(self) -> None:
+        self.ids = array("I")
+        self.values = [None]
+        self.lookup = {None: 0}
+
+    def _encode(self, value: Optional[str]) -> int:
+        value_id = self.lookup.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self.values.append(value)
+            self.lookup[value] = value_id
+        return value_id
+
+    def append(self, value: Optional[str]) -> None:
+        self.ids.append(self._encode(value))
+
+    def set(self, row: int, value: Optional[str]) -> None:
+        self.ids[row] = self._encode(value)
+
+    def get(self, row: int) -> Optional[str]:
+        return self.values[self.ids[row]]
+
+
+class _HeapColumn:
+    """
+    Column of mostly unique strings (emails) stored as one UTF-8 heap plus offset arrays.
+
+    Overwritten values stay in the heap until the column is rebuilt; a length
+    of NONE_LENGTH marks a missing value.
+    """
+
+    __slots__ = ("heap", "offsets", "lengths")
+
+    NONE_LENGTH = 0xFFFFFFFF
+
+    def __init__(self) -> None:
+        self.heap = bytearray()
+        self.offsets = array("Q")
+        self.lengths = array("I")
+
+    def _store(self, value: Optional[str]) -> tuple[int, int]:
+        if value is None:
+            return 0, self.NONE_LENGTH
+        encoded = value.encode("utf-8")
+        offset = len(self.heap)
+        self.heap += encoded
+        return offset, len(encoded)
+
+    def append(self, value: Optional[str]) -> None:
+        offset, length = self._store(value)
+        self.offsets.append(offset)
+        self.lengths.append(length)
+
+    def set(self, row: int, value: Optional[str]) -> None:
+        self.offsets[row], self.lengths[row] = self._store(value)
+
+    def get(self, row: int) -> Optional[str]:
+        length = self.lengths[row]
+        if length == self.NONE_LENGTH:
+            return None
+        offset = self.offsets[row]
+        return self.heap[offset : offset + length].decode("utf-8")
+
+
+class _PhoneColumn:
+    """
+    Column of phone numbers packed as integers.
+
+    A phone "+<digits>" is stored as the integer value of its digits and the
+    number of digits (so leading zeros survive). A digit count of 0 marks a
+    missing phone; values that do not have this form go to a small fallback dict.
+    """
+
+    __slots__ = ("numbers", "digits", "other")
+
+    def __init__(self) -> None:
+        self.numbers = array("q")
+        self.digits = array("B")
+        self.other = {}
+
+    def _pack(self, row: int, value: Optional[str]) -> tuple[int, int]:
+        self.other.pop(row, None)
+        if value is None:
+            return 0, 0
+        if value[:1] == "+" and value[1:].isdigit() and len(value) <= 19:
+            return int(value[1:]), len(value) - 1
+        self.other[row] = value
+        return 0, 0
+
+    def append(self, value: Optional[str]) -> None:
+        number, digits = self._pack(len(self.numbers), value)
+        self.numbers.append(number)
+        self.digits.append(digits)
+
+    def set(self, row: int, value: Optional[str]) -> None:
+        self.numbers[row], self.digits[row] = self._pack(row, value)
+
+    def get(self, row: int) -> Optional[str]:
+        digits = self.digits[row]
+        if digits == 0:
+            return self.other.get(row)
+        return "+" + str(self.numbers[row]).zfill(digits)
+
+
+class ColumnarContacts(MutableMapping):
+    """
+    Columnar storage engine for AddressBook.
+
+    Instead of one Contact object per entry, the fields are kept in columns:
+    dictionary-encoded first/last names, integer-packed phones and a UTF-8
+    heap of emails. Contact objects are materialized only when a value is
+    requested, so changes must be written back with __setitem__ (AddressBook
+    does this in its change_* methods).
+
+    Rows of deleted contacts are reused by the next insert.
+    """
+
+    def __init__(self) -> None:
+        self._rows = {}
+        self._free = []
+        self._first_names = _DictionaryColumn()
+        self._last_names = _DictionaryColumn()
+        self._phones = _PhoneColumn()
+        self._emails = _HeapColumn()
+
+    def _columns(self) -> tuple:
+        return self._first_names, self._last_names, self._phones, self._emails
+
+    def __getitem__(self, fullname: str) -> Contact:
+        return self._materialize(self._rows[fullname])
+
+    def _materialize(self, row: int) -> Contact:
+        return Contact(
+            self._first_names.get(row),
+            self._last_names.get(row),
+            self._phones.get(row),
+            self._emails.get(row),
+        )
+
+    def __setitem__(self, fullname: str, contact: Contact) -> None:
+        values = (contact.first_name, contact.last_name, contact.phone, contact.email)
+        row = self._rows.get(fullname)
+
+        if row is None and self._free:
+            row = self._free.pop()
+
+        if row is None:
+            self._rows[fullname] = len(self._first_names.ids)
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+        else:
+            self._rows[fullname] = row
+            for column, value in zip(self._columns(), values):
+                column.set(row, value)
+
+    def __delitem__(self, fullname: str) -> None:
+        row = self._rows.pop(fullname)
+        self._phones.set(row, None)
+        self._free.append(row)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, fullname: object) -> bool:
+        return fullname in self._rows
+
+    def copy(self) -> "ColumnarContacts":
+        """
+        Return a compacted copy without the garbage left by deletes and email changes.
+        """
+        copy = ColumnarContacts()
+        for fullname, row in self._rows.items():
+            copy[fullname] = self._materialize(row)
+        return copy
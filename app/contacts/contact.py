@@ -1,6 +1,24 @@
+import sys
 from typing import Optional
 
 
+def normalize_name(fullname: Optional[str]) -> str:
+    """
+    Build the lookup key for a full name.
+
+    Collapses repeated whitespace and folds the case, so "john  SMITH"
+    and "John Smith" resolve to the same contact.
+
+    :param fullname: Full name to normalize.
+    :type fullname: str | None
+    :return: Normalized full name.
+    :rtype: str
+    """
+    if not fullname:
+        return ""
+    return " ".join(fullname.split()).casefold()
+
+
 class Contact:
     """
     Class representing a person's contact information.
@@ -17,8 +35,16 @@ class Contact:
     Methods:
         __str__(): Returns a user-friendly string representation of the contact.
         __repr__(): Returns a developer-friendly string representation of the contact.
+
+    The class uses __slots__ to keep large address books compact. The full name is
+    built once and rebuilt only when first_name or last_name changes. Name parts
+    repeat heavily across a book, so they are interned while INTERN_NAMES is True.
     """
 
+    __slots__ = ("_first_name", "_last_name", "_fullname", "phone", "email")
+
+    INTERN_NAMES = True
+
     def __init__(
         self,
         first_name: Optional[str],
@@ -27,58 +53,101 @@ class Contact:
         email: Optional[str],
     ) -> None:
 
-        self.first_name = first_name
-        self.last_name = last_name
+        self._first_name = self._intern(first_name)
+        self._last_name = self._intern(last_name)
         self.phone = phone
         self.email = email
+        self._fullname = self._build_fullname()
 
-    @property
-    def fullname(self) -> Optional[str]:
+    @classmethod
+    def _intern(cls, value: Optional[str]) -> Optional[str]:
+        """
+        Return the interned copy of a name part if interning is enabled.
         """
-        Property that generates the 'fullname' of a Contact object.
+        if cls.INTERN_NAMES and value:
+            return sys.intern(value)
+        return value
+
+    def _build_fullname(self) -> Optional[str]:
+        """
+        Build the full name from the name parts.
 
         Checks the object's fields:
             - If both first_name and last_name are present, returns fullname as "first_name last_name".
             - If only first_name is present, returns fullname containing just the first_name.
         """
-        if self.first_name and self.last_name:
-            return f"{self.first_name} {self.last_name}"
+        if self._first_name and self._last_name:
+            return f"{self._first_name} {self._last_name}"
 
-        return self.first_name
+        return self._first_name
 
-    def __str__(self) -> str:
+    @property
+    def first_name(self) -> Optional[str]:
+        return self._first_name
+
+    @first_name.setter
+    def first_name(self, value: Optional[str]) -> None:
+        self._first_name = self._intern(value)
+        self._fullname = self._build_fullname()
+
+    @property
+    def last_name(self) -> Optional[str]:
+        return self._last_name
+
+    @last_name.setter
+    def last_name(self, value: Optional[str]) -> None:
+        self._last_name = self._intern(value)
+        self._fullname = self._build_fullname()
+
+    @property
+    def fullname(self) -> Optional[str]:
         """
-        Magic method __str__ that returns a user-friendly string representation of a Contact object.
+        Property that returns the 'fullname' of a Contact object.
 
-        If any field of the Contact object is None, it is displayed as '-' in the output.
+        The value is cached on construction and rebuilt when a name part changes.
         """
-        if self.fullname and self.phone and self.email:
-            return (
-                f"Fullname : {self.fullname}\n"
-                f"Phone    : {self.phone}\n"
-                f"Email    : {self.email}\n"
-                f"{'-' * 35}"
-            )
+        return self._fullname
 
-        elif self.fullname and self.phone is None and self.email:
-            return (
-                f"Fullname : {self.fullname}\n"
-                f"Phone    : -\n"
-                f"Email    : {self.email}\n"
-                f"{'-' * 35}"
-            )
+    def __getstate__(self) -> tuple:
+        """
+        Return the compact state stored by pickle: (first_name, last_name, phone, email).
+        """
+        return self._first_name, self._last_name, self.phone, self.email
 
-        elif self.fullname and self.phone and self.email is None:
-            return (
-                f"Fullname : {self.fullname}\n"
-                f"Phone    : {self.phone}\n"
-                f"Email    : -\n"
-                f"{'-' * 35}"
+    def __setstate__(self, state: tuple | dict) -> None:
+        """
+        Restore a Contact from pickle.
+
+        Accepts both the compact tuple state and the attribute dictionary
+        written by the former __dict__-based Contact, so existing contacts.bin
+        files keep loading.
+        """
+        if isinstance(state, dict):
+            state = (
+                state.get("first_name"),
+                state.get("last_name"),
+                state.get("phone"),
+                state.get("email"),
             )
+        self.__init__(*state)
 
-        else:
+    def __str__(self) -> str:
+        """
+        Magic method __str__ that returns a user-friendly string representation of a Contact object.
+
+        If any field of the Contact object is None, it is displayed as '-' in the output.
+        The layout is one template, so rendering a long list costs one format per contact.
+        """
+        if not self.fullname or (not self.phone and not self.email):
             return f"No contact information found for the name {self.fullname}.\n"
 
+        return (
+            f"Fullname : {self.fullname}\n"
+            f"Phone    : {self.phone or '-'}\n"
+            f"Email    : {self.email or '-'}\n"
+            f"{'-' * 35}"
+        )
+
     def __repr__(self) -> str:
         """
         Return a technical string representation of the Contact object suitable for debugging.
@@ -0,0 +1,364 @@
+import heapq
+import mmap
+import os
+import struct
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+from .contact import Contact, normalize_name
+
+
+class MmapFormat:
+    """
+    Layout of the memory-mapped contacts file.
+
+    The file consists of:
+        header:  magic, version, number of contacts, offsets of the index and the keys
+        records: for every contact four fields (first name, last name, phone, email),
+                 each stored as a uint16 length followed by UTF-8 bytes
+                 (NONE_LENGTH marks a missing field)
+        index:   one fixed-size entry per contact, sorted by the normalized full name:
+                 offset and length of the key, offset of the record
+        keys:    normalized full names in UTF-8, in index order
+
+    Records are written in index order, so reading them one after another
+    yields the contacts sorted by full name.
+    """
+
+    MAGIC = b"ABMM"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHHQQQ")
+    ENTRY = struct.Struct("<QHQ")
+    LENGTH = struct.Struct("<H")
+    NONE_LENGTH = 0xFFFF
+
+
+def _encode_record(contact: Contact) -> bytes:
+    parts = []
+    for value in (contact.first_name, contact.last_name, contact.phone, contact.email):
+        if value is None:
+            parts.append(MmapFormat.LENGTH.pack(MmapFormat.NONE_LENGTH))
+        else:
+            encoded = value.encode("utf-8")
+            parts.append(MmapFormat.LENGTH.pack(len(encoded)))
+            parts.append(encoded)
+    return b"".join(parts)
+
+
+def write_mmap_file(path: Path, contacts: Iterable[Contact], fsync: bool = False) -> int:
+    """
+    Write contacts to 'path' in the memory-mapped format.
+
+    The file is written to a temporary file first and then moved into place.
+
+    :param path: Destination file.
+    :type path: Path
+    :param contacts: Contacts to write (any order).
+    :type contacts: Iterable[Contact]
+    :param fsync: fsync the temporary file before moving it into place.
+    :type fsync: bool
+    :return: Number of written contacts.
+    :rtype: int
+    """
+    path = Path(path)
+    entries = sorted(
+        ((normalize_name(contact.fullname).encode("utf-8"), contact) for contact in contacts),
+        key=lambda entry: entry[0],
+    )
+
+    header_size = MmapFormat.HEADER.size
+    records = bytearray()
+    index = bytearray()
+    keys = bytearray()
+    for key, contact in entries:
+        index += MmapFormat.ENTRY.pack(len(keys), len(key), header_size + len(records))
+        records += _encode_record(contact)
+        keys += key
+
+    index_offset = header_size + len(records)
+    keys_offset = index_offset + len(index)
+    header = MmapFormat.HEADER.pack(
+        MmapFormat.MAGIC, MmapFormat.VERSION, 0, len(entries), index_offset, keys_offset
+    )
+
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    with temp_path.open("wb") as file:
+        file.write(header)
+        file.write(records)
+        file.write(index)
+        file.write(keys)
+        if fsync:
+            file.flush()
+            os.fsync(file.fileno())
+    temp_path.replace(path)
+    return len(entries)
+
+
+class MmapContacts(MutableMapping):
+    """
+    Contacts backed by a memory-mapped file, decoded only when they are accessed.
+
+    Opening the file reads just the header, so the cost does not depend on the
+    size of the book. A lookup binary-searches the sorted index and decodes
+    one record. Changes are kept in memory (an overlay of added/changed
+    contacts and a set of hidden file records) until the book is written back
+    with write_mmap_file().
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """
+        Open the contacts file at 'path'; a missing or empty file gives an empty book.
+
+        :raises ValueError: If the file is not in the memory-mapped format.
+        """
+        self.path = path
+        self._file = None
+        self._mm = None
+        self._count = 0
+        self._index_offset = 0
+        self._keys_offset = 0
+        self._overlay = {}
+        self._overlay_names = {}
+        self._hidden = set()
+        self._hidden_in_file = 0
+
+        if path is not None and Path(path).exists() and Path(path).stat().st_size > 0:
+            self._file = Path(path).open("rb")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, count, index_offset, keys_offset = MmapFormat.HEADER.unpack_from(
+                self._mm, 0
+            )
+            if magic != MmapFormat.MAGIC or version != MmapFormat.VERSION:
+                self.close()
+                raise ValueError(f"{path} is not a memory-mapped contacts file.")
+            self._count = count
+            self._index_offset = index_offset
+            self._keys_offset = keys_offset
+
+        self.name_index = _MmapNameIndex(self)
+
+    @property
+    def changed(self) -> bool:
+        """
+        True if there are changes that are not written to the file yet.
+        """
+        return bool(self._overlay or self._hidden)
+
+    def close(self) -> None:
+        """
+        Close the memory map and the underlying file.
+        """
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _key_at(self, position: int) -> bytes:
+        key_offset, key_length, _ = MmapFormat.ENTRY.unpack_from(
+            self._mm, self._index_offset + position * MmapFormat.ENTRY.size
+        )
+        start = self._keys_offset + key_offset
+        return self._mm[start : start + key_length]
+
+    def _record_offset(self, position: int) -> int:
+        _, _, record_offset = MmapFormat.ENTRY.unpack_from(
+            self._mm, self._index_offset + position * MmapFormat.ENTRY.size
+        )
+        return record_offset
+
+    def _lower_bound(self, key: bytes) -> int:
+        """
+        Binary-search the file index for the first position whose key is not less than 'key'.
+        """
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _find_record(self, normalized: str) -> Optional[int]:
+        """
+        Binary-search the file index for a normalized full name.
+
+        :return: Offset of the record, or None if the name is not in the file.
+        :rtype: int | None
+        """
+        if self._mm is None:
+            return None
+
+        key = normalized.encode("utf-8")
+        position = self._lower_bound(key)
+        if position < self._count and self._key_at(position) == key:
+            return self._record_offset(position)
+        return None
+
+    def _read_record(self, offset: int) -> tuple[Contact, int]:
+        """
+        Decode the record at 'offset'.
+
+        :return: The contact and the offset of the next record.
+        :rtype: tuple[Contact, int]
+        """
+        values = []
+        for _ in range(4):
+            (length,) = MmapFormat.LENGTH.unpack_from(self._mm, offset)
+            offset += MmapFormat.LENGTH.size
+            if length == MmapFormat.NONE_LENGTH:
+                values.append(None)
+            else:
+                values.append(self._mm[offset : offset + length].decode("utf-8"))
+                offset += length
+        return Contact(*values), offset
+
+    def _file_contact(self, normalized: str) -> Optional[Contact]:
+        if normalized in self._hidden:
+            return None
+        offset = self._find_record(normalized)
+        if offset is None:
+            return None
+        return self._read_record(offset)[0]
+
+    def _file_contacts(self) -> Iterator[Contact]:
+        """
+        Yield the contacts stored in the file in sorted order, skipping hidden ones.
+        """
+        if self._mm is None:
+            return
+        offset = MmapFormat.HEADER.size
+        for _ in range(self._count):
+            contact, offset = self._read_record(offset)
+            if not self._hidden or normalize_name(contact.fullname) not in self._hidden:
+                yield contact
+
+    def _hide(self, normalized: str) -> None:
+        if normalized not in self._hidden and self._find_record(normalized) is not None:
+            self._hidden_in_file += 1
+        self._hidden.add(normalized)
+
+    def __getitem__(self, fullname: str) -> Contact:
+        if fullname in self._overlay:
+            return self._overlay[fullname]
+        contact = self._file_contact(normalize_name(fullname))
+        if contact is None or contact.fullname != fullname:
+            raise KeyError(fullname)
+        return contact
+
+    def __setitem__(self, fullname: str, contact: Contact) -> None:
+        normalized = normalize_name(fullname)
+        self._hide(normalized)
+        self._overlay[fullname] = contact
+        self._overlay_names[normalized] = fullname
+
+    def __delitem__(self, fullname: str) -> None:
+        if fullname not in self:
+            raise KeyError(fullname)
+        normalized = normalize_name(fullname)
+        self._overlay.pop(fullname, None)
+        self._overlay_names.pop(normalized, None)
+        self._hide(normalized)
+
+    def __contains__(self, fullname: object) -> bool:
+        try:
+            self[fullname]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        for contact in self._file_contacts():
+            yield contact.fullname
+        yield from self._overlay
+
+    def __len__(self) -> int:
+        return self._count - self._hidden_in_file + len(self._overlay)
+
+    def iter_contacts(self) -> Iterator[Contact]:
+        """
+        Yield all contacts, decoding the file records sequentially.
+
+        Faster than values(), which looks every key up in the index.
+        """
+        yield from self._file_contacts()
+        yield from self._overlay.values()
+
+    def iter_sorted(self, prefix: str = "") -> Iterator[Contact]:
+        """
+        Yield contacts in normalized full name order, optionally only names starting with 'prefix'.
+
+        The file part is already sorted: the start is found by binary search and
+        records are decoded sequentially until the prefix no longer matches.
+        Contacts changed in memory are merged in.
+
+        :param prefix: Normalized full name prefix ("" for all contacts).
+        :type prefix: str
+        """
+        overlay = sorted(
+            (normalized, self._overlay[fullname])
+            for normalized, fullname in self._overlay_names.items()
+            if normalized.startswith(prefix)
+        )
+        merged = heapq.merge(self._file_range(prefix), overlay, key=lambda item: item[0])
+        for _, contact in merged:
+            yield contact
+
+    def _file_range(self, prefix: str) -> Iterator[tuple[str, Contact]]:
+        if self._mm is None:
+            return
+        key_prefix = prefix.encode("utf-8")
+        position = self._lower_bound(key_prefix)
+        offset = self._record_offset(position) if position < self._count else 0
+        while position < self._count:
+            key = self._key_at(position)
+            if not key.startswith(key_prefix):
+                break
+            contact, offset = self._read_record(offset)
+            normalized = key.decode("utf-8")
+            if normalized not in self._hidden:
+                yield normalized, contact
+            position += 1
+
+    def copy(self) -> dict:
+        """
+        Return all contacts as a dictionary keyed by full name.
+        """
+        return {contact.fullname: contact for contact in self.iter_contacts()}
+
+
+class _MmapNameIndex(MutableMapping):
+    """
+    Normalized full name index of MmapContacts, in the form AddressBook expects.
+
+    Names added in memory are kept in a dictionary; names from the file are
+    resolved with the file's sorted index.
+    """
+
+    def __init__(self, contacts: MmapContacts) -> None:
+        self._contacts = contacts
+
+    def __getitem__(self, normalized: str) -> str:
+        fullname = self._contacts._overlay_names.get(normalized)
+        if fullname is not None:
+            return fullname
+        contact = self._contacts._file_contact(normalized)
+        if contact is None:
+            raise KeyError(normalized)
+        return contact.fullname
+
+    def __setitem__(self, normalized: str, fullname: str) -> None:
+        self._contacts._overlay_names[normalized] = fullname
+
+    def __delitem__(self, normalized: str) -> None:
+        self[normalized]
+        self._contacts._overlay_names.pop(normalized, None)
+
+    def __iter__(self) -> Iterator[str]:
+        for fullname in self._contacts:
+            yield normalize_name(fullname)
+
+    def __len__(self) -> int:
+        return len(self._contacts)
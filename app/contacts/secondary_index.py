@@ -0,0 +1,65 @@
+from typing import Callable, List, Optional
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """
+    Build the lookup key for a phone number: its digits in E.164 form, without "+" and separators.
+    """
+    if not phone:
+        return ""
+    return "".join(character for character in phone if character.isdigit())
+
+
+def normalize_email(email: Optional[str]) -> str:
+    """
+    Build the lookup key for an email address: stripped and lowercased.
+    """
+    if not email:
+        return ""
+    return email.strip().lower()
+
+
+class SecondaryIndex:
+    """
+    Hash index from a normalized field value (phone or email) to the keys of the contacts having it.
+
+    A value used by one contact (the usual case) maps straight to its key;
+    only values shared by several contacts use a set.
+    """
+
+    def __init__(self, normalize: Callable[[Optional[str]], str]) -> None:
+        self.normalize = normalize
+        self._keys = {}
+
+    def add(self, value: Optional[str], key: str) -> None:
+        value = self.normalize(value)
+        if not value:
+            return
+        current = self._keys.get(value)
+        if current is None:
+            self._keys[value] = key
+        elif isinstance(current, set):
+            current.add(key)
+        elif current != key:
+            self._keys[value] = {current, key}
+
+    def remove(self, value: Optional[str], key: str) -> None:
+        value = self.normalize(value)
+        current = self._keys.get(value)
+        if current == key:
+            del self._keys[value]
+        elif isinstance(current, set):
+            current.discard(key)
+            if len(current) == 1:
+                self._keys[value] = current.pop()
+
+    def get(self, value: Optional[str]) -> List[str]:
+        """
+        Return the keys of the contacts with this value, sorted.
+        """
+        current = self._keys.get(self.normalize(value))
+        if current is None:
+            return []
+        if isinstance(current, set):
+            return sorted(current)
+        return [current]
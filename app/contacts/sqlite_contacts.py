@@ -0,0 +1,273 @@
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional
+from .contact import Contact, normalize_name
+from .secondary_index import normalize_email, normalize_phone
+
+if TYPE_CHECKING:
+    # For annotations only; sqlite3 itself is imported on use (see SqliteContacts.__init__)
+    import sqlite3
+
+
+class SqliteFormat:
+    """
+    Schema of the SQLite contacts database.
+
+    Every contact is one row keyed by its full name. The normalized full name,
+    the digits of the phone (normalize_phone) and the normalized email
+    (normalize_email) are stored next to the original values and indexed, so
+    lookups, prefix searches and reverse lookups are answered by the indexes.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS contacts (
+            fullname   TEXT PRIMARY KEY,
+            normalized TEXT NOT NULL,
+            first_name TEXT,
+            last_name  TEXT,
+            phone      TEXT,
+            email      TEXT,
+            phone_key  TEXT NOT NULL,
+            email_key  TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS contacts_normalized ON contacts (normalized);
+        CREATE INDEX IF NOT EXISTS contacts_phone ON contacts (phone_key);
+        CREATE INDEX IF NOT EXISTS contacts_email ON contacts (email_key);
+    """
+    COLUMNS = "first_name, last_name, phone, email"
+    UPSERT = (
+        "INSERT OR REPLACE INTO contacts "
+        "(fullname, normalized, first_name, last_name, phone, email, phone_key, email_key) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    # PRAGMA synchronous for every durability mode of utils.file_handler
+    SYNCHRONOUS = {"none": "OFF", "flush": "NORMAL", "fsync": "FULL", "fsync+dir": "EXTRA"}
+
+
+def _row(contact: Contact) -> tuple:
+    return (
+        contact.fullname,
+        normalize_name(contact.fullname),
+        contact.first_name,
+        contact.last_name,
+        contact.phone,
+        contact.email,
+        normalize_phone(contact.phone),
+        normalize_email(contact.email),
+    )
+
+
+class SqliteContacts(MutableMapping):
+    """
+    Contacts stored in an SQLite database and read only when they are accessed.
+
+    Opening the database reads nothing, so the book can be larger than the
+    memory. Every change is written as its own small transaction (the
+    connection is in autocommit mode) in WAL mode, so there is nothing left to
+    save on exit. Iteration in name order streams rows from a cursor.
+    """
+
+    # Names per "IN (...)" query; older SQLite versions allow at most 999 parameters
+    QUERY_CHUNK = 500
+
+    def __init__(self, path: Path, durability: str = "flush") -> None:
+        """
+        Open (or create) the contacts database at 'path'.
+
+        :param path: Database file.
+        :type path: Path
+        :param durability: Durability mode of utils.file_handler, mapped to PRAGMA synchronous.
+        :type durability: str
+        """
+        # Imported on use: sqlite3 would add ~20 ms to the start of every other storage mode
+        import sqlite3
+
+        self.path = path
+        # Autocommit: every statement outside an explicit BEGIN is its own transaction.
+        # The daemon reads from several threads; SQLite serializes the use of the connection.
+        self._connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA synchronous={SqliteFormat.SYNCHRONOUS[durability]}")
+        self._connection.executescript(SqliteFormat.SCHEMA)
+        self._count = None
+        self.name_index = _SqliteNameIndex(self)
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _query(self, sql: str, parameters: tuple = ()) -> "sqlite3.Cursor":
+        return self._connection.execute(sql, parameters)
+
+    def _contacts(self, sql: str, parameters: tuple = ()) -> Iterator[Contact]:
+        for row in self._query(sql, parameters):
+            yield Contact(*row)
+
+    def __getitem__(self, fullname: str) -> Contact:
+        row = self._query(
+            f"SELECT {SqliteFormat.COLUMNS} FROM contacts WHERE fullname = ?", (fullname,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(fullname)
+        return Contact(*row)
+
+    def __setitem__(self, fullname: str, contact: Contact) -> None:
+        if self._count is not None and fullname not in self:
+            self._count += 1
+        self._query(SqliteFormat.UPSERT, _row(contact))
+
+    def __delitem__(self, fullname: str) -> None:
+        if self._query("DELETE FROM contacts WHERE fullname = ?", (fullname,)).rowcount == 0:
+            raise KeyError(fullname)
+        if self._count is not None:
+            self._count -= 1
+
+    def __contains__(self, fullname: object) -> bool:
+        return (
+            self._query("SELECT 1 FROM contacts WHERE fullname = ?", (fullname,)).fetchone()
+            is not None
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        for (fullname,) in self._query("SELECT fullname FROM contacts"):
+            yield fullname
+
+    def __len__(self) -> int:
+        if self._count is None:
+            self._count = self._query("SELECT COUNT(*) FROM contacts").fetchone()[0]
+        return self._count
+
+    def insert_many(self, contacts: Iterable[Contact]) -> None:
+        """
+        Insert or replace many contacts in one transaction (e.g. when migrating a pickle file).
+
+        :param contacts: Contacts to store.
+        :type contacts: Iterable[Contact]
+        """
+        with self._connection:
+            self._connection.execute("BEGIN")
+            self._connection.executemany(SqliteFormat.UPSERT, map(_row, contacts))
+        self._count = None
+
+    def existing_names(self, names: Iterable[str]) -> set:
+        """
+        Return the normalized full names of 'names' that are already stored.
+
+        The names are looked up in chunks of QUERY_CHUNK on the normalized name
+        index, instead of one query per name.
+
+        :param names: Normalized full names.
+        :type names: Iterable[str]
+        :rtype: set
+        """
+        names = list(names)
+        existing = set()
+        for start in range(0, len(names), self.QUERY_CHUNK):
+            chunk = names[start : start + self.QUERY_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            existing.update(
+                normalized
+                for (normalized,) in self._query(
+                    f"SELECT normalized FROM contacts WHERE normalized IN ({placeholders})",
+                    tuple(chunk),
+                )
+            )
+        return existing
+
+    def iter_contacts(self) -> Iterator[Contact]:
+        """
+        Yield all contacts in storage order.
+        """
+        yield from self._contacts(f"SELECT {SqliteFormat.COLUMNS} FROM contacts")
+
+    def iter_sorted(self, prefix: str = "") -> Iterator[Contact]:
+        """
+        Yield contacts in normalized full name order, optionally only names starting with 'prefix'.
+
+        The range scan on the normalized name index streams rows from a cursor.
+
+        :param prefix: Normalized full name prefix ("" for all contacts).
+        :type prefix: str
+        """
+        if not prefix:
+            yield from self._contacts(
+                f"SELECT {SqliteFormat.COLUMNS} FROM contacts ORDER BY normalized"
+            )
+            return
+        # Every string starting with 'prefix' sorts between it and prefix + U+10FFFF
+        yield from self._contacts(
+            f"SELECT {SqliteFormat.COLUMNS} FROM contacts "
+            "WHERE normalized >= ? AND normalized < ? ORDER BY normalized",
+            (prefix, prefix + "\U0010ffff"),
+        )
+
+    def get_by_phone(self, phone: Optional[str]) -> List[Contact]:
+        """
+        Return the contacts with the given phone number, using the phone index.
+        """
+        key = normalize_phone(phone)
+        if not key:
+            return []
+        return list(
+            self._contacts(
+                f"SELECT {SqliteFormat.COLUMNS} FROM contacts WHERE phone_key = ? ORDER BY normalized",
+                (key,),
+            )
+        )
+
+    def get_by_email(self, email: Optional[str]) -> List[Contact]:
+        """
+        Return the contacts with the given email address, using the email index.
+        """
+        key = normalize_email(email)
+        if not key:
+            return []
+        return list(
+            self._contacts(
+                f"SELECT {SqliteFormat.COLUMNS} FROM contacts WHERE email_key = ? ORDER BY normalized",
+                (key,),
+            )
+        )
+
+    def copy(self) -> dict:
+        """
+        Return all contacts as a dictionary keyed by full name.
+        """
+        return {contact.fullname: contact for contact in self.iter_contacts()}
+
+
+class _SqliteNameIndex(MutableMapping):
+    """
+    Normalized full name index of SqliteContacts, in the form AddressBook expects.
+
+    Lookups go to the index on the normalized column; the rows themselves are
+    changed by SqliteContacts, so setting and deleting entries does nothing.
+    """
+
+    def __init__(self, contacts: SqliteContacts) -> None:
+        self._contacts = contacts
+
+    def __getitem__(self, normalized: str) -> str:
+        row = self._contacts._query(
+            "SELECT fullname FROM contacts WHERE normalized = ?", (normalized,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(normalized)
+        return row[0]
+
+    def __setitem__(self, normalized: str, fullname: str) -> None:
+        pass
+
+    def __delitem__(self, normalized: str) -> None:
+        self[normalized]
+
+    def __iter__(self) -> Iterator[str]:
+        for (normalized,) in self._contacts._query("SELECT normalized FROM contacts"):
+            yield normalized
+
+    def __len__(self) -> int:
+        return len(self._contacts)
@@ -0,0 +1,70 @@
+from collections import Counter
+from typing import Iterable, List, Tuple
+
+
+class TrigramIndex:
+    """
+    Trigram index over normalized full names for approximate ("fuzzy") search.
+
+    Every name is split into overlapping three-character pieces (padded with
+    spaces, so word starts and ends count too). A query is matched against
+    the names that share at least one trigram and ranked by the Dice
+    coefficient of the two trigram sets, so "jonh smit" still finds "john smith".
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self._postings = {}
+        for name in names:
+            self.add(name)
+
+    @staticmethod
+    def trigrams(name: str) -> set:
+        """
+        Return the set of trigrams of a normalized name.
+        """
+        padded = f"  {name} "
+        return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+    def add(self, name: str) -> None:
+        for trigram in self.trigrams(name):
+            self._postings.setdefault(trigram, set()).add(name)
+
+    def remove(self, name: str) -> None:
+        for trigram in self.trigrams(name):
+            names = self._postings.get(trigram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._postings[trigram]
+
+    def search(
+        self, query: str, limit: int = 10, threshold: float = 0.3
+    ) -> List[Tuple[float, str]]:
+        """
+        Find the names most similar to 'query'.
+
+        :param query: Normalized query.
+        :type query: str
+        :param limit: Maximum number of results.
+        :type limit: int
+        :param threshold: Minimal similarity (0..1) of a result.
+        :type threshold: float
+        :return: (similarity, name) pairs, best first.
+        :rtype: List[Tuple[float, str]]
+        """
+        query_trigrams = self.trigrams(query)
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._postings.get(trigram, ()))
+
+        results = []
+        for name, count in shared.items():
+            # A name has at least 'count' trigrams, so this bound skips hopeless candidates cheaply
+            if 2 * count / (len(query_trigrams) + count) < threshold:
+                continue
+            score = 2 * count / (len(query_trigrams) + len(self.trigrams(name)))
+            if score >= threshold:
+                results.append((score, name))
+
+        results.sort(key=lambda result: (-result[0], result[1]))
+        return results[:limit]
@@ -1,3 +1,3 @@
-from .logger import logger
+from .logger import logger, set_log_level, set_console_stream, stop_logging
 
-__all__ = ["logger"]
+__all__ = ["logger", "set_log_level", "set_console_stream", "stop_logging"]
@@ -1,10 +1,16 @@
+import atexit
 import logging
-from pathlib import Path
+import os
+import queue
 import sys
+import threading
+from pathlib import Path, PurePath
+
+# Level of the log file; override with $ADDRESS_BOOK_LOG_LEVEL or "--log-level <level>"
+DEFAULT_LEVEL = os.environ.get("ADDRESS_BOOK_LOG_LEVEL", "DEBUG").upper()
 
 # Creation of a logger object
 logger = logging.getLogger("assistant-bot")
-logger.setLevel(logging.DEBUG)
 
 # Creating a format for log formatting
 formatter = logging.Formatter(
@@ -13,7 +19,7 @@ formatter = logging.Formatter(
 
 # Creating a file handler for logging
 file_to_log = Path(__file__).resolve().parent / "app.log"
-file_handler = logging.FileHandler(file_to_log, mode="a", encoding="utf-8")
+file_handler = logging.FileHandler(file_to_log, mode="a", encoding="utf-8", delay=True)
 file_handler.setFormatter(formatter)
 
 # Creating a console handler for logging
@@ -21,8 +27,110 @@ console_handler = logging.StreamHandler(sys.stdout)
 console_handler.setFormatter(formatter)
 console_handler.setLevel(logging.WARNING)
 
-""" 
-Adds handlers to the logger so that log messages are sent both to the file and to the console, according to the configured level and format.
+
+class QueueWriter(logging.Handler):
+    """
+    Handler that puts records on a queue; a background thread passes them to 'target'.
+
+    Works like logging.handlers.QueueHandler with a QueueListener, without
+    importing logging.handlers (and socket, pickle, ...) on every start.
+    Records never leave the process, so formatting is left to the writer
+    thread; only arguments that may change before the thread gets to them
+    (e.g. a Contact) are formatted into the message right away.
+    """
+
+    IMMUTABLE_TYPES = (str, int, float, bool, type(None), PurePath)
+
+    def __init__(self, target: logging.Handler) -> None:
+        super().__init__()
+        self.target = target
+        self.queue = queue.SimpleQueue()
+        self._thread = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.args and not all(
+            isinstance(arg, self.IMMUTABLE_TYPES) for arg in record.args
+        ):
+            record.msg = record.getMessage()
+            record.args = None
+        self.queue.put(record)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._write, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def _write(self) -> None:
+        while (record := self.queue.get()) is not None:
+            if record.levelno >= self.target.level:
+                self.target.handle(record)
+
+    def stop(self) -> None:
+        """
+        Write out the queued records and stop the thread; safe to call more than once.
+        """
+        if self._thread is not None:
+            self.queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+"""
+File writes go through a queue to a background thread (QueueWriter), so logging
+never blocks a command on disk I/O. Console output stays synchronous: it only
+shows warnings and must appear before the next prompt.
 """
-logger.addHandler(file_handler)
+queue_handler = QueueWriter(file_handler)
+
+logger.addHandler(queue_handler)
 logger.addHandler(console_handler)
+
+
+def set_log_level(level: str) -> None:
+    """
+    Set the level of the log file, e.g. "DEBUG", "INFO" or "WARNING".
+
+    The console keeps showing warnings whatever the level. The logger itself
+    gets the lower of the two levels, so records below both are dropped by
+    logger.isEnabledFor() before any message is formatted, and records only
+    the console wants are not queued for the file.
+
+    :param level: Name of a logging level (case-insensitive).
+    :type level: str
+    :raises ValueError: If the level name is unknown.
+    """
+    value = logging.getLevelName(level.upper())
+    if not isinstance(value, int):
+        raise ValueError(f'Unknown log level: "{level}".')
+    queue_handler.setLevel(value)
+    file_handler.setLevel(value)
+    logger.setLevel(min(value, console_handler.level))
+
+
+def set_console_stream(stream) -> None:
+    """
+    Write the console warnings to another stream, e.g. sys.stderr when stdout
+    carries machine-readable output ("--output json").
+
+    :param stream: Text stream for the console handler.
+    """
+    console_handler.setStream(stream)
+
+
+def stop_logging() -> None:
+    """
+    Write out all queued records and stop the background writer thread.
+
+    Registered with atexit; safe to call more than once.
+    """
+    queue_handler.stop()
+    file_handler.close()
+
+
+queue_handler.start()
+atexit.register(stop_logging)
+
+try:
+    set_log_level(DEFAULT_LEVEL)
+except ValueError as error:
+    set_log_level("DEBUG")
+    logger.warning("%s Using DEBUG.", error)
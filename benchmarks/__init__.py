@@ -0,0 +1,3 @@
+# "utils" must be imported before "app.contacts": utils.file_handler imports
+# AddressBook, and AddressBook imports utils.errors.
+import utils  # noqa: F401
@@ -0,0 +1,54 @@
+"""
+Benchmark the first page of the `all` command against the size of the book.
+
+Run from the project root:
+    python -m benchmarks.bench_all_paging --sizes 10000 100000 1000000
+
+The sorted order is built once and then maintained, so after the first call
+"all --page 1 --size K" should cost time proportional to K.
+"""
+
+import argparse
+import os
+import timeit
+from contextlib import redirect_stdout
+from app.logs import logger
+from utils.command_handler import CommandHandler
+from benchmarks.synthetic import build_address_book
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    page_args = ["--page", "1", "--size", str(args.page_size)]
+    results = []
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for size in args.sizes:
+            handler = CommandHandler(build_address_book(size))
+            timer = timeit.default_timer
+
+            start = timer()
+            handler.handle_all(page_args)
+            first_call = timer() - start
+
+            start = timer()
+            for _ in range(args.repeat):
+                handler.handle_all(page_args)
+            page = (timer() - start) / args.repeat
+
+            start = timer()
+            handler.handle_all([])
+            full = timer() - start
+            results.append((size, first_call, page, full))
+
+    print(f"{'contacts':>10} | {'first call ms':>13} | {'page 1 ms':>9} | {'full all ms':>11}")
+    for size, first_call, page, full in results:
+        print(f"{size:>10} | {first_call * 1e3:>13.2f} | {page * 1e3:>9.3f} | {full * 1e3:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark "--batch" against piping the same command lines into the interactive loop.
+
+Run from the project root:
+    python -m benchmarks.bench_batch --commands 1000000
+
+The script adds contacts, looks them up and changes some phones; both modes
+run it in a fresh process against an empty book and save once at the end.
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from app.logs import logger
+from benchmarks.bench_daemon import PROJECT_PATH, RUN_MAIN
+from benchmarks.synthetic import generate_rows
+
+
+def write_script(path: Path, count: int) -> None:
+    """
+    Write 'count' commands: adds of count/2 contacts, then lookups and phone changes.
+    """
+    rows = list(generate_rows(count // 2, seed=3))
+    with path.open("w", encoding="utf-8") as script:
+        for first, last, phone, email in rows:
+            script.write(f"add {first} {last} {phone} {email}\n")
+        for number, (first, last, _, _) in enumerate(rows[: count - len(rows)]):
+            if number % 4:
+                script.write(f"phone {first} {last}\n")
+            else:
+                script.write(f"change_phone {first} {last} +1555{number:07d}\n")
+        script.write("exit\n")
+
+
+def run(directory: Path, script: Path, options: list) -> float:
+    directory.mkdir()
+    args = [sys.executable, "-c", RUN_MAIN.format(directory=str(directory)), *options]
+    start = timeit.default_timer()
+    with script.open("rb") as stdin:
+        subprocess.run(args, cwd=PROJECT_PATH, check=True, stdin=stdin, stdout=subprocess.DEVNULL)
+    return timeit.default_timer() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        script = directory / "script.txt"
+        write_script(script, args.commands)
+
+        results = [
+            ("interactive", run(directory / "interactive", script, [])),
+            ("--batch -", run(directory / "batch", script, ["--batch", "-"])),
+        ]
+
+    print(f"{args.commands} commands\n")
+    print(f"{'mode':>12} | {'seconds':>8} | {'commands/s':>10}")
+    for mode, elapsed in results:
+        print(f"{mode:>12} | {elapsed:>8.1f} | {args.commands / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark the memory used per contact with tracemalloc.
+
+Run from the project root:
+    python -m benchmarks.bench_contact_memory --size 100000
+
+Compares the former __dict__-based contact class with the __slots__ Contact.
+"""
+
+import argparse
+import tracemalloc
+from typing import Callable, Optional
+from app.contacts import Contact
+from benchmarks.synthetic import generate_rows
+
+
+class DictContact:
+    """
+    Copy of the former Contact layout: per-instance __dict__ and a fullname built on every access.
+    """
+
+    def __init__(
+        self,
+        first_name: Optional[str],
+        last_name: Optional[str],
+        phone: Optional[str],
+        email: Optional[str],
+    ) -> None:
+        self.first_name = first_name
+        self.last_name = last_name
+        self.phone = phone
+        self.email = email
+
+    @property
+    def fullname(self) -> Optional[str]:
+        if self.first_name and self.last_name:
+            return f"{self.first_name} {self.last_name}"
+        return self.first_name
+
+
+def bytes_per_contact(factory: Callable, size: int) -> float:
+    """
+    Measure the memory allocated per contact for a dictionary of 'size' contacts.
+
+    Every row is built from fresh string objects, like the ones produced by
+    parsing user input or loading a pickle file, and only the contacts are kept.
+
+    :param factory: Contact class to instantiate.
+    :type factory: Callable
+    :param size: Number of contacts.
+    :type size: int
+    :return: Allocated bytes per contact.
+    :rtype: float
+    """
+    rows = (tuple("".join(list(value)) for value in row) for row in generate_rows(size))
+
+    tracemalloc.start()
+    contacts = {}
+    for first_name, last_name, phone, email in rows:
+        contact = factory(first_name, last_name, phone, email)
+        contacts[contact.fullname] = contact
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    before = bytes_per_contact(DictContact, args.size)
+    after = bytes_per_contact(Contact, args.size)
+    Contact.INTERN_NAMES = False
+    no_intern = bytes_per_contact(Contact, args.size)
+    Contact.INTERN_NAMES = True
+
+    print(f"{'contacts':>10} | {'before B/contact':>16} | {'after B/contact':>15} | {'no intern':>9}")
+    print(f"{args.size:>10} | {before:>16.1f} | {after:>15.1f} | {no_intern:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Load test the daemon (main.py --serve) against one process per command.
+
+Run from the project root:
+    python -m benchmarks.bench_daemon --size 100000 --clients 16 --requests 2000
+
+Three ways of running the same "phone <name>" lookups from concurrent clients:
+    per-process    a fresh "main.py phone ..." process per request (no daemon)
+    thin client    a fresh process per request that forwards to the daemon
+    socket         clients talk to the daemon's socket directly
+"""
+
+import argparse
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from app.logs import logger
+from utils.daemon import forward_command
+from utils.file_handler import FileHandler
+from benchmarks.synthetic import generate_contacts
+
+PROJECT_PATH = Path(__file__).resolve().parent.parent
+
+RUN_MAIN = (
+    "import sys; from app.logs import logger; logger.disabled = True; "
+    "import main; sys.argv = ['main.py'] + sys.argv[1:]; main.main({directory!r})"
+)
+
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def load(request, commands: list, clients: int) -> tuple:
+    """
+    Run the commands from 'clients' concurrent threads; return (requests/s, p50 ms, p99 ms).
+    """
+
+    def timed(command: str) -> float:
+        start = timeit.default_timer()
+        request(command)
+        return timeit.default_timer() - start
+
+    start = timeit.default_timer()
+    with ThreadPoolExecutor(clients) as pool:
+        latencies = list(pool.map(timed, commands))
+    elapsed = timeit.default_timer() - start
+    return (
+        len(commands) / elapsed,
+        percentile(latencies, 0.50) * 1e3,
+        percentile(latencies, 0.99) * 1e3,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument(
+        "--process-requests",
+        type=int,
+        default=64,
+        help="requests for the process-per-request modes",
+    )
+    args = parser.parse_args()
+
+    logger.disabled = True
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        contacts = {contact.fullname: contact for contact in generate_contacts(args.size)}
+        FileHandler(directory / "contacts.bin", contacts).write_in_file()
+        commands = [f"phone {name}" for name in rng.choices(list(contacts), k=args.requests)]
+        del contacts
+
+        code = RUN_MAIN.format(directory=str(directory))
+
+        def run_process(command: str) -> None:
+            subprocess.run(
+                [sys.executable, "-c", code, *command.split()],
+                cwd=PROJECT_PATH,
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+
+        process_commands = commands[: args.process_requests]
+        results = [("per-process", load(run_process, process_commands, args.clients))]
+
+        socket_path = directory / "contacts.sock"
+        daemon = subprocess.Popen(
+            [sys.executable, "-c", code, "--serve"], cwd=PROJECT_PATH, stdout=subprocess.DEVNULL
+        )
+        try:
+            while not socket_path.exists():
+                time.sleep(0.05)
+            results.append(("thin client", load(run_process, process_commands, args.clients)))
+
+            def send(command: str) -> None:
+                forward_command(socket_path, command)
+
+            results.append(("socket", load(send, commands, args.clients)))
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    print(f"{args.size} contacts, {args.clients} concurrent clients\n")
+    print(f"{'mode':>12} | {'requests/s':>10} | {'p50 ms':>8} | {'p99 ms':>8}")
+    for mode, (rate, p50, p99) in results:
+        print(f"{mode:>12} | {rate:>10.1f} | {p50:>8.2f} | {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark the daemon with a mixed read/write workload at increasing client counts.
+
+Run from the project root:
+    python -m benchmarks.bench_daemon_mixed --size 100000 --clients 1 4 16 64 --writes 0.1
+
+Reads ("phone", "by_phone", "search") run concurrently in the daemon's reader
+threads; writes ("change_phone") are serialized by its writer task.
+"""
+
+import argparse
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from app.logs import logger
+from utils.daemon import forward_command
+from utils.file_handler import FileHandler
+from benchmarks.bench_daemon import PROJECT_PATH, RUN_MAIN, percentile
+from benchmarks.synthetic import generate_contacts
+
+
+def make_workload(contacts: dict, count: int, writes: float, rng: random.Random) -> list:
+    """
+    Build (is_write, command line) pairs with the given share of writes.
+    """
+    names = list(contacts)
+    workload = []
+    for number in range(count):
+        name = rng.choice(names)
+        if rng.random() < writes:
+            workload.append((True, f"change_phone {name} +1555{number:07d}"))
+            continue
+        kind = rng.randrange(3)
+        if kind == 0:
+            workload.append((False, f"phone {name}"))
+        elif kind == 1:
+            workload.append((False, f"by_phone {contacts[name].phone}"))
+        else:
+            workload.append((False, f"search --limit 5 {name[:4]}"))
+    return workload
+
+
+def run_load(socket_path: Path, workload: list, clients: int) -> dict:
+    def timed(item: tuple) -> tuple:
+        is_write, command_line = item
+        start = timeit.default_timer()
+        forward_command(socket_path, command_line)
+        return is_write, timeit.default_timer() - start
+
+    start = timeit.default_timer()
+    with ThreadPoolExecutor(clients) as pool:
+        results = list(pool.map(timed, workload))
+    elapsed = timeit.default_timer() - start
+
+    reads = [latency for is_write, latency in results if not is_write]
+    writes = [latency for is_write, latency in results if is_write] or [0.0]
+    return {
+        "rate": len(results) / elapsed,
+        "read p50": percentile(reads, 0.50) * 1e3,
+        "read p99": percentile(reads, 0.99) * 1e3,
+        "write p50": percentile(writes, 0.50) * 1e3,
+        "write p99": percentile(writes, 0.99) * 1e3,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--writes", type=float, default=0.1, help="share of write requests")
+    parser.add_argument("--storage", default="pickle", choices=["pickle", "journal", "mmap"])
+    args = parser.parse_args()
+
+    logger.disabled = True
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        contacts = {contact.fullname: contact for contact in generate_contacts(args.size)}
+        FileHandler(directory / "contacts.bin", contacts).write_in_file()
+        workload = make_workload(contacts, args.requests, args.writes, rng)
+        del contacts
+
+        socket_path = directory / "contacts.sock"
+        daemon = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                RUN_MAIN.format(directory=str(directory)),
+                "--storage",
+                args.storage,
+                "--serve",
+            ],
+            cwd=PROJECT_PATH,
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            while not socket_path.exists():
+                time.sleep(0.05)
+            # Warm up the lazily built indexes before measuring
+            run_load(socket_path, workload[:50], 1)
+
+            print(
+                f"{args.size} contacts, --storage {args.storage}, "
+                f"{args.writes:.0%} writes, {args.requests} requests\n"
+            )
+            print(
+                f"{'clients':>7} | {'requests/s':>10} | {'read p50':>8} | {'read p99':>8} | "
+                f"{'write p50':>9} | {'write p99':>9}"
+            )
+            for clients in args.clients:
+                result = run_load(socket_path, workload, clients)
+                print(
+                    f"{clients:>7} | {result['rate']:>10.0f} | {result['read p50']:>8.2f} | "
+                    f"{result['read p99']:>8.2f} | {result['write p50']:>9.2f} | "
+                    f"{result['write p99']:>9.2f}"
+                )
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+
+if __name__ == "__main__":
+    main()
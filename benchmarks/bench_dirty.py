@@ -0,0 +1,70 @@
+"""
+Benchmark read-only sessions on a large book with and without dirty tracking.
+
+Run from the project root:
+    python -m benchmarks.bench_dirty --sizes 100000 1000000 --repeat 3
+
+An interactive session ("phone <name>", "all --limit 10", "exit") is piped
+into a fresh process using the pickle storage. "always save" restores the old
+behaviour, where the book was rewritten on exit whether or not it was changed.
+Every run starts from the same contacts.bin.
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from app.logs import logger
+from utils.file_handler import FileHandler
+from benchmarks.bench_daemon import PROJECT_PATH, RUN_MAIN
+from benchmarks.synthetic import generate_contacts
+
+# Every handler considers the book changed, as before dirty tracking
+ALWAYS_SAVE = "from utils.file_handler import FileHandler; FileHandler.changed = lambda self, book: True; "
+
+
+def run(directory: Path, session: str, options: list, always_save: bool) -> float:
+    shutil.copyfile(directory / "original.bin", directory / "contacts.bin")
+    code = RUN_MAIN.format(directory=str(directory))
+    if always_save:
+        code = ALWAYS_SAVE + code
+    args = [sys.executable, "-c", code, *options]
+    start = timeit.default_timer()
+    subprocess.run(
+        args, cwd=PROJECT_PATH, check=True, input=session.encode(), stdout=subprocess.DEVNULL
+    )
+    return timeit.default_timer() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    print(f"{'contacts':>10} | {'engine':>8} | {'always save ms':>14} | {'dirty tracking ms':>17}")
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        for size in args.sizes:
+            contacts = {contact.fullname: contact for contact in generate_contacts(size)}
+            FileHandler(directory / "original.bin", contacts).write_in_file()
+            session = f"phone {next(iter(contacts))}\nall --limit 10\nexit\n"
+            del contacts
+
+            for engine in ("dict", "columnar"):
+                options = ["--engine", engine]
+                before, after = (
+                    min(run(directory, session, options, always_save) for _ in range(args.repeat))
+                    for always_save in (True, False)
+                )
+                print(
+                    f"{size:>10} | {engine:>8} | {before * 1e3:>14.1f} | {after * 1e3:>17.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
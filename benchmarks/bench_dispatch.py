@@ -0,0 +1,91 @@
+"""
+Benchmark command dispatch: the cost per command of routing it to its handler.
+
+Run from the project root:
+    python -m benchmarks.bench_dispatch --commands 200000
+
+For every command the table shows the time per call of contact_factory
+(parsing and ValidateData) and of CommandHandler.handle_command with all
+handle_* methods replaced by no-ops, i.e. the lookup of the command and the
+checks of its arguments without the work of the command. The last line runs
+a mixed script of the same commands with run_batch, with the real handlers.
+"""
+
+import argparse
+import contextlib
+import io
+import timeit
+from app.logs import logger
+from utils.batch import run_batch
+from utils.command_handler import CommandHandler
+from utils.contact_factory import contact_factory
+from benchmarks.synthetic import build_address_book, generate_rows
+
+
+class NoopHandler(CommandHandler):
+    """
+    CommandHandler whose handle_* methods do nothing, so only the dispatch is timed.
+    """
+
+
+for _name in dir(CommandHandler):
+    if _name.startswith("handle_") and _name != "handle_command":
+        setattr(NoopHandler, _name, lambda self, *args, **kwargs: True)
+
+
+def command_lines(first: str, last: str, phone: str, email: str) -> dict:
+    return {
+        "add": f"add Zed Zedson {phone} {email}",
+        "phone": f"phone {first} {last}",
+        "email": f"email {first} {last}",
+        "by_phone": f"by_phone {phone}",
+        "by_email": f"by_email {email}",
+        "c_p": f"c_p {first} {last} {phone}",
+        "change_email": f"change_email {first} {last} {email}",
+        "delete": f"delete Nobody Here",
+        "all": "all --limit 1",
+        "search": f"search {last[:4]}",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=200_000)
+    parser.add_argument("--contacts", type=int, default=10_000)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    address_book = build_address_book(args.contacts)
+    target = next(generate_rows(1))
+    lines = command_lines(*target)
+    noop = NoopHandler(address_book)
+
+    print(f"{args.commands} calls per command\n")
+    print(f"{'command':<13} | {'parse us':>8} | {'dispatch us':>11}")
+    for name, line in lines.items():
+        parse = timeit.timeit(lambda: contact_factory(line), number=args.commands)
+        parsed = contact_factory(line)
+        dispatch = timeit.timeit(
+            lambda: noop.handle_command(parsed[0], parsed[1], validated=True, args=parsed[2]),
+            number=args.commands,
+        )
+        print(
+            f"{name:<13} | {parse / args.commands * 1e6:>8.2f} | "
+            f"{dispatch / args.commands * 1e6:>11.2f}"
+        )
+
+    # Read-only and idempotent commands, so every line of the script does the same work
+    script = [lines[name] for name in ("phone", "email", "by_phone", "c_p", "search")]
+    script = script * (args.commands // len(script))
+    start = timeit.default_timer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = run_batch(script, address_book)
+    elapsed = timeit.default_timer() - start
+    print(
+        f"\nrun_batch: {len(script)} lines, {elapsed:.2f} s, "
+        f"{elapsed / len(script) * 1e6:.2f} us per line, {report.failed} failed"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark the cost of each durability mode of a save, with and without the checksum footer.
+
+Run from the project root:
+    python -m benchmarks.bench_durability --sizes 100 10000 100000
+
+For every mode the full book is saved with FileHandler.write_in_file(); the
+journal column is one appended change (flushed, or fsync'ed in the fsync modes).
+"""
+
+import argparse
+import tempfile
+import timeit
+from pathlib import Path
+from app.logs import logger
+from utils.file_handler import DURABILITY_MODES, FileHandler
+from utils.storage import JournalFileHandler
+from benchmarks.synthetic import build_address_book
+
+
+def bench_save(address_book, path: Path, durability: str, checksum: bool, repeat: int) -> float:
+    """
+    Measure one full save of the book, in milliseconds (best of 'repeat').
+    """
+    file_handler = FileHandler(path, {}, durability=durability, checksum=checksum)
+    file_handler.update_contacts(address_book)
+    return min(timeit.repeat(file_handler.write_in_file, number=1, repeat=repeat)) * 1e3
+
+
+def bench_append(size: int, path: Path, durability: str, mutations: int) -> float:
+    """
+    Measure one phone change appended to the journal, in milliseconds.
+    """
+    address_book = build_address_book(min(size, mutations))
+    file_handler = JournalFileHandler(
+        path, {}, min_compact_records=mutations + 1, durability=durability
+    )
+    file_handler.attach(address_book)
+    names = list(address_book.data)[:mutations]
+
+    start = timeit.default_timer()
+    for number, name in enumerate(names):
+        address_book.change_phone(name, f"+380{500000000 + number}")
+    elapsed = timeit.default_timer() - start
+    file_handler.close()
+    return elapsed / len(names) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mutations", type=int, default=50)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    print(
+        f"{'contacts':>10} | {'durability':>10} | {'save ms':>9} | "
+        f"{'no checksum':>11} | {'journal ms/op':>13}"
+    )
+    with tempfile.TemporaryDirectory(dir=Path.cwd()) as directory:
+        directory = Path(directory)
+        for size in args.sizes:
+            address_book = build_address_book(size)
+            for durability in DURABILITY_MODES:
+                save_ms = bench_save(
+                    address_book, directory / "checksum.bin", durability, True, args.repeat
+                )
+                plain_ms = bench_save(
+                    address_book, directory / "plain.bin", durability, False, args.repeat
+                )
+                append_ms = bench_append(
+                    size, directory / "journal.bin", durability, args.mutations
+                )
+                print(
+                    f"{size:>10} | {durability:>10} | {save_ms:>9.2f} | "
+                    f"{plain_ms:>11.2f} | {append_ms:>13.4f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark the dict and columnar AddressBook engines.
+
+Run from the project root:
+    python -m benchmarks.bench_engines --sizes 100000 1000000 5000000
+
+For every engine and size a book is saved with FileHandler, then loaded in a
+fresh process that reports load time, peak RSS and `all` listing throughput.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import timeit
+from contextlib import redirect_stdout
+from pathlib import Path
+from app.logs import logger
+from app.contacts import AddressBook
+from utils.command_handler import CommandHandler
+from utils.file_handler import FileHandler
+from benchmarks.synthetic import generate_contacts
+
+ENGINES = ["dict", "columnar"]
+
+
+def save_book(engine: str, size: int, path: Path) -> None:
+    """
+    Build a synthetic book with the given engine and save it with FileHandler.
+    """
+    address_book = AddressBook(engine=engine)
+    for contact in generate_contacts(size):
+        address_book[contact.fullname] = contact
+    file_handler = FileHandler(path, {})
+    file_handler.update_contacts(address_book)
+    file_handler.write_in_file()
+
+
+def peak_rss_mb() -> float:
+    """
+    Return the peak resident set size of this process in MB.
+
+    On Linux ru_maxrss survives exec and would report the parent's peak,
+    so VmHWM from /proc is preferred when it is available.
+    """
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure_load(engine: str, path: Path) -> dict:
+    """
+    Load a saved book and list it with the `all` command.
+
+    :return: Load time in seconds, peak RSS in MB after loading and listed contacts per second.
+    :rtype: dict
+    """
+    timer = timeit.default_timer
+    start = timer()
+    address_book = AddressBook(FileHandler(path).read_file(), engine=engine)
+    load_time = timer() - start
+    rss_mb = peak_rss_mb()
+
+    start = timer()
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        CommandHandler(address_book).handle_all()
+    all_time = timer() - start
+
+    return {
+        "load_s": round(load_time, 3),
+        "rss_mb": round(rss_mb, 1),
+        "all_rows_per_s": round(len(address_book) / all_time),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--measure", nargs=2, metavar=("ENGINE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    if args.measure:
+        print(json.dumps(measure_load(args.measure[0], Path(args.measure[1]))))
+        return
+
+    print(f"{'engine':>9} | {'contacts':>9} | {'load s':>7} | {'RSS MB':>8} | {'all rows/s':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            for engine in ENGINES:
+                path = Path(directory) / f"{engine}-{size}.bin"
+                save_book(engine, size, path)
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_engines", "--measure", engine, str(path)],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout
+                result = json.loads(output)
+                print(
+                    f"{engine:>9} | {size:>9} | {result['load_s']:>7} | "
+                    f"{result['rss_mb']:>8} | {result['all_rows_per_s']:>10}"
+                )
+
+
+if __name__ == "__main__":
+    main()
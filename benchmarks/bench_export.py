@@ -0,0 +1,43 @@
+"""
+Benchmark the export command: rows per second for every format.
+
+Run from the project root:
+    python -m benchmarks.bench_export --size 100000
+"""
+
+import argparse
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+from app.logs import logger
+from utils.exporter import EXPORTERS, export_contacts
+from benchmarks.synthetic import build_address_book
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    address_book = build_address_book(args.size)
+
+    print(f"{'format':>7} | {'rows/s':>10} | {'peak extra MB':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        for export_format in EXPORTERS:
+            path = Path(directory) / f"contacts.{export_format}"
+            start = timeit.default_timer()
+            exported = export_contacts(address_book, export_format, path)
+            elapsed = timeit.default_timer() - start
+
+            # Memory is measured in a second run, tracemalloc slows the export down
+            tracemalloc.start()
+            export_contacts(address_book, export_format, path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{export_format:>7} | {exported / elapsed:>10.0f} | {peak / 2**20:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
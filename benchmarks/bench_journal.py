@@ -0,0 +1,74 @@
+"""
+Benchmark the cost of persisting one change: full pickle rewrite vs. journal append.
+
+Run from the project root:
+    python -m benchmarks.bench_journal --sizes 1000 10000 100000
+
+The journal cost per mutation should not depend on the size of the book.
+"""
+
+import argparse
+import tempfile
+import timeit
+from pathlib import Path
+from app.logs import logger
+from utils.file_handler import FileHandler
+from utils.storage import JournalFileHandler
+from benchmarks.synthetic import build_address_book
+
+
+def bench_pickle(size: int, mutations: int, directory: Path) -> float:
+    """
+    Measure one phone change followed by a full FileHandler rewrite, in milliseconds.
+    """
+    address_book = build_address_book(size)
+    file_handler = FileHandler(directory / "pickle.bin", {})
+    names = list(address_book.data)[:mutations]
+
+    timer = timeit.default_timer
+    start = timer()
+    for number, name in enumerate(names):
+        address_book.change_phone(name, f"+380{500000000 + number}")
+        file_handler.update_contacts(address_book)
+        file_handler.write_in_file()
+    return (timer() - start) / len(names) * 1e3
+
+
+def bench_journal(size: int, mutations: int, directory: Path) -> float:
+    """
+    Measure one phone change appended to the journal, in milliseconds.
+    """
+    address_book = build_address_book(size)
+    file_handler = JournalFileHandler(
+        directory / "journal.bin", {}, min_compact_records=mutations + 1
+    )
+    file_handler.attach(address_book)
+    names = list(address_book.data)[:mutations]
+
+    timer = timeit.default_timer
+    start = timer()
+    for number, name in enumerate(names):
+        address_book.change_phone(name, f"+380{500000000 + number}")
+    elapsed = timer() - start
+    file_handler.close()
+    return elapsed / len(names) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--mutations", type=int, default=20)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    print(f"{'contacts':>10} | {'pickle ms/op':>12} | {'journal ms/op':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        for size in args.sizes:
+            pickle_ms = bench_pickle(size, args.mutations, directory)
+            journal_ms = bench_journal(size, args.mutations, directory)
+            print(f"{size:>10} | {pickle_ms:>12.3f} | {journal_ms:>13.4f}")
+
+
+if __name__ == "__main__":
+    main()
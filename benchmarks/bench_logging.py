@@ -0,0 +1,88 @@
+"""
+Benchmark commands per second with synchronous, queued and suppressed logging.
+
+Run from the project root:
+    python -m benchmarks.bench_logging --commands 20000
+
+Every command goes through contact_factory and CommandHandler, as in main.py;
+the log records are written to a temporary file instead of app/logs/app.log.
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import tempfile
+import timeit
+from pathlib import Path
+from app.logs import logger, set_log_level
+from app.logs.logger import formatter, queue_handler
+from app.contacts import AddressBook
+from utils.command_handler import CommandHandler
+from utils.contact_factory import contact_factory
+from benchmarks.synthetic import generate_rows
+
+
+def make_commands(count: int) -> list:
+    """
+    Build "add" commands followed by "phone" lookups of the added contacts.
+    """
+    rows = generate_rows(count // 2, seed=1)
+    adds = [f"add {first} {last} {phone} {email}" for first, last, phone, email in rows]
+    lookups = [f"phone {first} {last}" for first, last, _, _ in rows]
+    return adds + lookups
+
+
+def commands_per_second(commands: list) -> float:
+    handler = CommandHandler(AddressBook())
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = timeit.default_timer()
+        for user_input in commands:
+            command, contact, args = contact_factory(user_input)
+            handler.handle_command(command, contact, validated=True, args=args)
+        elapsed = timeit.default_timer() - start
+    return len(commands) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=20_000)
+    args = parser.parse_args()
+
+    commands = make_commands(args.commands)
+    log_path = Path(tempfile.mkdtemp()) / "bench.log"
+    bench_handler = logging.FileHandler(log_path, encoding="utf-8")
+    bench_handler.setFormatter(formatter)
+
+    # Send the queued records to the temporary file instead of app.log
+    queue_handler.target = bench_handler
+    # Console output is not part of the measurement
+    for handler in list(logger.handlers):
+        if handler is not queue_handler:
+            logger.removeHandler(handler)
+
+    results = []
+
+    # The former setup: the file handler writes in the calling thread
+    logger.removeHandler(queue_handler)
+    logger.addHandler(bench_handler)
+    set_log_level("DEBUG")
+    results.append(("synchronous, DEBUG", commands_per_second(commands)))
+    logger.removeHandler(bench_handler)
+    logger.addHandler(queue_handler)
+
+    results.append(("queued, DEBUG", commands_per_second(commands)))
+    set_log_level("INFO")
+    results.append(("queued, INFO", commands_per_second(commands)))
+    set_log_level("WARNING")
+    results.append(("queued, WARNING", commands_per_second(commands)))
+    logger.disabled = True
+    results.append(("disabled", commands_per_second(commands)))
+
+    print(f"{'logging':>20} | {'commands/s':>10}")
+    for name, rate in results:
+        print(f"{name:>20} | {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
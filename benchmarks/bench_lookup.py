@@ -0,0 +1,55 @@
+"""
+Benchmark full name lookups against the size of the address book.
+
+Run from the project root:
+    python -m benchmarks.bench_lookup --sizes 1000 10000 100000
+
+With the name index the time per lookup should stay flat as the book grows.
+"""
+
+import argparse
+import random
+import timeit
+from app.logs import logger
+from app.contacts import Contact
+from utils.command_handler import CommandHandler
+from benchmarks.synthetic import build_address_book
+
+
+def bench_lookup(size: int, lookups: int) -> float:
+    """
+    Measure the average time of CommandHandler._find_contact in microseconds.
+
+    :param size: Number of contacts in the address book.
+    :type size: int
+    :param lookups: Number of lookups to time.
+    :type lookups: int
+    :return: Average time per lookup in microseconds.
+    :rtype: float
+    """
+    address_book = build_address_book(size)
+    handler = CommandHandler(address_book)
+    names = random.Random(0).choices(list(address_book.data), k=lookups)
+    queries = [Contact(*name.split(" "), None, None) for name in names]
+
+    timer = timeit.default_timer
+    start = timer()
+    for query in queries:
+        handler._find_contact(query)
+    return (timer() - start) / lookups * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    print(f"{'contacts':>10} | {'us/lookup':>10}")
+    for size in args.sizes:
+        print(f"{size:>10} | {bench_lookup(size, args.lookups):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
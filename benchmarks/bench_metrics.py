@@ -0,0 +1,77 @@
+"""
+Benchmark the cost of the instrumentation (utils.metrics) while disabled and enabled.
+
+Run from the project root:
+    python -m benchmarks.bench_metrics --commands 200000
+
+The first column times an empty with-block of METRICS.phase(), as used
+once per command; the second runs the same script of lookups and phone
+changes with run_batch, as "--batch" does, without and with "--stats"
+(best of --repeat runs). The per-line phases registered with
+METRICS.instrument() are only wrapped in the second case.
+"""
+
+import argparse
+import contextlib
+import io
+import timeit
+from app.logs import logger
+from utils.batch import run_batch
+from utils.metrics import METRICS
+from benchmarks.synthetic import build_address_book, generate_rows
+
+
+def time_phase(calls: int) -> float:
+    """
+    Return the time of one empty instrumented block in nanoseconds.
+    """
+    phase = METRICS.phase
+
+    def run() -> None:
+        for _ in range(calls):
+            with phase("bench"):
+                pass
+
+    return timeit.timeit(run, number=1) / calls * 1e9
+
+
+def time_batch(script: list, address_book) -> float:
+    start = timeit.default_timer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_batch(script, address_book)
+    return timeit.default_timer() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=200_000)
+    parser.add_argument("--contacts", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    address_book = build_address_book(args.contacts)
+    rows = list(generate_rows(1000))
+    script = []
+    for number in range(args.commands):
+        first, last, phone, _ = rows[number % len(rows)]
+        if number % 4 == 0:
+            script.append(f"change_phone {first} {last} {phone}")
+        else:
+            script.append(f"phone {first} {last}")
+
+    print(f"{'metrics':<9} | {'ns per phase()':>14} | {'batch us/line':>13}")
+    for enabled in (False, True):
+        if enabled:
+            METRICS.enable()
+        phase_ns = time_phase(args.commands)
+        elapsed = min(time_batch(script, address_book) for _ in range(args.repeat))
+        print(
+            f"{'enabled' if enabled else 'disabled':<9} | {phase_ns:>14.0f} | "
+            f"{elapsed / len(script) * 1e6:>13.2f}"
+        )
+    METRICS.disable()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark the one-shot command line path of main() with the pickle and mmap storage.
+
+Run from the project root:
+    python -m benchmarks.bench_mmap_startup --sizes 1000 100000 1000000
+
+Each run starts a fresh interpreter executing "phone <name>" against a
+synthetic book. With mmap storage the time should stay near-constant.
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from app.logs import logger
+from utils.file_handler import FileHandler
+from utils.storage import migrate_pickle_to_mmap
+from benchmarks.synthetic import generate_contacts
+
+PROJECT_PATH = Path(__file__).resolve().parent.parent
+
+RUN_MAIN = (
+    "import sys; from app.logs import logger; logger.disabled = True; "
+    "import main; sys.argv = ['main.py'] + sys.argv[1:]; main.main({directory!r})"
+)
+
+
+def run_command(directory: Path, storage: str, command: list, repeat: int) -> float:
+    """
+    Run main() in a fresh interpreter and return the best wall time in milliseconds.
+    """
+    code = RUN_MAIN.format(directory=str(directory))
+    args = [sys.executable, "-c", code, "--storage", storage, *command]
+    best = float("inf")
+    for _ in range(repeat):
+        start = timeit.default_timer()
+        subprocess.run(args, cwd=PROJECT_PATH, check=True, stdout=subprocess.DEVNULL)
+        best = min(best, timeit.default_timer() - start)
+    return best * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    print(f"{'contacts':>10} | {'pickle ms':>10} | {'mmap ms':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            contacts = {contact.fullname: contact for contact in generate_contacts(size)}
+            FileHandler(directory / "contacts.bin", contacts).write_in_file()
+            migrate_pickle_to_mmap(directory / "contacts.bin", directory / "contacts.abm")
+            command = ["phone", *next(iter(contacts)).split()]
+            del contacts
+
+            pickle_ms = run_command(directory, "pickle", command, args.repeat)
+            mmap_ms = run_command(directory, "mmap", command, args.repeat)
+            print(f"{size:>10} | {pickle_ms:>10.1f} | {mmap_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark parallel validation (validate_batches) by number of worker processes.
+
+Run from the project root:
+    python -m benchmarks.bench_parallel_validation --rows 1000000 --workers 1 2 4 8
+
+Validates synthetic rows (every 50th one invalid) in batches, as "import" and
+"revalidate" do. The speed-up is bounded by the number of free CPU cores,
+which is printed first; with more workers than cores the pool only adds overhead.
+"""
+
+import argparse
+import os
+import timeit
+from app.logs import logger
+from utils.importer import batched, validate_batches
+from benchmarks.synthetic import generate_rows
+
+
+def make_rows(count: int) -> list:
+    rows = []
+    for line_number, (first, last, phone, email) in enumerate(generate_rows(count), start=1):
+        if line_number % 50 == 0:
+            phone = phone[1:]
+        rows.append((line_number, first, last, phone, email))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    logger.disabled = True
+    rows = make_rows(args.rows)
+    print(f"{args.rows} rows, batches of {args.batch_size}, {os.cpu_count()} CPU cores\n")
+    print(f"{'workers':>7} | {'seconds':>8} | {'rows/s':>10} | {'speed-up':>8} | {'rejected':>8}")
+
+    baseline = None
+    for workers in args.workers:
+        start = timeit.default_timer()
+        rejected = sum(
+            len(batch_rejected)
+            for _, batch_rejected in validate_batches(batched(rows, args.batch_size), workers)
+        )
+        elapsed = timeit.default_timer() - start
+        baseline = baseline or elapsed
+        print(
+            f"{workers:>7} | {elapsed:>8.2f} | {args.rows / elapsed:>10.0f} | "
+            f"{baseline / elapsed:>7.2f}x | {rejected:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark ValidateData argument classification in tokens per second.
+
+Run from the project root:
+    python -m benchmarks.bench_parse_args --lines 100000
+
+Compares the former three-pattern re.match classification with the
+combined precompiled pattern used by ValidateData.parse_args.
+"""
+
+import argparse
+import re
+import timeit
+from app.logs import logger
+from utils.validate import ValidateData
+from benchmarks.synthetic import generate_rows
+
+
+def classify_before(args: list) -> list:
+    """
+    Copy of the former classification loop: up to three re.match calls per token.
+    """
+    parts_name = []
+    phone = email = None
+    for item in args:
+        if re.match(ValidateData.NAME_PATTERN, item):
+            parts_name.append(item.strip().capitalize())
+            logger.debug(f"Detected name part: {item.strip().capitalize()}")
+            continue
+        if re.match(ValidateData.PHONE_PATTERN, item):
+            phone = item.strip()
+            logger.debug(f"Detected phone: {phone}")
+            continue
+        if re.match(ValidateData.EMAIL_PATTERN, item):
+            email = item.strip()
+            logger.debug(f"Detected email: {email}")
+            continue
+        raise ValueError(item)
+    return [parts_name, phone, email]
+
+
+def classify_after(args: list) -> list:
+    """
+    Run the current ValidateData.parse_args on the arguments.
+    """
+    validate = ValidateData("add", args)
+    return [validate.first_name, validate.last_name, validate.phone, validate.email]
+
+
+def tokens_per_second(classify, lines: list) -> float:
+    tokens = sum(len(line) for line in lines)
+    start = timeit.default_timer()
+    for line in lines:
+        classify(line)
+    return tokens / (timeit.default_timer() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=100_000)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    lines = [list(row) for row in generate_rows(args.lines)]
+    before = tokens_per_second(classify_before, lines)
+    after = tokens_per_second(classify_after, lines)
+    print(f"{'before tokens/s':>16} | {'after tokens/s':>15} | {'speedup':>7}")
+    print(f"{before:>16.0f} | {after:>15.0f} | {after / before:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark the output renderers: writing 1M contacts in every "--output" format.
+
+Run from the project root:
+    python -m benchmarks.bench_render --contacts 1000000
+
+Every format renders the same contacts, as "all" does, into a file in a
+temporary directory. The first row is the former way of the reverse lookups:
+one print() call per contact.
+"""
+
+import argparse
+import contextlib
+import tempfile
+import timeit
+from pathlib import Path
+from utils.renderers import RENDERERS
+from benchmarks.synthetic import generate_contacts
+
+
+def render_print(contacts: list, stream) -> None:
+    with contextlib.redirect_stdout(stream):
+        for contact in contacts:
+            print(contact)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contacts", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    contacts = list(generate_contacts(args.contacts))
+    runs = {"print() per contact": render_print}
+    for name, renderer in RENDERERS.items():
+        runs[name] = lambda contacts, stream, renderer=renderer: renderer(stream).contacts(
+            contacts, "Contacts"
+        )
+
+    print(f"{args.contacts} contacts\n")
+    print(f"{'output':<20} | {'seconds':>7} | {'contacts/s':>10} | {'MB':>6} | {'MB/s':>6}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "output"
+        for name, run in runs.items():
+            with path.open("w", encoding="utf-8") as stream:
+                start = timeit.default_timer()
+                run(contacts, stream)
+                elapsed = timeit.default_timer() - start
+            size = path.stat().st_size / 2**20
+            print(
+                f"{name:<20} | {elapsed:>7.2f} | {args.contacts / elapsed:>10.0f} | "
+                f"{size:>6.1f} | {size / elapsed:>6.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark reverse lookups by phone and email against a linear scan.
+
+Run from the project root:
+    python -m benchmarks.bench_reverse_lookup --sizes 10000 100000 1000000
+
+Target: lookups stay flat (O(1)) as the book grows to 1M contacts.
+"""
+
+import argparse
+import random
+import timeit
+from app.logs import logger
+from benchmarks.synthetic import build_address_book
+
+
+def average_us(lookup, queries: list) -> float:
+    start = timeit.default_timer()
+    for query in queries:
+        lookup(query)
+    return (timeit.default_timer() - start) / len(queries) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    rng = random.Random(0)
+    print(
+        f"{'contacts':>10} | {'scan us':>10} | {'build ms':>8} | "
+        f"{'by phone us':>11} | {'by email us':>11} | {'after change us':>15}"
+    )
+
+    for size in args.sizes:
+        address_book = build_address_book(size)
+        contacts = rng.sample(list(address_book.data.values()), args.queries)
+        phones = [contact.phone for contact in contacts]
+        emails = [contact.email.upper() for contact in contacts]
+
+        def scan(phone: str) -> list:
+            return [contact for contact in address_book.data.values() if contact.phone == phone]
+
+        scan_us = average_us(scan, phones[:3])
+
+        start = timeit.default_timer()
+        address_book.get_by_phone(phones[0])
+        address_book.get_by_email(emails[0])
+        build = (timeit.default_timer() - start) * 1e3
+
+        by_phone = average_us(address_book.get_by_phone, phones)
+        by_email = average_us(address_book.get_by_email, emails)
+
+        # Change the numbers and look them up again, so the indexes must follow the mutations
+        changed = []
+        for number, contact in enumerate(contacts[:100]):
+            phone = f"+1999{number:07d}"
+            address_book.change_phone(contact.fullname, phone)
+            changed.append(phone)
+        after_change = average_us(address_book.get_by_phone, changed)
+        assert all(address_book.get_by_phone(phone) for phone in changed)
+
+        print(
+            f"{size:>10} | {scan_us:>10.0f} | {build:>8.0f} | "
+            f"{by_phone:>11.2f} | {by_email:>11.2f} | {after_change:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark prefix and fuzzy search latency against the size of the book.
+
+Run from the project root:
+    python -m benchmarks.bench_search --sizes 10000 100000 1000000
+
+Target: prefix queries under 1 ms on 1M contacts (after the indexes are built).
+"""
+
+import argparse
+import random
+import timeit
+from app.logs import logger
+from benchmarks.synthetic import build_address_book
+
+
+def average_ms(search, queries: list) -> float:
+    start = timeit.default_timer()
+    for query in queries:
+        search(query)
+    return (timeit.default_timer() - start) / len(queries) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    rng = random.Random(0)
+    print(
+        f"{'contacts':>10} | {'first prefix ms':>15} | {'prefix ms':>9} | "
+        f"{'index build ms':>14} | {'fuzzy ms':>8}"
+    )
+
+    for size in args.sizes:
+        address_book = build_address_book(size)
+        names = rng.choices(list(address_book.data), k=args.queries)
+        prefixes = [name[: rng.randint(2, 8)] for name in names]
+        # Fuzzy queries: swap two neighbouring letters in the full name
+        typos = []
+        for name in names:
+            position = rng.randrange(1, len(name) - 1)
+            typos.append(name[:position] + name[position + 1] + name[position] + name[position + 2 :])
+
+        start = timeit.default_timer()
+        address_book.search_prefix(prefixes[0], args.limit)
+        first_prefix = (timeit.default_timer() - start) * 1e3
+        prefix = average_ms(lambda query: address_book.search_prefix(query, args.limit), prefixes)
+
+        start = timeit.default_timer()
+        address_book.search_fuzzy(typos[0], args.limit)
+        build = (timeit.default_timer() - start) * 1e3
+        fuzzy = average_ms(lambda query: address_book.search_fuzzy(query, args.limit), typos[:20])
+
+        print(f"{size:>10} | {first_prefix:>15.1f} | {prefix:>9.3f} | {build:>14.0f} | {fuzzy:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark sharded storage: load and save by number of worker processes, and saving one change.
+
+Run from the project root:
+    python -m benchmarks.bench_sharded --size 1000000 --shards 8 --workers 1 2 4 8
+
+"one change" is the save after changing a single phone: the pickle backend
+rewrites the whole file, the sharded backend only the shard of that contact.
+Parallel load and save only pay off with as many free CPU cores as workers;
+the number of cores is printed first.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import timeit
+from pathlib import Path
+from app.contacts import AddressBook
+from app.logs import logger
+from utils.file_handler import FileHandler
+from utils.storage import ShardedFileHandler
+from benchmarks.synthetic import generate_contacts
+
+
+def measure(handler: FileHandler) -> tuple:
+    """
+    Return (load s, full save s, one change save s) for a handler over an existing file.
+    """
+    start = timeit.default_timer()
+    address_book = AddressBook(handler.read_file())
+    load = timeit.default_timer() - start
+    handler.attach(address_book)
+
+    # Mark the book changed and every shard dirty, to time a save of the whole book
+    if isinstance(handler, ShardedFileHandler):
+        handler.dirty_shards = set(range(handler.shards))
+    address_book.mutations += 1
+    start = timeit.default_timer()
+    handler.update_contacts(address_book)
+    handler.write_in_file()
+    full_save = timeit.default_timer() - start
+
+    address_book.change_phone(next(iter(address_book.data)), "+380500000000")
+    start = timeit.default_timer()
+    handler.update_contacts(address_book)
+    handler.write_in_file()
+    one_change = timeit.default_timer() - start
+    return load, full_save, one_change
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    logger.disabled = True
+    print(f"{args.size} contacts, {args.shards} shards, {os.cpu_count()} CPU cores\n")
+    print(f"{'storage':>18} | {'load ms':>9} | {'save ms':>9} | {'one change ms':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        contacts = {contact.fullname: contact for contact in generate_contacts(args.size)}
+        FileHandler(directory / "contacts.bin", contacts).write_in_file()
+        sharded = ShardedFileHandler(directory / "contacts.bin", shards=args.shards, workers=1)
+        sharded.update_contacts(AddressBook(contacts))
+        sharded.write_in_file()
+        del contacts
+
+        results = [("pickle", measure(FileHandler(directory / "contacts.bin")))]
+        for workers in args.workers:
+            # Every run starts from the same shards
+            copy = directory / f"workers-{workers}"
+            copy.mkdir()
+            shutil.copytree(directory / "contacts.shards", copy / "contacts.shards")
+            handler = ShardedFileHandler(copy / "contacts.bin", workers=workers)
+            results.append((f"sharded, {workers} workers", measure(handler)))
+
+        for name, (load, full_save, one_change) in results:
+            print(
+                f"{name:>18} | {load * 1e3:>9.1f} | {full_save * 1e3:>9.1f} | {one_change * 1e3:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
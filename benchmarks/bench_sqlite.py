@@ -0,0 +1,97 @@
+"""
+Benchmark the SQLite backend against pickle: one-shot commands at several book sizes.
+
+Run from the project root:
+    python -m benchmarks.bench_sqlite --sizes 10000 100000 1000000
+
+Every command runs in a fresh process, as from the command line; the table
+shows its wall time and the peak memory of the process (VmHWM, Linux only).
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from app.contacts import SqliteContacts
+from app.logs import logger
+from utils.file_handler import FileHandler
+from benchmarks.bench_daemon import PROJECT_PATH, RUN_MAIN
+from benchmarks.synthetic import generate_contacts
+
+# Print the peak resident memory of the process in kB to stderr on exit. ru_maxrss is not
+# used: on Linux it keeps the peak of the (much larger) benchmark process across fork and exec.
+PEAK_MEMORY = (
+    "import atexit, sys; atexit.register(lambda: sys.stderr.write("
+    "open('/proc/self/status').read().split('VmHWM:')[1].split()[0])); "
+)
+
+
+def run(directory: Path, storage: str, command: list) -> tuple:
+    """
+    Run one command in a fresh process; return (wall ms, peak memory MB).
+    """
+    args = [
+        sys.executable,
+        "-c",
+        PEAK_MEMORY + RUN_MAIN.format(directory=str(directory)),
+        "--storage",
+        storage,
+        *command,
+    ]
+    start = timeit.default_timer()
+    result = subprocess.run(
+        args, cwd=PROJECT_PATH, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    elapsed = timeit.default_timer() - start
+    return elapsed * 1e3, int(result.stderr.split()[-1]) / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    logger.disabled = True
+    print(f"{'contacts':>10} | {'command':<14} | {'pickle ms':>9} | {'MB':>6} | {'sqlite ms':>9} | {'MB':>6}")
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        for size in args.sizes:
+            contacts = list(generate_contacts(size))
+            target = contacts[size // 2]
+            commands = {
+                "phone": ["phone", target.first_name, target.last_name],
+                "by_phone": ["by_phone", target.phone],
+                "search": ["search", target.last_name[:4]],
+                "change_phone": ["change_phone", target.first_name, target.last_name, "+380500000000"],
+                "all --page 2": ["all", "--page", "2", "--size", "20"],
+            }
+
+            original = directory / "original"
+            original.mkdir()
+            FileHandler(original / "contacts.bin", {c.fullname: c for c in contacts}).write_in_file()
+            database = SqliteContacts(original / "contacts.db")
+            database.insert_many(contacts)
+            database.close()
+            del contacts
+
+            for name, command in commands.items():
+                results = []
+                for storage in ("pickle", "sqlite"):
+                    # Every run starts from the same files, since change_phone writes them
+                    copy = directory / storage
+                    shutil.copytree(original, copy)
+                    results.append(run(copy, storage, command))
+                    shutil.rmtree(copy)
+                (pickle_ms, pickle_mb), (sqlite_ms, sqlite_mb) = results
+                print(
+                    f"{size:>10} | {name:<14} | {pickle_ms:>9.1f} | {pickle_mb:>6.1f} | "
+                    f"{sqlite_ms:>9.1f} | {sqlite_mb:>6.1f}"
+                )
+            shutil.rmtree(original)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark the start-up of one-shot command line invocations, phase by phase.
+
+Run from the project root:
+    python -m benchmarks.bench_startup --size 100000 --repeat 5
+
+Runs "phone <name>" in fresh interpreters: the wall time (best of --repeat),
+the phases reported by "--profile-startup", and the slowest modules
+reported by "python -X importtime".
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from app.logs import logger
+from utils.file_handler import FileHandler
+from utils.storage import migrate_pickle_to_mmap
+from benchmarks.synthetic import generate_contacts
+
+PROJECT_PATH = Path(__file__).resolve().parent.parent
+
+RUN_MAIN = "import sys, main; sys.argv = ['main.py'] + sys.argv[1:]; main.main({directory!r})"
+
+IMPORT_TIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+PHASE_RE = re.compile(r"^\s{4}(\S.*?)\s+([\d.]+)$")
+
+
+def run(directory: Path, options: list, command: list, python_options: list = ()) -> tuple:
+    """
+    Run main() once in a fresh interpreter; return (wall seconds, stderr).
+    """
+    args = [
+        sys.executable,
+        *python_options,
+        "-c",
+        RUN_MAIN.format(directory=str(directory)),
+        *options,
+        *command,
+    ]
+    start = timeit.default_timer()
+    result = subprocess.run(
+        args, cwd=PROJECT_PATH, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    return timeit.default_timer() - start, result.stderr
+
+
+def parse_phases(stderr: str) -> dict:
+    return {
+        match.group(1): float(match.group(2))
+        for match in map(PHASE_RE.match, stderr.splitlines())
+        if match
+    }
+
+
+def parse_import_time(stderr: str, top: int) -> list:
+    """
+    Return the total import time of main and the 'top' modules with the largest own import time.
+    """
+    modules = []
+    for match in map(IMPORT_TIME_RE.match, stderr.splitlines()):
+        if match:
+            modules.append((int(match.group(1)) / 1e3, int(match.group(2)) / 1e3, match.group(4)))
+    total = next(cumulative for _, cumulative, name in modules if name == "main")
+    return total, sorted(modules, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    logger.disabled = True
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        contacts = {contact.fullname: contact for contact in generate_contacts(args.size)}
+        FileHandler(directory / "contacts.bin", contacts).write_in_file()
+        migrate_pickle_to_mmap(directory / "contacts.bin", directory / "contacts.abm")
+        command = ["phone", *next(iter(contacts)).split()]
+        del contacts
+
+        print(f"{args.size} contacts, command: {' '.join(command)}\n")
+        for storage in ("pickle", "mmap"):
+            options = ["--storage", storage, "--profile-startup"]
+            runs = [run(directory, options, command) for _ in range(args.repeat)]
+            wall, stderr = min(runs)
+            print(f"--storage {storage}: {wall * 1e3:.1f} ms wall (best of {args.repeat})")
+            for phase, elapsed in parse_phases(stderr).items():
+                print(f"    {phase:<12} {elapsed:>9.2f} ms")
+            print()
+
+        _, stderr = run(directory, ["--storage", "mmap"], command, ["-X", "importtime"])
+        total, slowest = parse_import_time(stderr, args.top)
+        print(f"-X importtime: importing main takes {total:.1f} ms; slowest modules (self time):")
+        for own, cumulative, name in slowest:
+            print(f"    {name:<32} {own:>7.2f} ms  (cumulative {cumulative:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Benchmark suite: the main scenarios at several book sizes, with JSON results and a compare mode.
+
+Run from the project root:
+    python -m benchmarks.suite run --sizes 1k 100k 1M > before.json
+    (change the code)
+    python -m benchmarks.suite run --sizes 1k 100k 1M > after.json
+    python -m benchmarks.suite compare before.json after.json --threshold 10
+
+"run" times every scenario on synthetic contacts (benchmarks.synthetic) for
+every size, keeps the best of --repeat runs and writes the results as JSON
+to stdout (or --output); progress goes to stderr. "compare" prints the
+change of the time per operation of every scenario and size, and exits with
+status 1 if one got slower by more than --threshold percent.
+
+Scenarios:
+    load            read contacts.bin (FileHandler) and build the AddressBook
+    save            write contacts.bin
+    lookup          find a contact by full name
+    all             render all contacts in the text format
+    churn           add a contact and delete it again
+    parse_validate  parse and validate an "add" command line (contact_factory)
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+from app.contacts import AddressBook, Contact
+from app.logs import logger
+from utils.command_handler import CommandHandler
+from utils.contact_factory import contact_factory
+from utils.file_handler import FileHandler
+from utils.renderers import TextRenderer
+from benchmarks.bench_daemon import PROJECT_PATH
+from benchmarks.synthetic import build_address_book, format_size, generate_rows, parse_size
+
+# Number of operations of the scenarios that do not go through the whole book
+OPERATIONS = 10_000
+
+# Scenarios by name: function(workload) -> (seconds, number of operations)
+SCENARIOS: Dict[str, Callable[["Workload"], Tuple[float, int]]] = {}
+
+
+def scenario(name: str) -> Callable:
+    def register(function: Callable) -> Callable:
+        SCENARIOS[name] = function
+        return function
+
+    return register
+
+
+class Workload:
+    """
+    The data the scenarios of one size run on: an address book and its contacts.bin.
+
+    Both are built once per size and are not part of the timings.
+    """
+
+    def __init__(self, size: int, directory: Path) -> None:
+        self.size = size
+        self.address_book = build_address_book(size)
+        self.path = directory / f"contacts-{size}.bin"
+        FileHandler(self.path, self.address_book.data).write_in_file()
+        self.names = random.Random(0).choices(list(self.address_book.data), k=OPERATIONS)
+
+
+def _timed(function: Callable[[], None]) -> float:
+    start = timeit.default_timer()
+    function()
+    return timeit.default_timer() - start
+
+
+@scenario("load")
+def load(workload: Workload) -> Tuple[float, int]:
+    def run() -> None:
+        AddressBook(FileHandler(workload.path).read_file())
+
+    return _timed(run), workload.size
+
+
+@scenario("save")
+def save(workload: Workload) -> Tuple[float, int]:
+    handler = FileHandler(workload.path, workload.address_book.data)
+    return _timed(handler.write_in_file), workload.size
+
+
+@scenario("lookup")
+def lookup(workload: Workload) -> Tuple[float, int]:
+    find_contact = workload.address_book.find_contact
+
+    def run() -> None:
+        for name in workload.names:
+            find_contact(name)
+
+    return _timed(run), len(workload.names)
+
+
+@scenario("all")
+def render_all(workload: Workload) -> Tuple[float, int]:
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        handler = CommandHandler(workload.address_book, TextRenderer(devnull))
+        return _timed(lambda: handler.handle_all([])), workload.size
+
+
+@scenario("churn")
+def churn(workload: Workload) -> Tuple[float, int]:
+    # A last name prefix no generated contact has, so the names never collide with the book
+    contacts = [
+        Contact(first, "Churn" + last.lower(), phone, email)
+        for first, last, phone, email in generate_rows(OPERATIONS, seed=7)
+    ]
+    address_book = workload.address_book
+
+    def run() -> None:
+        for contact in contacts:
+            address_book.add_contact(contact)
+            address_book.remove_contact(contact.fullname)
+
+    return _timed(run), 2 * len(contacts)
+
+
+@scenario("parse_validate")
+def parse_validate(workload: Workload) -> Tuple[float, int]:
+    lines = [
+        f"add {first} {last} {phone} {email}"
+        for first, last, phone, email in generate_rows(min(workload.size, 100_000), seed=1)
+    ]
+
+    def run() -> None:
+        for line in lines:
+            contact_factory(line)
+
+    return _timed(run), len(lines)
+
+
+def environment() -> dict:
+    """
+    Describe where the results were measured, so that only comparable runs are compared.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_PATH,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(sizes: list, scenarios: list, repeat: int) -> dict:
+    """
+    Run the scenarios for every size and return the results in the JSON layout.
+
+    Every result is keyed "<scenario>/<size>" and holds the time of every run
+    and the best time per operation in microseconds, which "compare" uses.
+    """
+    results = {}
+    print(
+        f"{'scenario':<16} | {'size':>6} | {'ops':>8} | {'best us/op':>10} | {'median':>10}",
+        file=sys.stderr,
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            workload = Workload(size, Path(directory))
+            for name in scenarios:
+                runs = [SCENARIOS[name](workload) for _ in range(repeat)]
+                operations = runs[0][1]
+                seconds = [elapsed for elapsed, _ in runs]
+                best = min(seconds) / operations * 1e6
+                median = statistics.median(seconds) / operations * 1e6
+                results[f"{name}/{format_size(size)}"] = {
+                    "scenario": name,
+                    "size": size,
+                    "operations": operations,
+                    "seconds": seconds,
+                    "best_us_per_op": best,
+                }
+                print(
+                    f"{name:<16} | {format_size(size):>6} | {operations:>8} | "
+                    f"{best:>10.3f} | {median:>10.3f}",
+                    file=sys.stderr,
+                )
+            workload.path.unlink()
+            del workload
+    return {"environment": environment(), "results": results}
+
+
+def compare(before: dict, after: dict, threshold: float) -> int:
+    """
+    Print the change of every result and return the number of regressions.
+
+    :param before: Results of the baseline run.
+    :param after: Results of the new run.
+    :param threshold: Slow-down in percent above which a result is a regression.
+    """
+    for label, data in (("before", before), ("after", after)):
+        env = data["environment"]
+        print(
+            f"{label:<6}: commit {env['commit']}, Python {env['python']}, "
+            f"{env['cpu_count']} CPU cores"
+        )
+    print(f"\n{'result':<24} | {'before':>10} | {'after':>10} | {'change':>8} |")
+
+    regressions = 0
+    for key in sorted(before["results"].keys() | after["results"].keys()):
+        if key not in before["results"] or key not in after["results"]:
+            side = "after" if key in after["results"] else "before"
+            print(f"{key:<24} | only in the {side} results")
+            continue
+        old = before["results"][key]["best_us_per_op"]
+        new = after["results"][key]["best_us_per_op"]
+        change = (new / old - 1) * 100
+        flag = ""
+        if change > threshold:
+            flag = "REGRESSION"
+            regressions += 1
+        elif change < -threshold:
+            flag = "faster"
+        print(f"{key:<24} | {old:>10.3f} | {new:>10.3f} | {change:>+7.1f}% | {flag}")
+
+    print(f"\n{regressions} regression(s) above {threshold:g}% (times in us per operation).")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the scenarios and write the results as JSON")
+    run.add_argument("--sizes", nargs="+", default=["1k", "10k", "100k"], help="e.g. 1k 100k 10M")
+    run.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--output", type=Path, help="JSON file (default: stdout)")
+
+    check = commands.add_parser("compare", help="compare two result files")
+    check.add_argument("before", type=Path)
+    check.add_argument("after", type=Path)
+    check.add_argument("--threshold", type=float, default=10.0, help="percent (default: 10)")
+
+    args = parser.parse_args()
+    logger.disabled = True
+
+    if args.command == "run":
+        try:
+            sizes = [parse_size(size) for size in args.sizes]
+        except ValueError as error:
+            parser.error(str(error))
+        results = run_suite(sizes, args.scenarios, args.repeat)
+        text = json.dumps(results, indent=2) + "\n"
+        if args.output:
+            args.output.write_text(text, encoding="utf-8")
+        else:
+            sys.stdout.write(text)
+        return
+
+    before, after = (
+        json.loads(path.read_text(encoding="utf-8")) for path in (args.before, args.after)
+    )
+    sys.exit(1 if compare(before, after, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
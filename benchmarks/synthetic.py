@@ -0,0 +1,109 @@
+"""
+Deterministic synthetic data for the benchmarks.
+
+The same seed and size always produce the same contacts, so results from
+different runs can be compared with each other.
+"""
+
+import random
+from typing import Iterator, Tuple
+from app.contacts import Contact, AddressBook
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+    "William", "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Olena", "Taras", "Mykola", "Iryna",
+    "Andrii", "Oksana", "Dmytro", "Kateryna", "Serhii", "Natalia", "Bohdan", "Yulia",
+]
+
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Taylor", "Moore",
+    "Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Kravchenko", "Melnyk", "Boyko", "Oliynyk",
+]
+
+DOMAINS = ["example.com", "mail.com", "post.org", "inbox.net"]
+
+# Suffixes of the sizes accepted by parse_size(), e.g. "10k" or "10M"
+SIZE_SUFFIXES = {"k": 10**3, "M": 10**6}
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a number of contacts such as "1000", "1k" or "10M".
+
+    :param text: Number with an optional "k" or "M" suffix.
+    :type text: str
+    :return: The number of contacts.
+    :rtype: int
+    :raises ValueError: If the text is not a positive number.
+    """
+    multiplier = SIZE_SUFFIXES.get(text[-1:], 1)
+    number = text[:-1] if multiplier > 1 else text
+    if not number.isdigit() or int(number) < 1:
+        raise ValueError(f"Invalid size: {text!r} (e.g. 1000, 10k or 10M).")
+    return int(number) * multiplier
+
+
+def format_size(size: int) -> str:
+    """
+    Format a number of contacts the way parse_size() reads it (10000 -> "10k").
+    """
+    for suffix, multiplier in reversed(SIZE_SUFFIXES.items()):
+        if size % multiplier == 0:
+            return f"{size // multiplier}{suffix}"
+    return str(size)
+
+
+def _letters(number: int) -> str:
+    """
+    Encode a non-negative integer as a lowercase letter suffix ("a", "b", ..., "ba", ...).
+
+    Names only allow letters, so this keeps generated full names unique
+    while still matching ValidateData.NAME_PATTERN.
+    """
+    suffix = ""
+    while True:
+        number, rest = divmod(number, 26)
+        suffix = chr(ord("a") + rest) + suffix
+        if number == 0:
+            return suffix
+
+
+def generate_rows(size: int, seed: int = 42) -> Iterator[Tuple[str, str, str, str]]:
+    """
+    Yield (first_name, last_name, phone, email) tuples for 'size' unique contacts.
+
+    Phones match the "+<country_code><number>" form and emails match the
+    email pattern used by the validators.
+
+    :param size: Number of contacts to generate.
+    :type size: int
+    :param seed: Seed for the random generator.
+    :type seed: int
+    """
+    rng = random.Random(seed)
+    for number in range(size):
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES) + _letters(number)
+        phone = f"+380{rng.randrange(10**8, 10**9)}"
+        email = f"{first_name.lower()}.{last_name.lower()}@{rng.choice(DOMAINS)}"
+        yield first_name, last_name, phone, email
+
+
+def generate_contacts(size: int, seed: int = 42) -> Iterator[Contact]:
+    """
+    Yield 'size' Contact objects built from generate_rows().
+    """
+    for first_name, last_name, phone, email in generate_rows(size, seed):
+        yield Contact(first_name, last_name, phone, email)
+
+
+def build_address_book(size: int, seed: int = 42) -> AddressBook:
+    """
+    Build an AddressBook filled with 'size' synthetic contacts.
+    """
+    address_book = AddressBook()
+    for contact in generate_contacts(size, seed):
+        address_book.add_contact(contact)
+    return address_book
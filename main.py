@@ -1,11 +1,19 @@
-from app.logs import logger
+import time
+
+# Taken before the other imports, so --profile-startup can report their cost
+IMPORTS_STARTED = time.perf_counter()
+
+from app.logs import logger, set_log_level, set_console_stream
 from pathlib import Path
 from utils.validate.validate_path import ValidatePath
-from utils.file_handler import FileHandler
+from utils.storage import create_file_handler
+import os
 import sys
 from utils.contact_factory import contact_factory
 from app.contacts import AddressBook
 from utils.command_handler import CommandHandler
+from utils.renderers import create_renderer
+from utils.metrics import METRICS
 from utils.errors import (
     InsufficientArgumentsError,
     MissingRequiredArgumentError,
@@ -15,6 +23,109 @@ from utils.errors import (
     ContactNotFoundError,
 )
 
+# Unix domain socket of the daemon (--serve), created next to contacts.bin
+DAEMON_SOCKET = "contacts.sock"
+
+
+class StartupProfile:
+    """
+    Wall time of each startup phase, printed to stderr with "--profile-startup".
+
+    Interpreter start-up before main.py is imported is not included;
+    run "python -X importtime main.py ..." for the import details.
+    """
+
+    def __init__(self, started: float) -> None:
+        self.started = started
+        self.last = started
+        self.phases = []
+
+    def mark(self, phase: str) -> None:
+        """
+        Close the current phase under the given name.
+        """
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1e3))
+        self.last = now
+
+    def report(self) -> None:
+        lines = ["Startup profile (ms):"]
+        lines.extend(f"    {phase:<12} {elapsed:>9.2f}" for phase, elapsed in self.phases)
+        lines.append(f"    {'total':<12} {(self.last - self.started) * 1e3:>9.2f}")
+        print("\n".join(lines), file=sys.stderr)
+
+
+def parse_options(argv: list) -> tuple[dict, list]:
+    """
+    Split leading "--option value" pairs and "--flag" switches from the command line arguments.
+
+    Only options placed before the command are recognized, so contact data
+    such as hyphenated names is never mistaken for an option.
+
+    Supported options:
+        --storage <pickle|journal|mmap|sharded|sqlite>: Storage mode for the address book
+            (default: $ADDRESS_BOOK_STORAGE or "pickle").
+        --engine <dict|columnar>: In-memory engine of the AddressBook
+            (default: $ADDRESS_BOOK_ENGINE or "dict").
+        --durability <none|flush|fsync|fsync+dir>: How saves are made crash-safe
+            (default: $ADDRESS_BOOK_DURABILITY or "flush").
+        --shards <number>: Number of shards of a new "--storage sharded" directory
+            (default: $ADDRESS_BOOK_SHARDS or 8).
+        --shard-workers <number>: Processes loading and writing the shards of "--storage sharded"
+            (default: $ADDRESS_BOOK_SHARD_WORKERS or 1, i.e. this process).
+        --log-level <DEBUG|INFO|WARNING|ERROR>: Level of the log file; the console
+            always shows warnings (default: $ADDRESS_BOOK_LOG_LEVEL or "DEBUG").
+        --output <text|json|tsv>: Format of the results written to stdout
+            (default: $ADDRESS_BOOK_OUTPUT or "text").
+        --profile-startup: Print the time spent in every startup phase to stderr.
+        --stats: Time every command and its phases; the "stats" command shows them.
+        --stats-file <file>: Like --stats, and write the statistics as JSON to the file on exit
+            (default: $ADDRESS_BOOK_STATS_FILE).
+        --slow-ms <milliseconds>: Like --stats, and log a warning for every command
+            that takes longer (default: $ADDRESS_BOOK_SLOW_MS).
+        --serve: Keep the address book in memory and serve commands over a Unix socket.
+        --save-interval <seconds>: How often the daemon saves a changed book (default: 5).
+        --save-threshold <changes>: Number of changes after which the daemon (default: 100)
+            or a batch (default: only at the end) saves right away.
+        --batch <file|->: Run the commands of a script file, or of stdin for "-".
+
+    :param argv: Command line arguments without the program name.
+    :type argv: list
+    :return: A tuple of the options dictionary and the remaining arguments.
+    :rtype: tuple[dict, list]
+    """
+    options = {
+        "storage": os.environ.get("ADDRESS_BOOK_STORAGE", "pickle"),
+        "engine": os.environ.get("ADDRESS_BOOK_ENGINE", "dict"),
+        "durability": os.environ.get("ADDRESS_BOOK_DURABILITY", "flush"),
+        "shards": os.environ.get("ADDRESS_BOOK_SHARDS"),
+        "shard-workers": os.environ.get("ADDRESS_BOOK_SHARD_WORKERS"),
+        "output": os.environ.get("ADDRESS_BOOK_OUTPUT", "text"),
+        # None keeps the level the logger was configured with ($ADDRESS_BOOK_LOG_LEVEL)
+        "log-level": None,
+        # Switches take no value
+        "profile-startup": False,
+        "serve": False,
+        "stats": False,
+        "stats-file": os.environ.get("ADDRESS_BOOK_STATS_FILE"),
+        "slow-ms": os.environ.get("ADDRESS_BOOK_SLOW_MS"),
+        "save-interval": None,
+        "save-threshold": None,
+        "batch": None,
+    }
+    args = list(argv)
+
+    while args and args[0].startswith("--"):
+        option = args.pop(0)[2:]
+        if option in options and isinstance(options[option], bool):
+            options[option] = True
+            continue
+        if option not in options or not args:
+            raise InvalidArgumentError(f'Invalid option: "--{option}".')
+        options[option] = args.pop(0)
+
+    return options, args
+
 
 def main(string_path: str = None) -> None:
     """
@@ -32,77 +143,233 @@ def main(string_path: str = None) -> None:
 
     Behavior:
         - Validates the given path (creates directories if missing).
+        - Selects the storage mode ("--storage pickle|journal|mmap|sharded|sqlite") and the in-memory
+          engine ("--engine dict|columnar") from options placed before the command,
+          the durability of saves ("--durability fsync"), the shards and worker processes of
+          the sharded storage ("--shards 16 --shard-workers 4"), the log level ("--log-level INFO")
+          and the output format ("--output json", see utils.renderers).
         - Reads existing contacts from the file or creates an empty dictionary.
+        - With "--profile-startup", prints the time of every startup phase to stderr.
+        - With "--stats", "--stats-file <file>" or "--slow-ms <ms>", times every command
+          and its phases (utils.metrics), writes them to the file on exit and logs
+          commands slower than the threshold.
         - Initializes an AddressBook object and populates it with loaded contacts.
+        - With "--batch <file|->", runs the commands of a script (or stdin) with one
+          CommandHandler, collects the errors and prints a summary.
+        - With "--serve", keeps the book in memory and serves commands over a Unix socket;
+          a one-shot command is forwarded to such a daemon when one is running, together
+          with its "--output" format and the working directory its file paths refer to
+          ("--stats", "--stats-file" and "--slow-ms" of the client are ignored then;
+          the daemon collects statistics if started with them). An interactive session
+          or a batch is refused while a daemon is running.
         - Processes user input:
             * If the program is launched with command-line arguments, executes the command immediately.
             * If no command-line arguments are provided, enters an interactive loop for user commands.
         - Handles exceptions such as empty input, invalid commands, invalid arguments,
           insufficient or missing arguments, and contact not found.
-        - Saves any changes to the contacts back to the file upon exit.
+        - Saves any changes to the contacts back to the file upon exit
+          (skipped if no command changed the book).
     """
+    profile = StartupProfile(IMPORTS_STARTED)
+    profile.mark("imports")
+
     PROJECT_PATH = Path(__file__).resolve().parent
+    options, command_args = parse_options(sys.argv[1:])
+
+    if options["log-level"] is not None:
+        try:
+            set_log_level(options["log-level"])
+        except ValueError as error:
+            raise InvalidArgumentError(str(error))
+    renderer = create_renderer(options["output"])
+    if options["output"] != "text":
+        # Keep stdout machine-readable: warnings go to stderr
+        set_console_stream(sys.stderr)
+
+    if options["stats"] or options["stats-file"] or options["slow-ms"]:
+        try:
+            slow_ms = float(options["slow-ms"]) if options["slow-ms"] else None
+        except ValueError as error:
+            raise InvalidArgumentError(f"Invalid option value: {error}.")
+        METRICS.enable(slow_ms)
+    profile.mark("options")
 
     if string_path is None:
         directory_path = PROJECT_PATH / Path(r"app/contacts/contacts.bin")
         logger.warning(
-            f'No file path was provided by the user. Using default path: "{directory_path.parent}".'
+            'No file path was provided by the user. Using default path: "%s".',
+            directory_path.parent,
         )
-        print()
+        # Only the text output gets a blank line; json and tsv stay machine-readable
+        if options["output"] == "text":
+            print()
         path = ValidatePath(directory_path)
     else:
         logger.info(
-            f'File path entered by user for saving the address book: "{string_path}".'
+            'File path entered by user for saving the address book: "%s".', string_path
         )
         path = ValidatePath(string_path + r"/contacts.bin")
 
     # Validate path (create if missing)
     valid_path = path.validate_path()
+    profile.mark("path")
+
+    # A running daemon (--serve) already holds the book: forward the command to it,
+    # with the output format and the working directory its file paths refer to
+    socket_path = valid_path.parent / DAEMON_SOCKET
+    if command_args and not options["serve"] and socket_path.exists():
+        from utils.daemon import forward_command
+
+        try:
+            output = forward_command(
+                socket_path,
+                " ".join(command_args),
+                output=options["output"],
+                directory=Path.cwd(),
+            )
+        except TimeoutError:
+            # Running it here as well would race the daemon, which is still busy with it
+            logger.warning(
+                "The daemon did not answer in time; the command may still be running there."
+            )
+            return
+        if output is not None:
+            if METRICS.enabled:
+                # Running it here instead would race the daemon's saves of the same file
+                logger.warning(
+                    "Command run by the daemon: --stats, --stats-file and --slow-ms are "
+                    "ignored (start the daemon with them and use its stats command)."
+                )
+            sys.stdout.write(output)
+            profile.mark("forward")
+            if options["profile-startup"]:
+                profile.report()
+            return
+
+    # A session or a batch would load and save the file the daemon holds and overwrites
+    if not options["serve"] and socket_path.exists():
+        from utils.daemon import daemon_is_running
+
+        if daemon_is_running(socket_path):
+            logger.warning("A daemon is serving the address book on %s.", socket_path)
+            raise InvalidArgumentError(
+                f'A daemon is serving the address book on "{socket_path}": stop it first, '
+                "or run one-shot commands, which are forwarded to it."
+            )
 
     # Read file (create empty dict if missing)
-    file_handler = FileHandler(valid_path)
-    contacts_with_file = file_handler.read_file()
+    backend_options = {}
+    if options["storage"] == "sharded":
+        try:
+            if options["shards"]:
+                backend_options["shards"] = int(options["shards"])
+            if options["shard-workers"]:
+                backend_options["workers"] = int(options["shard-workers"])
+        except ValueError as error:
+            raise InvalidArgumentError(f"Invalid option value: {error}.")
+    try:
+        file_handler = create_file_handler(
+            options["storage"], valid_path, durability=options["durability"], **backend_options
+        )
+    except ValueError as error:
+        # Unknown --storage or --durability, or --shards or --shard-workers below 1
+        raise InvalidArgumentError(str(error))
+    with METRICS.phase("load"):
+        contacts_with_file = file_handler.read_file()
+    profile.mark("load")
 
     # Initialize an AddressBook and populate it with contacts from the file
-    address_book = AddressBook()
-    address_book.data = contacts_with_file
+    address_book = AddressBook(contacts_with_file, engine=options["engine"])
+    file_handler.attach(address_book)
     logger.info(
-        'Created a new AddressBook object and initialized its "data" field with the loaded data.'
+        'Created a new AddressBook object and populated it with the loaded data.'
     )
+    profile.mark("address book")
+
+    try:
+        save_interval = float(options["save-interval"]) if options["save-interval"] else None
+        save_threshold = int(options["save-threshold"]) if options["save-threshold"] else None
+    except ValueError as error:
+        raise InvalidArgumentError(f"Invalid option value: {error}.")
 
     try:
-        if len(sys.argv) > 1:
+        if options["serve"]:
+            from utils.daemon import AddressBookDaemon
+
+            daemon = AddressBookDaemon(
+                address_book,
+                file_handler,
+                socket_path,
+                save_interval or AddressBookDaemon.SAVE_INTERVAL,
+                save_threshold or AddressBookDaemon.SAVE_THRESHOLD,
+                renderer=renderer,
+            )
+            daemon.serve_forever()
+            profile.mark("serve")
+        elif options["batch"] is not None:
+            # Imported on use, like the daemon
+            from utils.batch import run_batch
+
+            if options["batch"] == "-":
+                report = run_batch(
+                    sys.stdin, address_book, file_handler, save_threshold, renderer=renderer
+                )
+            else:
+                script_path = Path(options["batch"])
+                if not script_path.is_file():
+                    logger.warning("File does not exist: %s.", script_path)
+                    raise InvalidArgumentError(f'File does not exist: "{script_path}".')
+                with script_path.open(encoding="utf-8") as script:
+                    report = run_batch(
+                        script,
+                        address_book,
+                        file_handler,
+                        save_threshold,
+                        str(script_path),
+                        renderer,
+                    )
+            renderer.report(report)
+            profile.mark("batch")
+        elif command_args:
             # Get user input and parse it
             # Create a Contact object from the parsed input data
-            user_input = " ".join(sys.argv[1:])
+            user_input = " ".join(command_args)
             logger.info(
                 "The program was launched via the command line, and the arguments were provided by the user as command-line arguments."
             )
-            command, contact = contact_factory(user_input)
+            command, contact, args = contact_factory(user_input)
 
             # Initialize a CommandHandler object and execute the action corresponding to the user's input command
-            handler = CommandHandler(address_book)
-            handler.handle_command(command, contact)
+            handler = CommandHandler(address_book, renderer)
+            handler.handle_command(command, contact, validated=True, args=args)
+            profile.mark("command")
         else:
+            # One handler for the whole session
+            handler = CommandHandler(address_book, renderer)
+            # No prompt in the json and tsv output, so every line of stdout is a result
+            prompt = ""
+            if options["output"] == "text":
+                prompt = "Enter command or command with contact data: "
             while True:
                 try:
                     # Get user input and parse it
                     # Create a Contact object from the parsed input data
-                    user_input = input("Enter command or command with contact data: ")
-                    command, contact = contact_factory(user_input)
+                    user_input = input(prompt)
+                    command, contact, args = contact_factory(user_input)
                 except (
                     EmptyInputError,
                     InvalidCommandError,
                     InvalidArgumentError,
                     ContactNotFoundError,
                 ) as error_message:
-                    print(f"{error_message}\n")
+                    renderer.error(error_message)
                     continue
 
                 try:
-                    # Initialize a CommandHandler object and execute the action corresponding to the user's input command
-                    handler = CommandHandler(address_book)
-                    continue_value = handler.handle_command(command, contact)
+                    # Execute the action corresponding to the user's input command
+                    continue_value = handler.handle_command(
+                        command, contact, validated=True, args=args
+                    )
 
                     # Exit from the program
                     if not continue_value:
@@ -114,13 +381,22 @@ def main(string_path: str = None) -> None:
                     ContactNotFoundError,
                     InvalidArgumentError,
                 ) as error_message:
-                    print(f"{error_message}\n")
+                    renderer.error(error_message)
                     continue
 
+            profile.mark("commands")
+
     finally:
-        # Save the changes made to the current contact list to the file
-        file_handler.update_contacts(address_book)
-        file_handler.write_in_file()
+        # Save the changes made to the current contact list to the file;
+        # the file handler leaves the file as it is if the book was not changed
+        with METRICS.phase("save"):
+            file_handler.update_contacts(address_book)
+            file_handler.write_in_file()
+        profile.mark("save")
+        if options["stats-file"]:
+            METRICS.dump(Path(options["stats-file"]))
+        if options["profile-startup"]:
+            profile.report()
 
 
 if __name__ == "__main__":
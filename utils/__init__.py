@@ -2,6 +2,7 @@ from .file_handler import FileHandler
 from .contact_factory import contact_factory
 from .cli_handler import EmptyInputError, CLIHandler
 from .command_handler import CommandHandler
+from .commands import CommandSpec, register_command, is_read_only
 from .errors import (
     EmptyInputError,
     InvalidCommandError,
@@ -17,6 +18,9 @@ __all__ = [
     "EmptyInputError",
     "CLIHandler",
     "CommandHandler",
+    "CommandSpec",
+    "register_command",
+    "is_read_only",
     "EmptyInputError",
     "InvalidCommandError",
     "InvalidArgumentError",
@@ -0,0 +1,106 @@
+from typing import Iterable, Optional
+from app.contacts import AddressBook, Contact
+from app.logs import logger
+from utils.command_handler import CommandHandler
+from utils.contact_factory import contact_factory
+from utils.errors import ErrorBot
+from utils.file_handler import FileHandler
+from utils.metrics import METRICS
+from utils.renderers import Renderer
+from utils.reports import SummaryReport
+
+
+class BatchReport(SummaryReport):
+    """
+    Summary of a batch run: executed and failed commands, and saves made on the way.
+
+    Failures are counted per error type.
+    """
+
+    COUNTS = ("executed", "failed", "changes", "saves")
+    EXAMPLES_TITLE = "first failed lines"
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        super().__init__()
+
+    def title(self) -> str:
+        return f"Batch {self.source}"
+
+    def add_error(self, line_number: int, error: Exception) -> None:
+        self.failed += 1
+        self.add_failure(type(error).__name__, f"line {line_number}: {error}")
+
+
+def run_batch(
+    lines: Iterable[str],
+    address_book: AddressBook,
+    file_handler: Optional[FileHandler] = None,
+    save_threshold: Optional[int] = None,
+    source: str = "-",
+    renderer: Optional[Renderer] = None,
+) -> BatchReport:
+    """
+    Run command lines one after another with a single CommandHandler.
+
+    A failing line does not stop the batch, also when it fails with an I/O
+    error; the error is counted in the report instead of being printed.
+    Empty lines and lines starting with "#" are skipped, and an exit
+    command ends the batch. The caller saves the book at the end, as
+    after an interactive session; with 'save_threshold' it is also saved with
+    FileHandler.checkpoint() every time that many changes have accumulated.
+
+    :param lines: Command lines, e.g. an open script file or sys.stdin.
+    :type lines: Iterable[str]
+    :param address_book: Address book to run the commands on.
+    :type address_book: AddressBook
+    :param file_handler: Handler the book was loaded with; needed for 'save_threshold'.
+    :type file_handler: FileHandler, optional
+    :param save_threshold: Save after this many changes (None to save only at the end).
+    :type save_threshold: int, optional
+    :param source: Name of the script shown in the report.
+    :type source: str
+    :param renderer: Writes the results of the commands (default: text to stdout).
+    :type renderer: Renderer, optional
+    :return: Summary of the run.
+    :rtype: BatchReport
+    """
+    report = BatchReport(source)
+    handler = CommandHandler(address_book, renderer)
+    pending = 0
+
+    def count_change(operation: str, contact: Contact) -> None:
+        nonlocal pending
+        pending += 1
+        report.changes += 1
+
+    address_book.subscribe(count_change)
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        try:
+            command, contact, args = contact_factory(line)
+            continue_value = handler.handle_command(command, contact, validated=True, args=args)
+        except (ErrorBot, ValueError, OSError) as error:
+            # OSError: file commands (import, export) on a path that cannot be used
+            report.add_error(line_number, error)
+        else:
+            report.executed += 1
+            if continue_value is False:
+                break
+
+        if save_threshold and pending >= save_threshold and file_handler is not None:
+            with METRICS.phase("save"):
+                file_handler.checkpoint(address_book)
+            report.saves += 1
+            pending = 0
+
+    logger.info(
+        "Batch %s: %s executed, %s failed, %s changes.",
+        source,
+        report.executed,
+        report.failed,
+        report.changes,
+    )
+    return report
@@ -37,4 +37,4 @@ class CLIHandler:
 
         self.command = parts[0].lower().strip()
         self.args = parts[1:]
-        logger.info(f"Parsed user input: command, contact(args).")
+        logger.info("Parsed user input: command, contact(args).")
@@ -1,11 +1,15 @@
-import re
+from pathlib import Path
 from app.contacts import Contact, AddressBook
 from utils.errors import (
     InsufficientArgumentsError,
-    ContactNotFoundError,
     MissingRequiredArgumentError,
     InvalidArgumentError,
+    ContactNotFoundError,
 )
+from utils.validate.validate_data import ValidateData
+from utils.commands import COMMANDS, CommandSpec
+from utils.metrics import METRICS
+from utils.renderers import Renderer, TextRenderer
 from app.logs import logger
 
 
@@ -13,19 +17,43 @@ class CommandHandler:
     """
     A class to handle commands for managing an address book.
     Provides methods for adding, retrieving, modifying, and deleting contacts.
+
+    Every command is registered in utils.commands with the name of its handle_*
+    method, so handle_command dispatches with one dictionary lookup and checks
+    the number of arguments and the required fields of a command in one place.
     """
 
-    PHONE_PATTERN = r"^\+\d{1,3}\d{6,12}$"
-    EMAIL_PATTERN = r"^[\w\.-]+@[\w\.-]+\.[\w\.-]+$"
+    DEFAULT_PAGE_SIZE = 20
 
-    def __init__(self, address_book: AddressBook) -> None:
+    PHONE_PATTERN = ValidateData.PHONE_PATTERN
+    EMAIL_PATTERN = ValidateData.EMAIL_PATTERN
+
+    def __init__(
+        self, address_book: AddressBook, renderer: Renderer = None, directory: Path = None
+    ) -> None:
         """
         Initialize CommandHandler with a given address book.
 
         :param address_book: The address book instance to work with.
         :type address_book: AddressBook
+        :param renderer: Writes the results of the commands (default: text to stdout).
+        :type renderer: Renderer, optional
+        :param directory: Directory that relative file paths of "import" and "export"
+            refer to (default: the current working directory). The daemon passes the
+            working directory of the client.
+        :type directory: Path, optional
         """
         self.address_book = address_book
+        self.output = renderer if renderer is not None else TextRenderer()
+        self.directory = directory
+
+    def resolve_path(self, path: str) -> Path:
+        """
+        Return a file path given to a command, relative to the handler's directory.
+        """
+        if self.directory is None:
+            return Path(path)
+        return Path(self.directory) / path
 
     @staticmethod
     def count_args(contact: Contact = None) -> int:
@@ -56,18 +84,16 @@ class CommandHandler:
         """
         Find a contact in the address book by full name.
 
+        The lookup uses the address book's name index, so it does not depend
+        on the number of stored contacts.
+
         :param contact: Contact instance with the full name to search for.
         :type contact: Contact
         :return: The matching contact.
         :rtype: Contact
         :raises ContactNotFoundError: If the contact does not exist.
         """
-        for person in self.address_book.data.values():
-            if person.fullname == contact.fullname:
-                return person
-        else:
-            logger.warning(f'Contact "{contact.fullname}" does not exist.')
-            raise ContactNotFoundError(f'Contact "{contact.fullname}" does not exist.')
+        return self.address_book.find_contact(contact.fullname)
 
     @staticmethod
     def check_phone(phone) -> bool:
@@ -79,7 +105,7 @@ class CommandHandler:
         :return: True if the phone number is valid, False otherwise.
         :rtype: bool
         """
-        return bool(re.match(CommandHandler.PHONE_PATTERN, phone))
+        return bool(ValidateData.PHONE_RE.match(phone))
 
     @staticmethod
     def check_email(email) -> bool:
@@ -91,7 +117,7 @@ class CommandHandler:
         :return: True if the email is valid, False otherwise.
         :rtype: bool
         """
-        return bool(re.match(CommandHandler.EMAIL_PATTERN, email))
+        return bool(ValidateData.EMAIL_RE.match(email))
 
     def handle_exit(self):
         """
@@ -100,258 +126,496 @@ class CommandHandler:
         :return: Always returns False to signal termination.
         :rtype: bool
         """
-        print("Program finished.")
+        self.output.message("Program finished.")
         logger.info("Program finished.")
         return False
 
-    def handle_add(self, contact: Contact, fields_filled: int) -> None:
+    def handle_add(self, contact: Contact) -> None:
         """
         Add a new contact to the address book.
 
         :param contact: The contact to add.
         :type contact: Contact
-        :param fields_filled: The number of non-empty fields provided.
-        :type fields_filled: int
-        :raises InsufficientArgumentsError: If the number of fields is invalid.
-        :raises MissingRequiredArgumentError: If phone and email are missing.
         """
-        if not 2 <= fields_filled <= 4:
-            logger.warning(
-                f"{fields_filled} arguments entered (need 2–4 arguments besides the command)."
-            )
-            raise InsufficientArgumentsError(
-                f"{fields_filled} arguments entered (need 2–4 arguments besides the command)."
-            )
-
-        if contact.phone is None and contact.email is None:
-            logger.warning("Required argument not provided: phone or email.")
-            raise MissingRequiredArgumentError(
-                "Required argument not provided: phone or email."
-            )
-
         # Add contact to the address book and log the action
         self.address_book.add_contact(contact)
-        logger.debug(f"Contact added: {repr(contact)}")
-        print(f"Contact added:\n{contact}")
+        logger.debug("Contact added: %r", contact)
+        self.output.contact("Contact added:", contact)
 
-    def handle_phone(self, contact: Contact, fields_filled: int) -> None:
+    def handle_phone(self, contact: Contact) -> None:
         """
         Retrieve the phone number of a contact.
 
         :param contact: The contact to search for.
         :type contact: Contact
-        :param fields_filled: The number of non-empty fields provided.
-        :type fields_filled: int
-        :raises InsufficientArgumentsError: If the number of fields is invalid.
         :raises ContactNotFoundError: If the contact does not exist.
         """
-        if not 1 <= fields_filled <= 2:
-            logger.warning(
-                f"{fields_filled} arguments entered (need 1-2 arguments besides the command)."
-            )
-            raise InsufficientArgumentsError(
-                f"{fields_filled} arguments entered (need 1-2 arguments besides the command)."
-            )
-
         person = self._find_contact(contact)
-        logger.debug(f"Person phone: {person.phone}.")
-        print(f"Person phone: {person.phone}.\n")
+        logger.debug("Person phone: %s.", person.phone)
+        self.output.message(
+            f"Person phone: {person.phone}.\n", fullname=person.fullname, phone=person.phone
+        )
         return True
 
-    def handle_email(self, contact: Contact, fields_filled: int) -> None:
+    def handle_email(self, contact: Contact) -> None:
         """
         Retrieve the email address of a contact.
 
         :param contact: The contact to search for.
         :type contact: Contact
-        :param fields_filled: The number of non-empty fields provided.
-        :type fields_filled: int
-        :raises InsufficientArgumentsError: If the number of fields is invalid.
         :raises ContactNotFoundError: If the contact does not exist.
         """
-        if not 1 <= fields_filled <= 2:
-            logger.warning(
-                f"{fields_filled} arguments entered (need 1-2 arguments besides the command)."
-            )
-            raise InsufficientArgumentsError(
-                f"{fields_filled} arguments entered (need 1-2 arguments besides the command)."
-            )
-
         person = self._find_contact(contact)
-        logger.debug(f"Person email: {person.email}.")
-        print(f"Person email: {person.email}.\n")
+        logger.debug("Person email: %s.", person.email)
+        self.output.message(
+            f"Person email: {person.email}.\n", fullname=person.fullname, email=person.email
+        )
         return True
 
-    def handle_change_phone(self, contact: Contact, fields_filled: int) -> None:
+    def handle_by_phone(self, contact: Contact) -> None:
         """
-        Change the phone number of an existing contact.
+        Show the contacts with a given phone number (reverse lookup).
 
-        :param contact: The contact whose phone will be changed.
+        Usage: by_phone <phone>
+
+        :param contact: Contact holding only the phone number to look up.
         :type contact: Contact
-        :param fields_filled: The number of non-empty fields provided.
-        :type fields_filled: int
-        :raises InsufficientArgumentsError: If the number of fields is invalid.
-        :raises MissingRequiredArgumentError: If the phone field is missing.
-        :raises InvalidArgumentError: If the phone number format is invalid.
-        :raises ContactNotFoundError: If the contact does not exist.
+        :raises ContactNotFoundError: If no contact has this phone number.
         """
-        if not 2 <= fields_filled <= 3:
-            logger.warning(
-                f"{fields_filled} arguments entered (need 2-3 arguments besides the command)."
-            )
-            raise InsufficientArgumentsError(
-                f"{fields_filled} arguments entered (need 2-3 arguments besides the command)."
-            )
+        with METRICS.phase("lookup"):
+            found = self.address_book.get_by_phone(contact.phone)
+        self._print_reverse_lookup(found, contact.phone)
+        return True
 
-        if contact.phone is None:
-            logger.warning("Required argument not provided: phone.")
-            raise MissingRequiredArgumentError("Required argument not provided: phone.")
+    def handle_by_email(self, contact: Contact) -> None:
+        """
+        Show the contacts with a given email address (reverse lookup, case-insensitive).
 
-        if not self.check_phone(contact.phone):
-            logger.warning("Incorrect value entered.")
-            raise InvalidArgumentError("Incorrect value entered.")
+        Usage: by_email <email>
 
-        person = self._find_contact(contact)
-        person.phone = contact.phone
-        logger.debug(f"{person.fullname} changed phone on {person.phone}.")
-        print(f"Changed phone on {person.phone}.\n")
+        :param contact: Contact holding only the email address to look up.
+        :type contact: Contact
+        :raises ContactNotFoundError: If no contact has this email address.
+        """
+        with METRICS.phase("lookup"):
+            found = self.address_book.get_by_email(contact.email)
+        self._print_reverse_lookup(found, contact.email)
         return True
 
-    def handle_change_email(self, contact: Contact, fields_filled: int) -> None:
+    def _print_reverse_lookup(self, found: list, value: str) -> None:
+        if not found:
+            logger.warning('No contact with "%s".', value)
+            raise ContactNotFoundError(f'No contact with "{value}".')
+
+        logger.debug("%s: %s contacts found.", value, len(found))
+        self.output.contacts(found, f"\nFound {len(found)} contacts with {value} \n" f"{'-' * 35}")
+
+    def handle_change_phone(self, contact: Contact) -> None:
+        """
+        Change the phone number of an existing contact.
+
+        :param contact: The contact whose phone will be changed.
+        :type contact: Contact
+        :raises ContactNotFoundError: If the contact does not exist.
+        """
+        person = self.address_book.change_phone(contact.fullname, contact.phone)
+        logger.debug("%s changed phone on %s.", person.fullname, person.phone)
+        self.output.message(
+            f"Changed phone on {person.phone}.\n", fullname=person.fullname, phone=person.phone
+        )
+        return True
+
+    def handle_change_email(self, contact: Contact) -> None:
         """
         Change the email address of an existing contact.
 
         :param contact: The contact whose email will be changed.
         :type contact: Contact
-        :param fields_filled: The number of non-empty fields provided.
-        :type fields_filled: int
-        :raises InsufficientArgumentsError: If the number of fields is invalid.
-        :raises MissingRequiredArgumentError: If the email field is missing.
-        :raises InvalidArgumentError: If the email format is invalid.
         :raises ContactNotFoundError: If the contact does not exist.
         """
-        if not 2 <= fields_filled <= 3:
-            logger.warning(
-                f"{fields_filled} arguments entered (need 2-3 arguments besides the command)."
-            )
-            raise InsufficientArgumentsError(
-                f"{fields_filled} arguments entered (need 2-3 arguments besides the command)."
-            )
+        person = self.address_book.change_email(contact.fullname, contact.email)
+        logger.debug("Email changed on %s.", person.email)
+        self.output.message(
+            f"Email changed on {person.email}.\n", fullname=person.fullname, email=person.email
+        )
+        return True
 
-        if contact.email is None:
-            logger.warning("Required argument not provided: email.")
-            raise MissingRequiredArgumentError("Required argument not provided: email.")
+    @staticmethod
+    def parse_all_options(args: list) -> dict:
+        """
+        Parse the options of the "all" command: --page N, --size K and --limit L.
 
-        if not self.check_email(contact.email):
-            logger.warning("Incorrect value entered.")
-            raise InvalidArgumentError("Incorrect value entered.")
+        :param args: Command arguments.
+        :type args: list
+        :return: Dictionary with the "page", "size" and "limit" values (None if not given).
+        :rtype: dict
+        :raises InvalidArgumentError: If an option is unknown or its value is not a positive integer.
+        """
+        options = {"page": None, "size": None, "limit": None}
+        if len(args) % 2:
+            logger.warning("Option without a value: '%s'.", args[-1])
+            raise InvalidArgumentError(f"Option without a value: '{args[-1]}'.")
+
+        for option, value in zip(args[::2], args[1::2]):
+            name = option.removeprefix("--")
+            if not option.startswith("--") or name not in options:
+                logger.warning("Invalid argument detected: '%s'", option)
+                raise InvalidArgumentError(f"Invalid argument detected: '{option}'")
+            if not value.isdigit() or int(value) < 1:
+                logger.warning("Invalid argument detected: '%s'", value)
+                raise InvalidArgumentError(
+                    f"Invalid argument detected: '{value}' (--{name} needs a positive integer)."
+                )
+            options[name] = int(value)
+        return options
 
-        person = self._find_contact(contact)
-        person.email = contact.email
-        logger.debug(f"Email changed on {person.email}.")
-        print(f"Email changed on {person.email}.\n")
-        return True
+    @staticmethod
+    def parse_workers_option(args: list) -> tuple[int, list]:
+        """
+        Take a leading "--workers N" option off the arguments of "import" and "revalidate".
+
+        :param args: Command arguments.
+        :type args: list
+        :return: The number of worker processes (1 if not given) and the remaining arguments.
+        :rtype: tuple[int, list]
+        :raises InvalidArgumentError: If the value is not a positive integer.
+        """
+        if not args or args[0] != "--workers":
+            return 1, list(args)
+
+        value = args[1] if len(args) > 1 else ""
+        if not value.isdigit() or int(value) < 1:
+            logger.warning("Invalid argument detected: '%s'", value)
+            raise InvalidArgumentError(
+                f"Invalid argument detected: '{value}' (--workers needs a positive integer)."
+            )
+        return int(value), list(args[2:])
 
-    def handle_all(self, fields_filled: int) -> None:
+    def handle_all(self, args: list = None) -> None:
         """
         Display all contacts in the address book, sorted by full name.
 
-        :param fields_filled: Number of non-empty fields provided.
-        :type fields_filled: int
-        :raises InsufficientArgumentsError: If extra arguments are provided.
+        Usage: all [--page N --size K] [--limit L]
 
-        The method prints all contacts in ascending order by full name.
-        If the address book is empty, a message indicating this is displayed.
+        :param args: Paging options (see parse_all_options).
+        :type args: list, optional
+        :raises InvalidArgumentError: If the paging options are invalid or the page
+            is past the last one.
+
+        The method prints contacts in ascending order by full name, all of them or
+        one page ("--page 1" is the first page, "--size" defaults to 20), or the
+        first "--limit" contacts. The sorted order is maintained by the address
+        book, so a page costs time proportional to its size. The renderer writes
+        the contacts in chunks. If the address book is empty, a message indicating this is displayed.
         """
-        if fields_filled != 0:
-            logger.warning(
-                f"{fields_filled} arguments entered (need 0 arguments besides the command)."
-            )
-            raise InsufficientArgumentsError(
-                f"{fields_filled} arguments entered (need 0 arguments besides the command)."
-            )
+        options = self.parse_all_options(args or [])
 
-        if not len(self.address_book.data.values()) > 0:
+        total = len(self.address_book)
+        if not total > 0:
             logger.warning("Address book is empty.")
-            print("Address book is empty.\n")
+            self.output.message("Address book is empty.\n", total=0)
             return True
 
+        page = size = None
+        start, stop = 0, None
+        if options["page"] or options["size"]:
+            page = options["page"] or 1
+            size = options["size"] or self.DEFAULT_PAGE_SIZE
+            start = (page - 1) * size
+            stop = start + size
+            pages = -(-total // size)
+            if start >= total:
+                logger.warning("Page %s does not exist (%s pages).", page, pages)
+                raise InvalidArgumentError(
+                    f"Page {page} does not exist: {total} contacts fit on {pages} pages "
+                    f"of {size}."
+                )
+        if options["limit"]:
+            limit_stop = start + options["limit"]
+            stop = limit_stop if stop is None else min(stop, limit_stop)
+
         # Print all contacts
-        print("\nContacs \n" f"{'-' * 35}")
-        for person in sorted(self.address_book.data.values(), key=lambda p: p.fullname):
-            print(person)
+        self.output.contacts(
+            self.address_book.sorted_slice(start, stop), "\nContacs \n" f"{'-' * 35}"
+        )
 
-    def handle_delete(self, contact: Contact, fields_filled: int) -> None:
+        if page is not None:
+            self.output.message(
+                f"Page {page} of {pages} ({total} contacts).\n",
+                page=page,
+                pages=pages,
+                total=total,
+            )
+
+    def handle_delete(self, contact: Contact) -> None:
         """
         Delete a contact from the address book.
 
         :param contact: The contact to delete.
         :type contact: Contact
-        :param fields_filled: Number of non-empty fields provided.
-        :type fields_filled: int
-        :raises InsufficientArgumentsError: If invalid number of fields is provided.
         """
-        if not 0 < fields_filled <= 2:
+        # Remove contact from the address book and log the action
+        self.address_book.remove_contact(contact.fullname)
+        logger.debug("Contact %s deleted.", contact.fullname)
+        self.output.message(f"Deleted contact: {contact.fullname}.\n", fullname=contact.fullname)
+
+    def handle_search(self, args: list) -> None:
+        """
+        Search contacts by the beginning of the full name or approximately.
+
+        Usage: search [--fuzzy] [--limit N] <name>
+
+        Without --fuzzy, contacts whose full name starts with <name> are shown in
+        sorted order. With --fuzzy, the closest names are shown (e.g. "Jonh Smit"
+        finds "John Smith"), best match first. Both are case-insensitive.
+
+        :param args: Command arguments.
+        :type args: list
+        :raises InsufficientArgumentsError: If no name is provided.
+        :raises InvalidArgumentError: If --limit is not a positive integer.
+        """
+        args = list(args)
+        fuzzy = "--fuzzy" in args
+        if fuzzy:
+            args.remove("--fuzzy")
+
+        limit = self.DEFAULT_PAGE_SIZE
+        if "--limit" in args:
+            position = args.index("--limit")
+            value = args[position + 1] if position + 1 < len(args) else ""
+            if not value.isdigit() or int(value) < 1:
+                logger.warning("Invalid argument detected: '%s'", value)
+                raise InvalidArgumentError(
+                    f"Invalid argument detected: '{value}' (--limit needs a positive integer)."
+                )
+            limit = int(value)
+            del args[position : position + 2]
+
+        if not args:
+            logger.warning("0 arguments entered (need a name besides the command).")
+            raise InsufficientArgumentsError(
+                "0 arguments entered (need a name besides the command)."
+            )
+
+        query = " ".join(args)
+        if fuzzy:
+            found = self.address_book.search_fuzzy(query, limit)
+        else:
+            found = self.address_book.search_prefix(query, limit)
+
+        logger.debug(
+            "Search %r (fuzzy=%s): %s contacts found.",
+            query,
+            fuzzy,
+            len(found),
+        )
+        if not found:
+            self.output.message(f'No contacts found for "{query}".\n', found=0)
+            return
+
+        self.output.contacts(found, f"\nFound {len(found)} contacts \n" f"{'-' * 35}")
+
+    def handle_import(self, args: list) -> None:
+        """
+        Import contacts from a CSV or vCard file.
+
+        Usage: import [--workers N] <file>
+
+        The file is streamed and validated in batches, by N worker processes if
+        --workers is given; one summary report is printed instead of a message per contact.
+
+        :param args: Command arguments: the path to the file.
+        :type args: list
+        :raises InsufficientArgumentsError: If no file path is provided.
+        :raises InvalidArgumentError: If the file does not exist or its format is not supported.
+        """
+        workers, args = self.parse_workers_option(args)
+        if not args:
+            logger.warning("0 arguments entered (need a file path besides the command).")
+            raise InsufficientArgumentsError(
+                "0 arguments entered (need a file path besides the command)."
+            )
+
+        # Imported on use: csv and the import machinery are not needed by other commands
+        from utils.importer import import_contacts
+
+        report = import_contacts(
+            self.resolve_path(" ".join(args)), self.address_book, workers=workers
+        )
+        self.output.report(report)
+
+    def handle_revalidate(self, args: list) -> None:
+        """
+        Check every contact against the current validation rules and print the invalid ones.
+
+        Usage: revalidate [--workers N]
+
+        :param args: Command arguments: only the --workers option.
+        :type args: list
+        :raises InsufficientArgumentsError: If other arguments are provided.
+        :raises InvalidArgumentError: If --workers is not a positive integer.
+        """
+        workers, args = self.parse_workers_option(args)
+        if args:
             logger.warning(
-                f"Invalid number of arguments: {fields_filled} entered (need 1 arguments besides the command)."
+                "%s arguments entered (need 0 arguments besides the command).", len(args)
             )
             raise InsufficientArgumentsError(
-                f"Invalid number of arguments: {fields_filled} entered (need 1 arguments besides the command)."
+                f"{len(args)} arguments entered (need 0 arguments besides the command)."
             )
 
-        # Remove contact from the address book and log the action
-        self.address_book.remove_contact(contact.fullname)
-        logger.debug(f"Contact {contact.fullname} deleted.")
-        print(f"Deleted contact: {contact.fullname}.\n")
+        # Imported on use, like for "import"
+        from utils.importer import revalidate_contacts
+
+        self.output.report(revalidate_contacts(self.address_book, workers=workers))
 
-    def handle_command(self, command: str, contact: Contact = None) -> bool | None:
+    def handle_stats(self, args: list) -> None:
         """
-        Handle a user command by routing it to the appropriate handler.
+        Show the timings of the commands and their phases (p50/p95/p99) and the counters.
 
-        :param command: The command to execute.
-        :type command: str
-        :param contact: Optional contact for commands that require it.
-        :type contact: Contact, optional
-        :return: False if the program should exit, True otherwise.
-        :rtype: bool | None
+        Usage: stats
+
+        The metrics are only collected when the program was started with
+        --stats, --stats-file or --slow-ms (see utils.metrics).
+
+        :param args: Command arguments: none.
+        :type args: list
+        :raises InsufficientArgumentsError: If arguments are provided.
         """
+        if args:
+            logger.warning(
+                "%s arguments entered (need 0 arguments besides the command).", len(args)
+            )
+            raise InsufficientArgumentsError(
+                f"{len(args)} arguments entered (need 0 arguments besides the command)."
+            )
 
-        # Count the number of non-empty fields in the contact
-        fields_filled = self.count_args(contact)
+        if not METRICS.enabled:
+            self.output.message("Statistics are not collected (start the program with --stats).\n")
+            return
+        self.output.report(METRICS.report())
 
-        # Exit commands
-        if command in ["exit", "quit", "q", "close"]:
-            return self.handle_exit()
+    def handle_export(self, args: list) -> None:
+        """
+        Export contacts to a CSV, JSON Lines or vCard file, sorted by full name.
 
-        # Add a new contact
-        elif command == "add" and contact:
-            self.handle_add(contact, fields_filled)
+        Usage: export <csv|jsonl|vcard> <file> [name prefix]
 
-        # Retrieve phone of a contact
-        elif command == "phone" and contact:
-            self.handle_phone(contact, fields_filled)
+        :param args: Command arguments: format, file path and an optional name prefix.
+        :type args: list
+        :raises InsufficientArgumentsError: If the number of arguments is invalid.
+        :raises InvalidArgumentError: If the format is not supported or the file cannot be written.
+        """
+        # Imported on use: csv and json are not needed by other commands
+        from utils.exporter import EXPORTERS, export_contacts
 
-        # Retrieve email of a contact
-        elif command == "email" and contact:
-            self.handle_email(contact, fields_filled)
+        if not 2 <= len(args) <= 3:
+            logger.warning(
+                "%s arguments entered (need 2-3 arguments besides the command).",
+                len(args),
+            )
+            raise InsufficientArgumentsError(
+                f"{len(args)} arguments entered (need 2-3 arguments besides the command): "
+                f"export <{'|'.join(EXPORTERS)}> <file> [name prefix]."
+            )
 
-        # Change phone of a contact
-        elif command in ["change_phone", "c_p"] and contact:
-            self.handle_change_phone(contact, fields_filled)
+        export_format, path, *prefix = args
+        exported = export_contacts(
+            self.address_book,
+            export_format.lower(),
+            self.resolve_path(path),
+            prefix[0] if prefix else None,
+        )
+        self.output.message(
+            f"Exported {exported} contacts to {path}.\n", exported=exported, path=path
+        )
 
-        # Change email of a contact
-        elif command in ["change_email", "c_e"] and contact:
-            self.handle_change_email(contact, fields_filled)
+    def check_arguments(self, spec: CommandSpec, contact: Contact, validated: bool) -> None:
+        """
+        Check a contact against the rules of a command before its handler runs.
 
-        # Show all contacts
-        elif command == "all":
-            self.handle_all(fields_filled)
+        :param spec: Descriptor of the command (see utils.commands).
+        :type spec: CommandSpec
+        :param contact: The parsed contact.
+        :type contact: Contact
+        :param validated: True if ValidateData already checked the phone and email formats.
+        :type validated: bool
+        :raises InsufficientArgumentsError: If the number of fields is not in the range of the command.
+        :raises MissingRequiredArgumentError: If none of the required fields is given.
+        :raises InvalidArgumentError: If a required field has an invalid format.
+        """
+        fields_filled = self.count_args(contact)
+        if not spec.min_fields <= fields_filled <= spec.max_fields:
+            logger.warning(
+                "%s arguments entered (need %s besides the command).",
+                fields_filled,
+                spec.arity,
+            )
+            raise InsufficientArgumentsError(
+                f"{fields_filled} arguments entered (need {spec.arity} besides the command)."
+            )
 
-        # Deleted a contact
-        elif command in ["delete", "del"]:
-            self.handle_delete(contact, fields_filled)
+        if not spec.required:
+            return
 
-        else:
+        given = [field for field in spec.required if getattr(contact, field) is not None]
+        if not given:
+            missing = " or ".join(spec.required)
+            logger.warning("Required argument not provided: %s.", missing)
+            raise MissingRequiredArgumentError(f"Required argument not provided: {missing}.")
+
+        if validated:
+            return
+        checks = {"phone": self.check_phone, "email": self.check_email}
+        if not all(checks[field](getattr(contact, field)) for field in given):
+            logger.warning("Incorrect value entered.")
+            raise InvalidArgumentError("Incorrect value entered.")
+
+    def handle_command(
+        self,
+        command: str,
+        contact: Contact = None,
+        validated: bool = False,
+        args: list = None,
+    ) -> bool | None:
+        """
+        Handle a user command by routing it to the appropriate handler.
+
+        The command is looked up in the command registry (utils.commands.COMMANDS);
+        the arguments of commands that take a contact are checked against its
+        descriptor (check_arguments) before the handler method is called.
+
+        :param command: The command to execute.
+        :type command: str
+        :param contact: Optional contact for commands that require it.
+        :type contact: Contact, optional
+        :param validated: True if the contact was built by contact_factory, whose
+            ValidateData already checked the phone and email formats.
+        :type validated: bool
+        :param args: Raw arguments for commands that do not take contact data
+            (CommandSpec.raw_args, e.g. "all", "search", "import", "export").
+        :type args: list, optional
+        :return: False if the program should exit, True otherwise.
+        :rtype: bool | None
+        """
+        spec = COMMANDS.get(command)
+        if spec is None:
             logger.warning("Invalid command.")
-            print("Invalid command!")
-        return True
+            self.output.message("Invalid command!")
+            return True
+
+        method = getattr(self, spec.handler)
+        with METRICS.command(spec.name):
+            if spec.takes == "contact":
+                contact = contact or Contact(None, None, None, None)
+                self.check_arguments(spec, contact, validated)
+                result = method(contact)
+            elif spec.takes == "args":
+                result = method(args or [])
+            else:
+                result = method()
+        return result is not False
+
+
+# Timed while the metrics are enabled (utils.metrics); runs for most commands
+METRICS.instrument(CommandHandler, "_find_contact", "lookup")
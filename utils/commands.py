@@ -0,0 +1,141 @@
+from typing import Dict, Optional, Tuple
+
+
+class CommandSpec:
+    """
+    Descriptor of one command: the CommandHandler method that runs it and the
+    rules CommandHandler.handle_command checks before calling that method.
+
+    :ivar str name: Main name of the command.
+    :ivar str handler: Name of the CommandHandler method that runs the command.
+    :ivar Tuple[str, ...] aliases: Other names of the command.
+    :ivar str | None takes: What the method is called with: "contact" (the parsed
+        Contact), "args" (the raw arguments, not parsed as contact data) or None (nothing).
+    :ivar int min_fields: Minimum number of filled contact fields.
+    :ivar int max_fields: Maximum number of filled contact fields.
+    :ivar Tuple[str, ...] required: Contact fields of which at least one must be given.
+    :ivar bool read_only: True if the command never changes the address book.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: str,
+        aliases: Tuple[str, ...] = (),
+        takes: Optional[str] = "contact",
+        fields: Tuple[int, int] = (0, 4),
+        required: Tuple[str, ...] = (),
+        read_only: bool = False,
+    ) -> None:
+        """
+        Initialize a CommandSpec object.
+
+        :param name: Main name of the command.
+        :type name: str
+        :param handler: Name of the CommandHandler method that runs the command.
+        :type handler: str
+        :param aliases: Other names of the command.
+        :type aliases: Tuple[str, ...]
+        :param takes: "contact", "args" or None (see the class docstring).
+        :type takes: str, optional
+        :param fields: Allowed range (min, max) of filled contact fields.
+        :type fields: Tuple[int, int]
+        :param required: Contact fields of which at least one must be given.
+        :type required: Tuple[str, ...]
+        :param read_only: True if the command never changes the address book.
+        :type read_only: bool
+        """
+        if takes not in ("contact", "args", None):
+            raise ValueError(f"Unknown argument kind {takes!r} of command {name!r}.")
+        self.name = name
+        self.handler = handler
+        self.aliases = tuple(aliases)
+        self.takes = takes
+        self.min_fields, self.max_fields = fields
+        self.required = tuple(required)
+        self.read_only = read_only
+
+    @property
+    def raw_args(self) -> bool:
+        """
+        True if the arguments are kept as they are instead of being parsed as contact data.
+        """
+        return self.takes == "args"
+
+    @property
+    def arity(self) -> str:
+        """
+        The allowed number of arguments as shown in error messages, e.g. "1 argument" or "2-3 arguments".
+        """
+        if self.min_fields == self.max_fields:
+            count = str(self.min_fields)
+        else:
+            count = f"{self.min_fields}-{self.max_fields}"
+        return f"{count} argument" if count == "1" else f"{count} arguments"
+
+    def __repr__(self) -> str:
+        return (
+            f"CommandSpec({self.name!r}, {self.handler!r}, takes={self.takes!r}, "
+            f"read_only={self.read_only})"
+        )
+
+
+# Every name and alias of every command -> its CommandSpec
+COMMANDS: Dict[str, CommandSpec] = {}
+
+
+def register_command(spec: CommandSpec) -> CommandSpec:
+    """
+    Add a command to COMMANDS under its name and all its aliases.
+
+    A registered command is accepted by ValidateData and dispatched by
+    CommandHandler.handle_command to the method named by spec.handler.
+
+    :param spec: Descriptor of the command.
+    :type spec: CommandSpec
+    :return: The registered descriptor.
+    :rtype: CommandSpec
+    :raises ValueError: If a name or alias is already registered.
+    """
+    names = (spec.name, *spec.aliases)
+    taken = [name for name in names if name in COMMANDS]
+    if taken:
+        raise ValueError(f"Command already registered: {', '.join(taken)}.")
+    for name in names:
+        COMMANDS[name] = spec
+    return spec
+
+
+def is_read_only(command: str) -> bool:
+    """
+    Tell whether a command never changes the address book.
+
+    Callers use it to skip saving or to take a shared instead of an
+    exclusive lock. Unknown commands are not read-only.
+
+    :param command: Command name or alias.
+    :type command: str
+    :rtype: bool
+    """
+    spec = COMMANDS.get(command)
+    return spec is not None and spec.read_only
+
+
+for _spec in (
+    CommandSpec("exit", "handle_exit", aliases=("quit", "q", "close"), takes=None, read_only=True),
+    CommandSpec("add", "handle_add", fields=(2, 4), required=("phone", "email")),
+    CommandSpec("phone", "handle_phone", fields=(1, 2), read_only=True),
+    CommandSpec("email", "handle_email", fields=(1, 2), read_only=True),
+    CommandSpec("by_phone", "handle_by_phone", fields=(1, 1), required=("phone",), read_only=True),
+    CommandSpec("by_email", "handle_by_email", fields=(1, 1), required=("email",), read_only=True),
+    CommandSpec("change_phone", "handle_change_phone", aliases=("c_p",), fields=(2, 3), required=("phone",)),
+    CommandSpec("change_email", "handle_change_email", aliases=("c_e",), fields=(2, 3), required=("email",)),
+    CommandSpec("all", "handle_all", takes="args", read_only=True),
+    CommandSpec("delete", "handle_delete", aliases=("del",), fields=(1, 2)),
+    CommandSpec("search", "handle_search", takes="args", read_only=True),
+    CommandSpec("import", "handle_import", takes="args"),
+    CommandSpec("export", "handle_export", takes="args", read_only=True),
+    CommandSpec("revalidate", "handle_revalidate", takes="args", read_only=True),
+    CommandSpec("stats", "handle_stats", takes="args", read_only=True),
+):
+    register_command(_spec)
@@ -1,10 +1,15 @@
 from utils.cli_handler import CLIHandler
 from utils.validate.validate_data import ValidateData
+from utils.metrics import METRICS
 from app.contacts import Contact
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
+# Timed while the metrics are enabled (utils.metrics)
+METRICS.instrument(CLIHandler, "parse_input", "parse")
+METRICS.instrument(ValidateData, "__init__", "validate")
 
-def contact_factory(user_input: str) -> Tuple[Optional[str], Contact]:
+
+def contact_factory(user_input: str) -> Tuple[Optional[str], Contact, List[str]]:
     """
     Parses user input into a command and a list of arguments to create a Contact.
 
@@ -13,9 +18,13 @@ def contact_factory(user_input: str) -> Tuple[Optional[str], Contact]:
 
     :param user_input: Raw input string from the user.
     :type user_input: str
-    :return: A tuple containing the validated command (str or None) and
-            a Contact object created from the input arguments.
-    :rtype: Tuple[Optional[str], Contact]
+    :return: A tuple containing the validated command (str or None),
+            a Contact object created from the input arguments and the raw
+            arguments. The Contact fields are already validated, so it can be
+            passed to CommandHandler.handle_command with validated=True. The raw
+            arguments are used by commands that do not take contact data
+            (CommandSpec.raw_args in utils.commands, e.g. "import <file>").
+    :rtype: Tuple[Optional[str], Contact, List[str]]
     """
 
     # Parsing the user input into a command and its arguments.
@@ -37,4 +46,4 @@ def contact_factory(user_input: str) -> Tuple[Optional[str], Contact]:
         first_name=first_name, last_name=last_name, phone=phone, email=email
     )
 
-    return command, contact
+    return command, contact, validate.args
@@ -0,0 +1,375 @@
+import asyncio
+import contextlib
+import io
+import signal
+import socket
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+from app.contacts import AddressBook, Contact
+from app.logs import logger
+from utils.command_handler import CommandHandler
+from utils.commands import is_read_only
+from utils.contact_factory import contact_factory
+from utils.errors import ErrorBot, InvalidArgumentError
+from utils.file_handler import FileHandler
+from utils.metrics import METRICS
+from utils.renderers import Renderer, create_renderer
+from utils.rwlock import ReadWriteLock
+
+# Longest accepted command line, in bytes
+MAX_REQUEST = 1 << 16
+
+# Most "--name value" header lines accepted before the command line of a request
+MAX_HEADERS = 8
+
+
+def forward_command(
+    socket_path: Path,
+    command_line: str,
+    timeout: float = 30.0,
+    output: Optional[str] = None,
+    directory: Optional[Path] = None,
+) -> Optional[str]:
+    """
+    Send a command line to a running daemon and return its output.
+
+    The request is the command line, preceded by one "--name value" line per
+    option given: "--output <format>" and "--cwd <directory>".
+
+    :param socket_path: Path to the daemon's socket.
+    :type socket_path: Path
+    :param command_line: Command with its arguments, as typed on the command line.
+    :type command_line: str
+    :param timeout: Seconds to wait for the daemon.
+    :type timeout: float
+    :param output: Output format of the result, e.g. "json" (default: the daemon's format).
+    :type output: str, optional
+    :param directory: Directory that relative file paths of the command refer to, i.e.
+        the working directory of the client (default: the daemon's working directory).
+    :type directory: Path, optional
+    :return: The output of the command, or None if no daemon is listening on the socket.
+    :rtype: str | None
+    :raises TimeoutError: If the daemon did not answer within 'timeout' seconds.
+    """
+    headers = {"output": output, "cwd": directory}
+    request = "".join(f"--{name} {value}\n" for name, value in headers.items() if value)
+    request += command_line + "\n"
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(socket_path))
+            client.sendall(request.encode("utf-8"))
+            client.shutdown(socket.SHUT_WR)
+            chunks = []
+            while chunk := client.recv(65536):
+                chunks.append(chunk)
+    except (FileNotFoundError, ConnectionRefusedError):
+        # No daemon, or a stale socket left by one that was killed
+        return None
+    return b"".join(chunks).decode("utf-8")
+
+
+def daemon_is_running(socket_path: Path) -> bool:
+    """
+    Tell whether a daemon answers on the socket; a stale socket file left by a
+    killed daemon does not count.
+
+    :param socket_path: Path to the daemon's socket.
+    :type socket_path: Path
+    :rtype: bool
+    """
+    if not Path(socket_path).exists():
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+    return True
+
+
+class _ThreadOutput(io.TextIOBase):
+    """
+    Replacement for sys.stdout that gives every worker thread its own output buffer.
+
+    contextlib.redirect_stdout() swaps sys.stdout for the whole process, which
+    mixes up the output of commands running at the same time.
+    """
+
+    def __init__(self, stream) -> None:
+        self.stream = stream
+        self._local = threading.local()
+
+    def write(self, text: str) -> int:
+        return getattr(self._local, "buffer", self.stream).write(text)
+
+    def flush(self) -> None:
+        getattr(self._local, "buffer", self.stream).flush()
+
+    @contextlib.contextmanager
+    def capture(self) -> Iterator[io.StringIO]:
+        """
+        Collect everything the current thread prints inside the with-block.
+        """
+        self._local.buffer = io.StringIO()
+        try:
+            yield self._local.buffer
+        finally:
+            del self._local.buffer
+
+
+class AddressBookDaemon:
+    """
+    Keeps one AddressBook in memory and runs command lines sent over a Unix domain socket.
+
+    The server runs on asyncio. Read-only commands (utils.commands.is_read_only)
+    run concurrently in a pool of reader threads under the read side of a
+    ReadWriteLock. Mutations are queued to a single writer task, which runs
+    them one at a time under the write side, so they never overlap with reads
+    or with each other. The printed output of a command is sent back to its client,
+    in the output format the client asked for (see forward_command), or else in
+    the format the daemon was started with; relative file paths of a command
+    refer to the working directory of the client.
+
+    Instead of saving after every call, the writer task saves the book with
+    FileHandler.checkpoint() every 'save_interval' seconds if it was changed,
+    and as soon as 'save_threshold' changes have accumulated.
+    """
+
+    SAVE_INTERVAL = 5.0
+    SAVE_THRESHOLD = 100
+    READERS = 8
+
+    def __init__(
+        self,
+        address_book: AddressBook,
+        file_handler: FileHandler,
+        socket_path: Path,
+        save_interval: float = SAVE_INTERVAL,
+        save_threshold: int = SAVE_THRESHOLD,
+        readers: int = READERS,
+        renderer: Optional[Renderer] = None,
+    ) -> None:
+        """
+        Initialize the daemon.
+
+        :param address_book: The address book to serve.
+        :type address_book: AddressBook
+        :param file_handler: Handler the book was loaded with; used to save it.
+        :type file_handler: FileHandler
+        :param socket_path: Path of the Unix domain socket to listen on.
+        :type socket_path: Path
+        :param save_interval: Seconds between saves of a changed book.
+        :type save_interval: float
+        :param save_threshold: Number of changes that triggers a save right away.
+        :type save_threshold: int
+        :param readers: Number of threads running read-only commands.
+        :type readers: int
+        :param renderer: Output format of the results sent to the clients (default: text).
+        :type renderer: Renderer, optional
+        """
+        self.address_book = address_book
+        self.file_handler = file_handler
+        self.socket_path = Path(socket_path)
+        self.save_interval = save_interval
+        self.save_threshold = save_threshold
+        self.handler = CommandHandler(address_book, renderer)
+        self.changes = 0
+        self.lock = ReadWriteLock()
+        self._readers = ThreadPoolExecutor(readers, thread_name_prefix="daemon-reader")
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="daemon-writer")
+        self._writes = None
+        self._output = None
+        address_book.subscribe(self._count_change)
+
+    def _count_change(self, operation: str, contact: Contact) -> None:
+        self.changes += 1
+
+    def _run(
+        self, handler: CommandHandler, command: str, contact: Contact, args: list, lock
+    ) -> str:
+        """
+        Run a parsed command in a worker thread and return everything it printed.
+        """
+        with lock(), self._output.capture() as output:
+            try:
+                handler.handle_command(command, contact, validated=True, args=args)
+            except (ErrorBot, ValueError) as error_message:
+                handler.output.error(error_message)
+            return output.getvalue()
+
+    def _handler_for(self, options: dict) -> CommandHandler:
+        """
+        Return the CommandHandler of a request: in the output format the client
+        asked for, with file paths relative to the client's working directory.
+
+        A handler only holds the book, a renderer and a directory, so one is
+        made per request that sends options; the book is shared.
+
+        :param options: Header options of the request ("output", "cwd").
+        :type options: dict
+        :raises InvalidArgumentError: If the output format is unknown.
+        """
+        if not options:
+            return self.handler
+        # The renderer writes to the current sys.stdout, i.e. the capture of the thread
+        renderer = create_renderer(options["output"]) if "output" in options else None
+        return CommandHandler(
+            self.address_book,
+            renderer or self.handler.output,
+            Path(options["cwd"]) if "cwd" in options else None,
+        )
+
+    def _save(self) -> None:
+        # Runs on the writer thread; the read side keeps other writers out
+        with self.lock.read():
+            if self.changes:
+                with METRICS.phase("save"):
+                    self.file_handler.checkpoint(self.address_book)
+                logger.info("Daemon saved %s changes.", self.changes)
+                self.changes = 0
+
+    async def execute(self, command_line: str, options: Optional[dict] = None) -> str:
+        """
+        Run one command line and return everything it printed.
+
+        :param command_line: Command with its arguments.
+        :type command_line: str
+        :param options: Header options sent with the command (see forward_command).
+        :type options: dict, optional
+        :return: Output of the command, or the error message.
+        :rtype: str
+        """
+        handler = self.handler
+        try:
+            handler = self._handler_for(options)
+            command, contact, args = contact_factory(command_line)
+        except (ErrorBot, ValueError) as error_message:
+            output = io.StringIO()
+            type(handler.output)(output).error(error_message)
+            return output.getvalue()
+
+        loop = asyncio.get_running_loop()
+        if is_read_only(command):
+            return await loop.run_in_executor(
+                self._readers, self._run, handler, command, contact, args, self.lock.read
+            )
+
+        done = loop.create_future()
+        await self._writes.put(((handler, command, contact, args), done))
+        return await done
+
+    async def _write_queued(self) -> None:
+        """
+        The single writer task: run queued mutations and saves one at a time.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            job, done = await self._writes.get()
+            try:
+                if job is None:
+                    await loop.run_in_executor(self._writer, self._save)
+                    continue
+                output = await loop.run_in_executor(
+                    self._writer, self._run, *job, self.lock.write
+                )
+                if not done.cancelled():
+                    done.set_result(output)
+                if self.changes >= self.save_threshold:
+                    await loop.run_in_executor(self._writer, self._save)
+            except Exception as error:
+                logger.error("Daemon writer failed: %s", error)
+                if done is not None and not done.done():
+                    done.set_result(f"{error}\n\n")
+
+    async def _save_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.save_interval)
+            if self.changes:
+                await self._writes.put((None, None))
+
+    async def _serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            # "--name value" header lines (see forward_command), then the command line
+            options = {}
+            for _ in range(MAX_HEADERS + 1):
+                line = await reader.readline()
+                command_line = line[:MAX_REQUEST].decode("utf-8", errors="replace").strip()
+                if not command_line.startswith("--"):
+                    break
+                name, _, value = command_line[2:].partition(" ")
+                options[name] = value
+            output = await self.execute(command_line, options)
+            writer.write(output.encode("utf-8"))
+            await writer.drain()
+        except (ConnectionError, ValueError):
+            # Client went away, or sent a line longer than the stream limit
+            pass
+        finally:
+            writer.close()
+
+    def _claim_socket(self) -> None:
+        """
+        Remove a stale socket file, refusing to start if another daemon still listens on it.
+        """
+        if not daemon_is_running(self.socket_path):
+            self.socket_path.unlink(missing_ok=True)
+            return
+        logger.warning("A daemon is already listening on %s.", self.socket_path)
+        raise InvalidArgumentError(f'A daemon is already listening on "{self.socket_path}".')
+
+    async def serve(self) -> None:
+        """
+        Serve requests until SIGINT (Ctrl+C) or SIGTERM.
+        """
+        loop = asyncio.get_running_loop()
+        stopped = asyncio.Event()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signal_number, stopped.set)
+            except (ValueError, RuntimeError):
+                # Not the main thread (e.g. started from a benchmark)
+                pass
+
+        self._writes = asyncio.Queue()
+        tasks = [
+            asyncio.create_task(self._write_queued()),
+            asyncio.create_task(self._save_periodically()),
+        ]
+        server = await asyncio.start_unix_server(
+            self._serve_client, path=str(self.socket_path), backlog=128
+        )
+        logger.info("Daemon listening on %s.", self.socket_path)
+        print(f'Serving the address book on "{self.socket_path}". Press Ctrl+C to stop.')
+        try:
+            async with server:
+                await stopped.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def serve_forever(self) -> None:
+        """
+        Run the server until it is stopped.
+
+        The caller saves the book with write_in_file() afterwards, as after an
+        interactive session.
+        """
+        self._claim_socket()
+        self._output = _ThreadOutput(sys.stdout)
+        sys.stdout = self._output
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sys.stdout = self._output.stream
+            self._readers.shutdown()
+            self._writer.shutdown()
+            self.socket_path.unlink(missing_ok=True)
+            logger.info("Daemon stopped.")
@@ -0,0 +1,148 @@
+import csv
+import json
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+from app.contacts import AddressBook, Contact
+from app.logs import logger
+from utils.errors import InvalidArgumentError
+
+CSV_HEADER = ["first_name", "last_name", "phone", "email"]
+
+# Size of the write buffer and of the chunks of lines passed to writelines()
+BUFFER_SIZE = 1 << 20
+CHUNK_ROWS = 1000
+
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[list]:
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def csv_lines(contacts: Iterable[Contact]) -> Iterator[str]:
+    """
+    Yield CSV lines with a header; the columns match what the import command reads.
+    """
+
+    class _Line:
+        # csv.writer needs a file-like object; this one just hands the line back
+        def write(self, line: str) -> str:
+            return line
+
+    writer = csv.writer(_Line(), lineterminator="\n")
+    yield writer.writerow(CSV_HEADER)
+    for contact in contacts:
+        yield writer.writerow(
+            [
+                contact.first_name,
+                contact.last_name or "",
+                contact.phone or "",
+                contact.email or "",
+            ]
+        )
+
+
+def jsonl_lines(contacts: Iterable[Contact]) -> Iterator[str]:
+    """
+    Yield one JSON object per line.
+    """
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    for contact in contacts:
+        yield dumps(
+            {
+                "first_name": contact.first_name,
+                "last_name": contact.last_name,
+                "phone": contact.phone,
+                "email": contact.email,
+            }
+        ) + "\n"
+
+
+def vcard_lines(contacts: Iterable[Contact]) -> Iterator[str]:
+    """
+    Yield one vCard 3.0 block per contact.
+    """
+    for contact in contacts:
+        lines = [
+            "BEGIN:VCARD\n",
+            "VERSION:3.0\n",
+            f"N:{contact.last_name or ''};{contact.first_name};;;\n",
+            f"FN:{contact.fullname}\n",
+        ]
+        if contact.phone:
+            lines.append(f"TEL;TYPE=CELL:{contact.phone}\n")
+        if contact.email:
+            lines.append(f"EMAIL:{contact.email}\n")
+        lines.append("END:VCARD\n")
+        yield "".join(lines)
+
+
+EXPORTERS = {
+    "csv": csv_lines,
+    "jsonl": jsonl_lines,
+    "vcard": vcard_lines,
+}
+
+
+def export_contacts(
+    address_book: AddressBook,
+    export_format: str,
+    path: Path,
+    prefix: Optional[str] = None,
+) -> int:
+    """
+    Stream the contacts of the address book to a file, sorted by full name.
+
+    Contacts come from AddressBook.iter_sorted() one at a time and the lines are
+    written in chunks through a large buffer, so memory use stays flat for any
+    book size.
+
+    :param address_book: Address book to export.
+    :type address_book: AddressBook
+    :param export_format: One of EXPORTERS: "csv", "jsonl" or "vcard".
+    :type export_format: str
+    :param path: Destination file.
+    :type path: Path
+    :param prefix: Only export contacts whose full name starts with this prefix.
+    :type prefix: str, optional
+    :return: Number of exported contacts.
+    :rtype: int
+    :raises InvalidArgumentError: If the format is not supported or the file cannot be written.
+    """
+    lines = EXPORTERS.get(export_format)
+    if lines is None:
+        raise InvalidArgumentError(
+            f'Unsupported export format: "{export_format}". Supported: {", ".join(EXPORTERS)}.'
+        )
+
+    exported = 0
+
+    def counted(contacts: Iterable[Contact]) -> Iterator[Contact]:
+        nonlocal exported
+        for contact in contacts:
+            exported += 1
+            yield contact
+
+    path = Path(path)
+    file = None
+    try:
+        with path.open("w", encoding="utf-8", newline="", buffering=BUFFER_SIZE) as file:
+            for chunk in _chunks(lines(counted(address_book.iter_sorted(prefix))), CHUNK_ROWS):
+                file.writelines(chunk)
+    except OSError as error:
+        # A missing directory, no permission or a full disk; drop a partially written file
+        if file is not None and path.is_file():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        logger.warning('Cannot write "%s": %s', path, error)
+        raise InvalidArgumentError(f'Cannot write "{path}": {error.strerror or error}.') from error
+
+    logger.info("Exported %s contacts to %s (%s).", exported, path, export_format)
+    return exported
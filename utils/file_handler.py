@@ -1,16 +1,70 @@
+import os
 import pickle
+import struct
+import zlib
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, BinaryIO, Dict
 from app.contacts import AddressBook
 from app.logs import logger
 
+# How hard write_in_file() tries to get the file onto the disk:
+#   none       write in place, as before (fastest; a crash mid-write destroys the file)
+#   flush      write a temporary file and os.replace() it (survives a crash of the program)
+#   fsync      like flush, and fsync the file before the replace (survives a power loss)
+#   fsync+dir  like fsync, and fsync the directory after it, so the replace itself is durable
+DURABILITY_MODES = ("none", "flush", "fsync", "fsync+dir")
+
+# Footer appended after the pickle: magic, length of the pickle, CRC32 of the pickle.
+# pickle.load() stops at the end of the pickle, so older versions still read such files.
+CHECKSUM_FOOTER = struct.Struct("<4sQI")
+CHECKSUM_MAGIC = b"ABK1"
+
+
+def fsync_directory(directory: Path) -> None:
+    """
+    Flush a directory entry (e.g. a rename done by os.replace) to the disk.
+    """
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class _ChecksumWriter:
+    """
+    File wrapper that computes the CRC32 and the length of everything written through it.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+        self.crc = 0
+        self.length = 0
+
+    def write(self, data: bytes) -> int:
+        self.crc = zlib.crc32(data, self.crc)
+        self.length += len(data)
+        return self.file.write(data)
+
+
+class CorruptedFileError(Exception):
+    """
+    The contacts file is truncated or its checksum does not match.
+    """
+
 
 class FileHandler:
     """
     Handles reading, updating, and writing contact data to a file using pickle.
     """
 
-    def __init__(self, path: Path, data: Dict[str, Any] = None) -> None:
+    def __init__(
+        self,
+        path: Path,
+        data: Dict[str, Any] = None,
+        durability: str = "flush",
+        checksum: bool = True,
+    ) -> None:
         """
         Initialize a FileHandler object.
 
@@ -18,10 +72,26 @@ class FileHandler:
         :type path: Path
         :param data: Initial dictionary of contact data (optional).
         :type data: Dict[str, Any], optional
+        :param durability: One of DURABILITY_MODES.
+        :type durability: str
+        :param checksum: Append a CRC32 footer to the written file, so a damaged file is detected.
+        :type checksum: bool
+        :raises ValueError: If the durability mode is unknown.
         """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(
+                f'Unknown durability "{durability}". Available: {", ".join(DURABILITY_MODES)}.'
+            )
 
         self.path = path
         self.data = data
+        self.durability = durability
+        self.checksum = checksum
+        # AddressBook.mutations at the last save (None: nothing attached or saved yet)
+        self.saved_mutations = None
+        self._data_mutations = None
+        # False when update_contacts() found nothing new, so write_in_file() has nothing to do
+        self.dirty = True
 
     def read_file(self) -> Dict[str, Any]:
         """
@@ -30,6 +100,10 @@ class FileHandler:
         If the file exists and contains data, loads it using pickle.
         Otherwise, initializes an empty dictionary.
 
+        A file that cannot be read (truncated, or with a checksum footer that
+        does not match) is moved aside to "<name>.corrupt" before starting with
+        an empty dictionary, so the next save does not overwrite what is left of it.
+
         :return: Dictionary containing the contact data.
         :rtype: Dict[str, Any]
         """
@@ -37,11 +111,11 @@ class FileHandler:
         # If the file exists and contains some data inside.
         if self.path.exists() and self.path.stat().st_size > 0:
             try:
-                with self.path.open("rb") as file:
-                    self.data = pickle.load(file)
-                    logger.debug(f"Loaded file: {self.path}")
-            except (pickle.UnpicklingError, OSError) as e:
-                logger.warning(f"Error reading file {self.path}: {e}")
+                self.data = self.load_snapshot(self.path)
+                logger.debug("Loaded file: %s", self.path)
+            except (pickle.UnpicklingError, EOFError, CorruptedFileError, OSError) as e:
+                logger.warning("Error reading file %s: %s", self.path, e)
+                self._move_aside(self.path)
 
                 self.data = {}
                 logger.info("Created a new empty dictionary for storing contacts.")
@@ -51,20 +125,147 @@ class FileHandler:
             logger.info("Created a new empty dictionary for storing contacts.")
         return self.data
 
+    @staticmethod
+    def load_snapshot(path: Path) -> Dict[str, Any]:
+        """
+        Load a pickle file, verifying its checksum footer if it has one.
+
+        :param path: Path to the file.
+        :type path: Path
+        :return: The unpickled contacts.
+        :rtype: Dict[str, Any]
+        :raises CorruptedFileError: If the checksum does not match.
+        """
+        content = path.read_bytes()
+        payload = memoryview(content)
+
+        footer = content[-CHECKSUM_FOOTER.size :]
+        if len(footer) == CHECKSUM_FOOTER.size:
+            magic, length, crc = CHECKSUM_FOOTER.unpack(footer)
+            if magic == CHECKSUM_MAGIC and length == len(content) - CHECKSUM_FOOTER.size:
+                payload = payload[:length]
+                if zlib.crc32(payload) != crc:
+                    raise CorruptedFileError(f"checksum mismatch in {path}")
+
+        return pickle.loads(payload)
+
+    @staticmethod
+    def _move_aside(path: Path) -> None:
+        corrupt_path = path.with_name(path.name + ".corrupt")
+        try:
+            os.replace(path, corrupt_path)
+            logger.warning("Moved the unreadable file to %s.", corrupt_path)
+        except OSError as e:
+            logger.warning("Could not move %s aside: %s", path, e)
+
+    def write_snapshot(self, data: Any, protocol: int = None) -> None:
+        """
+        Pickle 'data' to the file with the configured durability and checksum.
+
+        Except in the "none" mode, the data goes to a temporary file that then
+        replaces the old one with os.replace(), so a crash at any point leaves
+        either the old or the new file, never a truncated one.
+
+        :param data: Contacts to write.
+        :type data: Any
+        :param protocol: Pickle protocol (the pickle default if None).
+        :type protocol: int, optional
+        """
+        if self.durability == "none":
+            target = self.path
+        else:
+            target = self.path.with_name(self.path.name + ".tmp")
+
+        with target.open("wb") as file:
+            if self.checksum:
+                writer = _ChecksumWriter(file)
+                pickle.dump(data, writer, protocol=protocol)
+                file.write(CHECKSUM_FOOTER.pack(CHECKSUM_MAGIC, writer.length, writer.crc))
+            else:
+                pickle.dump(data, file, protocol=protocol)
+
+            if self.durability != "none":
+                file.flush()
+            if self.durability in ("fsync", "fsync+dir"):
+                os.fsync(file.fileno())
+
+        if target != self.path:
+            os.replace(target, self.path)
+        if self.durability == "fsync+dir":
+            fsync_directory(self.path.parent)
+
+    def attach(self, address_book: AddressBook) -> None:
+        """
+        Connect the handler to the AddressBook built from the loaded data.
+
+        The pickle handler saves the whole book on exit, so it does not need
+        to follow single changes; it only remembers the book's mutation counter,
+        so a book that was not changed is not rewritten. Journaling handlers
+        extend this method to subscribe to the book's mutations.
+
+        :param address_book: AddressBook object populated from read_file().
+        :type address_book: AddressBook
+        """
+        self.saved_mutations = address_book.mutations
+
+    def changed(self, address_book: AddressBook) -> bool:
+        """
+        Check whether the book has changed since it was loaded or last saved.
+
+        :param address_book: AddressBook object to check.
+        :type address_book: AddressBook
+        :return: True if the book has unsaved changes (always True for a handler that was never attached).
+        :rtype: bool
+        """
+        return self.saved_mutations is None or address_book.mutations != self.saved_mutations
+
     def update_contacts(self, address_book: AddressBook) -> None:
         """
-        Update the internal data dictionary with new contacts from an AddressBook.
+        Update the internal data dictionary with the contacts from an AddressBook.
+
+        The AddressBook is the source of truth, so its contacts replace the
+        internal data instead of being merged into it (a merge would bring
+        deleted contacts back). The copy keeps the book's storage engine, so
+        a columnar book is saved in its compact form.
+
+        If the book has not changed since the last save, nothing is copied and
+        the following write_in_file() leaves the file as it is.
 
         :param address_book: AddressBook object containing contacts to update.
         :type address_book: AddressBook
         """
-        self.data.update(address_book.data)
-        logger.info(f"Updated local dictionary with new data (contacts).")
+        self.dirty = self.changed(address_book)
+        if not self.dirty:
+            logger.debug("No changes since the last save of %s.", self.path)
+            return
+
+        self.data = address_book.data.copy()
+        self._data_mutations = address_book.mutations
+        logger.info("Updated local dictionary with new data (contacts).")
+
+    def checkpoint(self, address_book: AddressBook) -> None:
+        """
+        Save the current contacts while the handler stays in use.
+
+        Called periodically by the daemon (main.py --serve), which keeps the
+        book in memory instead of saving it after every command. The pickle
+        handler rewrites the whole file if the book has changed.
+
+        :param address_book: AddressBook object containing contacts to save.
+        :type address_book: AddressBook
+        """
+        self.update_contacts(address_book)
+        self.write_in_file()
 
     def write_in_file(self) -> None:
         """
-        Write the internal data dictionary to the file using pickle.
+        Write the internal data dictionary to the file using pickle (see write_snapshot).
+
+        Does nothing if update_contacts() found no changes.
         """
-        with self.path.open("wb") as file:
-            pickle.dump(self.data, file)
-            logger.info(f"Wrote data to file: {self.path}")
+        if not self.dirty:
+            return
+
+        self.write_snapshot(self.data)
+        self.saved_mutations = self._data_mutations
+        logger.info("Wrote data to file: %s", self.path)
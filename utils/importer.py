@@ -0,0 +1,374 @@
+import csv
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+from app.contacts import AddressBook, Contact
+from app.logs import logger
+from utils.errors import ErrorBot, InvalidArgumentError
+from utils.reports import SummaryReport
+from utils.validate.validate_data import ValidateData
+
+# (line number, first name, last name, phone, email) as read from a file
+Row = Tuple[int, Optional[str], Optional[str], Optional[str], Optional[str]]
+
+CSV_COLUMNS = {
+    "first_name": 0,
+    "first": 0,
+    "given_name": 0,
+    "last_name": 1,
+    "last": 1,
+    "family_name": 1,
+    "phone": 2,
+    "tel": 2,
+    "email": 3,
+}
+
+PHONE_SEPARATORS = str.maketrans("", "", " -()")
+
+
+def _clean_phone(phone: Optional[str]) -> Optional[str]:
+    """
+    Remove the separators exports commonly put into phone numbers ("+1 (555) 123-4567").
+    """
+    return phone.translate(PHONE_SEPARATORS) if phone else phone
+
+
+def _first_undecodable_line(path: Path) -> Optional[int]:
+    """
+    Return the number of the first line of a file that is not valid UTF-8.
+
+    Only called after a decoding error: the text layer decodes whole blocks, so
+    the error itself does not tell the line.
+    """
+    with Path(path).open("rb") as file:
+        for line_number, line in enumerate(file, start=1):
+            try:
+                line.decode("utf-8")
+            except UnicodeDecodeError:
+                return line_number
+    return None
+
+
+def _read_error(
+    path: Path, error: Exception, line_number: Optional[int] = None
+) -> InvalidArgumentError:
+    """
+    Describe a file that cannot be read (any more): not UTF-8, malformed CSV or an I/O error.
+    """
+    if isinstance(error, UnicodeDecodeError):
+        line_number = _first_undecodable_line(path)
+        reason = f"not UTF-8 ({error.reason})"
+    else:
+        reason = str(error)
+    where = f" at line {line_number}" if line_number else ""
+    return InvalidArgumentError(f'Cannot read "{path}"{where}: {reason}.')
+
+
+def read_csv_rows(path: Path) -> Iterator[Row]:
+    """
+    Stream rows from a CSV file.
+
+    If the first line is a header with known column names (see CSV_COLUMNS),
+    the columns are mapped by name; otherwise the order is
+    first name, last name, phone, email.
+
+    :param path: Path to the CSV file.
+    :type path: Path
+    :raises InvalidArgumentError: If the file is not UTF-8, is not valid CSV or cannot be read.
+    """
+    reader = None
+    try:
+        with Path(path).open(newline="", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            positions = (0, 1, 2, 3)
+
+            for line_number, row in enumerate(reader, start=1):
+                if line_number == 1:
+                    header = [column.strip().lower() for column in row]
+                    if any(column in CSV_COLUMNS for column in header):
+                        mapped = {
+                            CSV_COLUMNS[column]: index
+                            for index, column in enumerate(header)
+                            if column in CSV_COLUMNS
+                        }
+                        positions = tuple(mapped.get(field) for field in range(4))
+                        continue
+
+                if not any(value.strip() for value in row):
+                    continue
+
+                first_name, last_name, phone, email = (
+                    row[position] if position is not None and position < len(row) else None
+                    for position in positions
+                )
+                yield line_number, first_name, last_name, _clean_phone(phone), email
+    except (OSError, UnicodeDecodeError, csv.Error) as error:
+        # csv counts the physical lines, also inside quoted values spanning several lines
+        raise _read_error(path, error, reader.line_num if reader else None) from error
+
+
+def _unfold_lines(path: Path) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (line number, line) pairs of a vCard file with folded lines joined.
+
+    A line starting with a space or a tab continues the previous line.
+
+    :raises InvalidArgumentError: If the file is not UTF-8 or cannot be read.
+    """
+    current = None
+    try:
+        with Path(path).open(encoding="utf-8") as file:
+            for line_number, line in enumerate(file, start=1):
+                line = line.rstrip("\r\n")
+                if line[:1] in (" ", "\t") and current is not None:
+                    current = (current[0], current[1] + line[1:])
+                    continue
+                if current is not None:
+                    yield current
+                current = (line_number, line)
+    except (OSError, UnicodeDecodeError) as error:
+        raise _read_error(path, error) from error
+    if current is not None:
+        yield current
+
+
+def read_vcard_rows(path: Path) -> Iterator[Row]:
+    """
+    Stream contacts from a vCard (.vcf) file.
+
+    The first and last names are taken from the N property (or split from FN),
+    and the first TEL and EMAIL properties are used.
+
+    :param path: Path to the vCard file.
+    :type path: Path
+    """
+    card = None
+    start_line = 0
+
+    for line_number, line in _unfold_lines(path):
+        name, _, value = line.partition(":")
+        prop = name.split(";")[0].upper()
+
+        if prop == "BEGIN" and value.upper() == "VCARD":
+            card = {}
+            start_line = line_number
+        elif card is None:
+            continue
+        elif prop == "END":
+            first_name, last_name = card.get("N", (None, None))
+            if first_name is None and "FN" in card:
+                first_name, _, last_name = card["FN"].partition(" ")
+            phone = _clean_phone(card.get("TEL"))
+            yield start_line, first_name, last_name, phone, card.get("EMAIL")
+            card = None
+        elif prop == "N":
+            parts = value.split(";")
+            card["N"] = (parts[1] if len(parts) > 1 else None, parts[0] or None)
+        elif prop in ("FN", "TEL", "EMAIL"):
+            card.setdefault(prop, value.strip())
+
+
+READERS = {
+    ".csv": read_csv_rows,
+    ".vcf": read_vcard_rows,
+    ".vcard": read_vcard_rows,
+}
+
+
+def batched(rows: Iterable[Row], size: int) -> Iterator[List[Row]]:
+    """
+    Split a stream of rows into lists of at most 'size' rows.
+    """
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def validate_rows(rows: List[Row]) -> Tuple[List[tuple], List[Tuple[int, str]]]:
+    """
+    Validate a batch of rows with the ValidateData rules.
+
+    This is a pure function of its input, and its results are plain tuples.
+
+    :param rows: Rows read from the file.
+    :type rows: List[Row]
+    :return: Valid (line, first, last, phone, email) tuples and rejected (line, reason) tuples.
+    :rtype: Tuple[List[tuple], List[Tuple[int, str]]]
+    """
+    valid = []
+    rejected = []
+    for line_number, *fields in rows:
+        try:
+            valid.append((line_number, *ValidateData.validate_fields(*fields)))
+        except ErrorBot as error:
+            rejected.append((line_number, error.message))
+    return valid, rejected
+
+
+def validate_batches(
+    batches: Iterable[List[Row]], workers: int = 1
+) -> Iterator[Tuple[List[tuple], List[Tuple[int, str]]]]:
+    """
+    Validate batches of rows with validate_rows(), in worker processes if 'workers' > 1.
+
+    Rows and results cross the process boundary as plain tuples of strings.
+    At most two batches per worker are in flight, so memory use does not
+    depend on the number of batches; results come back in input order.
+
+    :param batches: Lists of rows (see batched()).
+    :type batches: Iterable[List[Row]]
+    :param workers: Number of worker processes; 1 validates in this process.
+    :type workers: int
+    :return: (valid, rejected) of every batch, as returned by validate_rows().
+    :rtype: Iterator[Tuple[List[tuple], List[Tuple[int, str]]]]
+    """
+    if workers <= 1:
+        yield from map(validate_rows, batches)
+        return
+
+    # "spawn" does not copy the threads of this process (e.g. the log writer) into a fork
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(validate_rows, batch))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class ImportReport(SummaryReport):
+    """
+    Summary of an import: inserted, duplicate and rejected rows.
+    """
+
+    COUNTS = ("inserted", "duplicates", "rejected")
+    EXAMPLES_TITLE = "first rejected rows"
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        super().__init__()
+
+    def title(self) -> str:
+        return f"Imported from {self.path}"
+
+    def add_rejected(self, rejected: List[Tuple[int, str]]) -> None:
+        self.rejected += len(rejected)
+        for line_number, reason in rejected:
+            self.add_failure(reason.split(":")[0], f"line {line_number}: {reason}")
+
+
+def import_contacts(
+    path: Path, address_book: AddressBook, batch_size: int = 1000, workers: int = 1
+) -> ImportReport:
+    """
+    Stream a CSV or vCard file into the address book.
+
+    Rows are read lazily, validated and inserted one batch at a time, so memory
+    use does not depend on the size of the file. With 'workers' > 1 the batches
+    are validated by a process pool (see validate_batches) while this process
+    reads the file and inserts the contacts.
+
+    :param path: Path to a .csv, .vcf or .vcard file.
+    :type path: Path
+    :param address_book: Address book to insert the contacts into.
+    :type address_book: AddressBook
+    :param batch_size: Number of rows validated and inserted together.
+    :type batch_size: int
+    :param workers: Number of worker processes validating the rows.
+    :type workers: int
+    :return: Summary of the import.
+    :rtype: ImportReport
+    :raises InvalidArgumentError: If the file does not exist, its format is not supported or
+        it cannot be read to the end (the contacts imported before the error are kept).
+    """
+    path = Path(path)
+    reader = READERS.get(path.suffix.lower())
+
+    if reader is None:
+        raise InvalidArgumentError(
+            f'Unsupported file format: "{path.suffix}". Supported: {", ".join(READERS)}.'
+        )
+    if not path.is_file():
+        raise InvalidArgumentError(f'File does not exist: "{path}".')
+
+    report = ImportReport(path)
+    try:
+        for valid, rejected in validate_batches(batched(reader(path), batch_size), workers):
+            inserted, duplicates = address_book.add_contacts(
+                Contact(*fields) for _, *fields in valid
+            )
+            report.inserted += inserted
+            report.duplicates += len(duplicates)
+            report.add_rejected(rejected)
+    except InvalidArgumentError as error:
+        # Raised by the reader; the contacts of the batches before stay in the book
+        message = (
+            f"{error.message} Import stopped: {report.inserted} contacts were imported "
+            "before the error."
+        )
+        logger.warning("%s", message)
+        raise InvalidArgumentError(message) from error
+
+    logger.info(
+        "Imported %s: %s inserted, %s duplicates, %s rejected.",
+        path,
+        report.inserted,
+        report.duplicates,
+        report.rejected,
+    )
+    return report
+
+
+class RevalidateReport(SummaryReport):
+    """
+    Summary of a revalidation: checked and invalid contacts.
+    """
+
+    COUNTS = ("checked", "invalid")
+    EXAMPLES_TITLE = "first invalid contacts"
+
+    def title(self) -> str:
+        return "Revalidated the address book"
+
+    def add_invalid(self, rejected: List[Tuple[str, str]]) -> None:
+        self.invalid += len(rejected)
+        for fullname, reason in rejected:
+            self.add_failure(reason.split(":")[0], f"{fullname}: {reason}")
+
+
+def revalidate_contacts(
+    address_book: AddressBook, batch_size: int = 10000, workers: int = 1
+) -> RevalidateReport:
+    """
+    Check every contact of the book against the current ValidateData rules.
+
+    Useful after the rules change or for books loaded from old files. The
+    contacts are validated in batches like an import (see validate_batches);
+    the book itself is not changed.
+
+    :param address_book: Address book to check.
+    :type address_book: AddressBook
+    :param batch_size: Number of contacts validated together.
+    :type batch_size: int
+    :param workers: Number of worker processes validating the contacts.
+    :type workers: int
+    :return: Summary with the invalid contacts.
+    :rtype: RevalidateReport
+    """
+    # The full name takes the place of the line number, so rejected rows name their contact
+    rows = (
+        (contact.fullname, contact.first_name, contact.last_name, contact.phone, contact.email)
+        for contact in address_book.iter_sorted()
+    )
+
+    report = RevalidateReport()
+    for valid, rejected in validate_batches(batched(rows, batch_size), workers):
+        report.checked += len(valid) + len(rejected)
+        report.add_invalid(rejected)
+
+    logger.info("Revalidated %s contacts: %s invalid.", report.checked, report.invalid)
+    return report
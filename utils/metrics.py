@@ -0,0 +1,303 @@
+import functools
+import math
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from app.logs import logger
+
+
+class Histogram:
+    """
+    Durations counted in logarithmic buckets, so percentiles need no list of samples.
+
+    Every doubling of the duration is split into BUCKETS_PER_OCTAVE buckets, so
+    a percentile is exact to about 9% whatever the number of samples.
+    """
+
+    BUCKETS_PER_OCTAVE = 8
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = Counter()
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        microseconds = seconds * 1e6
+        # Bucket i holds durations up to 2 ** (i / BUCKETS_PER_OCTAVE) microseconds
+        bucket = 0
+        if microseconds > 1:
+            bucket = math.ceil(math.log2(microseconds) * self.BUCKETS_PER_OCTAVE)
+        self.buckets[bucket] += 1
+
+    def percentile(self, percent: float) -> float:
+        """
+        Return the duration in seconds below which 'percent' of the samples are.
+        """
+        rank = percent / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(2 ** (bucket / self.BUCKETS_PER_OCTAVE) / 1e6, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Return the count and the total, mean, p50, p95, p99 and maximum in milliseconds.
+        """
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1e3, 3),
+            "mean_ms": round(self.total / self.count * 1e3, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1e3, 3),
+            "p95_ms": round(self.percentile(95) * 1e3, 3),
+            "p99_ms": round(self.percentile(99) * 1e3, 3),
+            "max_ms": round(self.max * 1e3, 3),
+        }
+
+
+class _Timer:
+    """
+    Context manager that adds the time of its with-block to a histogram of Metrics.
+    """
+
+    __slots__ = ("metrics", "kind", "name", "started")
+
+    def __init__(self, metrics: "Metrics", kind: str, name: str) -> None:
+        self.metrics = metrics
+        self.kind = kind
+        self.name = name
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.metrics.record(self.kind, self.name, time.perf_counter() - self.started, exc_type)
+
+
+class _NullTimer:
+    """
+    Context manager that does nothing; handed out while the metrics are disabled.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+# Marks an instrumented attribute that the owner inherits instead of defining it
+_MISSING = object()
+
+
+class MetricsReport:
+    """
+    Snapshot of the collected metrics, as shown by the "stats" command and dumped to JSON.
+    """
+
+    def __init__(self, commands: dict, phases: dict, counters: dict) -> None:
+        self.commands = commands
+        self.phases = phases
+        self.counters = counters
+
+    def __str__(self) -> str:
+        lines = ["Statistics (ms):"]
+        for title, histograms in (("command", self.commands), ("phase", self.phases)):
+            if not histograms:
+                continue
+            lines.append(
+                f"    {title:<16} {'count':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+            )
+            for name, summary in histograms.items():
+                values = (summary[key] for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms"))
+                lines.append(
+                    f"    {name:<16} {summary['count']:>7} "
+                    + " ".join(f"{value:>9.3f}" for value in values)
+                )
+        if self.counters:
+            lines.append("    counters:")
+            lines.extend(f"        {name} : {count}" for name, count in self.counters.items())
+        return "\n".join(lines) + "\n"
+
+
+class Metrics:
+    """
+    Timers and counters of the hot paths: per command and per phase of a command.
+
+    Phases are "parse" (CLIHandler), "validate" (ValidateData), "lookup"
+    (finding contacts), "render" (writing lists of contacts), "log" (logger
+    records) and "load"/"save" (FileHandler I/O). Commands are timed by
+    CommandHandler.handle_command, after parsing and validation.
+
+    The phases that run several times per command line are registered with
+    instrument() and only wrapped while the metrics are enabled, so they cost
+    nothing while disabled. The other ones use command() and phase(), which
+    return one shared no-op context manager while disabled. Durations come
+    from time.perf_counter(), a monotonic clock.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.slow_threshold = None
+        self.commands: Dict[str, Histogram] = {}
+        self.phases: Dict[str, Histogram] = {}
+        self.counters = Counter()
+        # The daemon runs commands in several threads
+        self._lock = threading.Lock()
+        # Registered (owner, attribute, phase) and the replaced attributes while enabled
+        self._instrumented: List[Tuple[Any, str, str]] = [(logger, "handle", "log")]
+        self._originals: List[Tuple[Any, str, Any]] = []
+
+    def enable(self, slow_ms: Optional[float] = None) -> None:
+        """
+        Start collecting metrics.
+
+        :param slow_ms: Log a warning for every command that takes longer (None: never).
+        :type slow_ms: float, optional
+        """
+        self.slow_threshold = slow_ms / 1e3 if slow_ms is not None else None
+        if not self.enabled:
+            self.enabled = True
+            for owner, attribute, phase in self._instrumented:
+                self._wrap(owner, attribute, phase)
+
+    def disable(self) -> None:
+        """
+        Stop collecting metrics; the collected ones are kept.
+        """
+        self.enabled = False
+        while self._originals:
+            owner, attribute, original = self._originals.pop()
+            if original is _MISSING:
+                delattr(owner, attribute)
+            else:
+                setattr(owner, attribute, original)
+
+    def instrument(self, owner: Any, attribute: str, phase: str) -> None:
+        """
+        Time every call of a method as the phase 'phase' while the metrics are enabled.
+
+        The method is replaced by a timed wrapper in enable() and restored in
+        disable(), so a hot path registered here costs nothing while disabled.
+        Records of the logger are timed this way as the phase "log"; only
+        records at or above the log level reach Logger.handle().
+
+        :param owner: Class (or object) that has the method, e.g. CLIHandler.
+        :param attribute: Name of the method, e.g. "parse_input".
+        :type attribute: str
+        :param phase: Name of the phase, e.g. "parse".
+        :type phase: str
+        """
+        self._instrumented.append((owner, attribute, phase))
+        if self.enabled:
+            self._wrap(owner, attribute, phase)
+
+    def _wrap(self, owner: Any, attribute: str, phase: str) -> None:
+        self._originals.append((owner, attribute, vars(owner).get(attribute, _MISSING)))
+        method = getattr(owner, attribute)
+        timer = self.phase
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            with timer(phase):
+                return method(*args, **kwargs)
+
+        setattr(owner, attribute, timed)
+
+    def reset(self) -> None:
+        """
+        Forget all collected metrics.
+        """
+        with self._lock:
+            self.commands.clear()
+            self.phases.clear()
+            self.counters.clear()
+
+    def command(self, name: str):
+        """
+        Return a context manager that times its with-block as a run of the command 'name'.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, "command", name)
+
+    def phase(self, name: str):
+        """
+        Return a context manager that times its with-block as the phase 'name', e.g. "parse".
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, "phase", name)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        Add to a counter, e.g. the number of rendered contacts.
+        """
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += amount
+
+    def record(self, kind: str, name: str, seconds: float, error: Optional[type] = None) -> None:
+        """
+        Add a duration to the histogram of a command or a phase.
+
+        A failure is also counted per command or phase and error type, and a
+        command slower than the slow threshold is logged as a warning.
+        """
+        histograms = self.commands if kind == "command" else self.phases
+        with self._lock:
+            histogram = histograms.get(name)
+            if histogram is None:
+                histogram = histograms[name] = Histogram()
+            histogram.add(seconds)
+            if error is not None:
+                self.counters[f"{name} errors: {error.__name__}"] += 1
+
+        slow = self.slow_threshold
+        if kind == "command" and slow is not None and seconds >= slow:
+            logger.warning(
+                "Slow command: %s took %.1f ms (threshold %.1f ms).",
+                name,
+                seconds * 1e3,
+                slow * 1e3,
+            )
+
+    def report(self) -> MetricsReport:
+        """
+        Return a snapshot of the metrics with the percentiles of every histogram.
+        """
+        with self._lock:
+            return MetricsReport(
+                {name: histogram.summary() for name, histogram in sorted(self.commands.items())},
+                {name: histogram.summary() for name, histogram in sorted(self.phases.items())},
+                dict(sorted(self.counters.items())),
+            )
+
+    def dump(self, path: Path) -> None:
+        """
+        Write the report as JSON to 'path'.
+
+        :param path: Destination file.
+        :type path: Path
+        """
+        # Imported on use: json is only needed when the metrics are dumped
+        import json
+
+        Path(path).write_text(json.dumps(vars(self.report()), indent=2) + "\n", encoding="utf-8")
+        logger.info("Metrics written to %s", path)
+
+
+# The metrics of the process; disabled until enable() is called
+METRICS = Metrics()
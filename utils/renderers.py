@@ -0,0 +1,264 @@
+import sys
+from itertools import islice
+from typing import Any, Iterable, Optional, TextIO
+from app.contacts import Contact
+from app.logs import logger
+from utils.errors import InvalidArgumentError
+from utils.metrics import METRICS
+
+# Columns of a contact in the json and tsv output (the same as in the CSV export)
+CONTACT_FIELDS = ("first_name", "last_name", "phone", "email")
+
+# Number of contacts rendered into one write() call
+CHUNK_ROWS = 1000
+
+
+class Renderer:
+    """
+    Writes the results of the commands in one output format.
+
+    CommandHandler hands every result to its renderer as data instead of
+    printing it: a message with optional fields, one contact, a list of
+    contacts, a report or an error. Every call ends in a single write() to the
+    stream, and a list of contacts is written in chunks of 'chunk_rows'
+    contacts, so large results like "all" are not written line by line.
+
+    The renderer keeps no state between calls, so one renderer can be shared
+    by the threads of the daemon. Without a stream it writes to the current
+    sys.stdout, which the daemon replaces to capture the output of every command.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, chunk_rows: int = CHUNK_ROWS) -> None:
+        """
+        Initialize a renderer.
+
+        :param stream: Stream to write to (default: the current sys.stdout).
+        :type stream: TextIO, optional
+        :param chunk_rows: Number of contacts rendered into one write() call.
+        :type chunk_rows: int
+        """
+        self._stream = stream
+        self.chunk_rows = chunk_rows
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream if self._stream is not None else sys.stdout
+
+    def message(self, text: str, **fields: Any) -> None:
+        """
+        Write a message; 'fields' hold its values for machine-readable formats.
+
+        :param text: Message as shown in the text output.
+        :type text: str
+        """
+        raise NotImplementedError
+
+    def contact(self, title: str, contact: Contact) -> None:
+        """
+        Write one contact with a title such as "Contact added:".
+        """
+        raise NotImplementedError
+
+    def contacts(self, contacts: Iterable[Contact], title: Optional[str] = None) -> int:
+        """
+        Write a list of contacts in chunks and flush the stream.
+
+        :param contacts: Contacts to write, consumed lazily.
+        :type contacts: Iterable[Contact]
+        :param title: Heading of the list in the text output.
+        :type title: str, optional
+        :return: Number of written contacts.
+        :rtype: int
+        """
+        stream = self.stream
+        written = 0
+        # Includes taking the contacts from 'contacts', e.g. the sorted order of "all"
+        with METRICS.phase("render"):
+            self._write_title(stream, title)
+            contacts = iter(contacts)
+            while True:
+                chunk = list(islice(contacts, self.chunk_rows))
+                if not chunk:
+                    break
+                stream.write(self._format_chunk(chunk))
+                written += len(chunk)
+            stream.flush()
+        METRICS.count("rendered contacts", written)
+        return written
+
+    def report(self, report: Any) -> None:
+        """
+        Write the summary of an import, a revalidation or a batch run.
+        """
+        raise NotImplementedError
+
+    def error(self, error: Exception) -> None:
+        """
+        Write the message of a failed command.
+        """
+        raise NotImplementedError
+
+    def _write_title(self, stream: TextIO, title: Optional[str]) -> None:
+        pass
+
+    def _format_chunk(self, chunk: list) -> str:
+        raise NotImplementedError
+
+
+class TextRenderer(Renderer):
+    """
+    Human-readable output, as printed by the interactive program.
+    """
+
+    def message(self, text: str, **fields: Any) -> None:
+        self.stream.write(text + "\n")
+
+    def contact(self, title: str, contact: Contact) -> None:
+        self.stream.write(f"{title}\n{contact}\n")
+
+    def report(self, report: Any) -> None:
+        self.stream.write(f"{report}\n")
+
+    def error(self, error: Exception) -> None:
+        self.stream.write(f"{error}\n\n")
+
+    def _write_title(self, stream: TextIO, title: Optional[str]) -> None:
+        if title is not None:
+            stream.write(title + "\n")
+
+    def _format_chunk(self, chunk: list) -> str:
+        return "\n".join(map(str, chunk)) + "\n"
+
+
+class JsonRenderer(Renderer):
+    """
+    JSON Lines: every message, contact, report and error is one JSON object per line.
+
+    Contacts are objects with the CONTACT_FIELDS keys (null for missing
+    values), messages have a "message" key and errors an "error" key.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, chunk_rows: int = CHUNK_ROWS) -> None:
+        # Imported on use: json is not needed by the text output
+        import json
+
+        super().__init__(stream, chunk_rows)
+        self._encode = json.JSONEncoder(ensure_ascii=False, default=str).encode
+        # Quotes and escapes one string (in C); contact lines are built from it
+        # directly, which is several times faster than encoding a dict per contact
+        self._quote = json.encoder.encode_basestring
+
+    @staticmethod
+    def _record(contact: Contact) -> dict:
+        return {
+            "first_name": contact.first_name,
+            "last_name": contact.last_name,
+            "phone": contact.phone,
+            "email": contact.email,
+        }
+
+    def message(self, text: str, **fields: Any) -> None:
+        self.stream.write(self._encode({"message": text.strip(), **fields}) + "\n")
+
+    def contact(self, title: str, contact: Contact) -> None:
+        self.stream.write(self._encode({"message": title, **self._record(contact)}) + "\n")
+
+    def report(self, report: Any) -> None:
+        self.stream.write(self._encode(vars(report)) + "\n")
+
+    def error(self, error: Exception) -> None:
+        self.stream.write(
+            self._encode({"error": str(error), "type": type(error).__name__}) + "\n"
+        )
+
+    def _format_chunk(self, chunk: list) -> str:
+        quote = self._quote
+
+        def value(text: Optional[str]) -> str:
+            return "null" if text is None else quote(text)
+
+        return "".join(
+            f'{{"first_name": {value(contact.first_name)}, "last_name": {value(contact.last_name)}, '
+            f'"phone": {value(contact.phone)}, "email": {value(contact.email)}}}\n'
+            for contact in chunk
+        )
+
+
+class TsvRenderer(Renderer):
+    """
+    Tab-separated values without quoting (names, phones and emails never contain tabs).
+
+    A list of contacts starts with a header row of CONTACT_FIELDS; missing
+    values are empty. A message with fields is one row of their values, a
+    report is one "name<TAB>value" row per value and an error starts with "error".
+    """
+
+    HEADER = "\t".join(CONTACT_FIELDS) + "\n"
+
+    @staticmethod
+    def _row(contact: Contact) -> str:
+        return (
+            f"{contact.first_name or ''}\t{contact.last_name or ''}\t"
+            f"{contact.phone or ''}\t{contact.email or ''}"
+        )
+
+    def message(self, text: str, **fields: Any) -> None:
+        if fields:
+            self.stream.write("\t".join(map(str, fields.values())) + "\n")
+        else:
+            self.stream.write(text.strip() + "\n")
+
+    def contact(self, title: str, contact: Contact) -> None:
+        self.stream.write(self._row(contact) + "\n")
+
+    def report(self, report: Any) -> None:
+        rows = []
+        for name, value in vars(report).items():
+            if isinstance(value, dict):
+                for key, item in value.items():
+                    # e.g. the p50/p95/p99 summary of a command in the "stats" report
+                    if isinstance(item, dict):
+                        item = "\t".join(f"{field}={number}" for field, number in item.items())
+                    rows.append(f"{name}\t{key}\t{item}")
+            elif isinstance(value, list):
+                rows.extend(f"{name}\t{item}" for item in value)
+            else:
+                rows.append(f"{name}\t{value}")
+        self.stream.write("\n".join(rows) + "\n")
+
+    def error(self, error: Exception) -> None:
+        self.stream.write(f"error\t{error}\n")
+
+    def _write_title(self, stream: TextIO, title: Optional[str]) -> None:
+        stream.write(self.HEADER)
+
+    def _format_chunk(self, chunk: list) -> str:
+        return "\n".join(map(self._row, chunk)) + "\n"
+
+
+# Output formats by name, selected with "--output"
+RENDERERS = {
+    "text": TextRenderer,
+    "json": JsonRenderer,
+    "tsv": TsvRenderer,
+}
+
+
+def create_renderer(output: str, stream: Optional[TextIO] = None) -> Renderer:
+    """
+    Create the renderer of an output format.
+
+    :param output: Name of the format (a key of RENDERERS).
+    :type output: str
+    :param stream: Stream to write to (default: the current sys.stdout).
+    :type stream: TextIO, optional
+    :return: The renderer.
+    :rtype: Renderer
+    :raises InvalidArgumentError: If the format is unknown.
+    """
+    if output not in RENDERERS:
+        logger.warning("Unsupported output format: %s.", output)
+        raise InvalidArgumentError(
+            f'Unsupported output format: "{output}". Supported: {", ".join(RENDERERS)}.'
+        )
+    return RENDERERS[output](stream)
@@ -0,0 +1,50 @@
+from collections import Counter
+from typing import Tuple
+
+
+class SummaryReport:
+    """
+    Summary of a bulk operation (batch, import, revalidation): counts and failure reasons.
+
+    Only counts per reason and the first MAX_EXAMPLES failures are kept, so a
+    report stays small for any input size. A subclass lists its counts in
+    COUNTS, names the list of examples in EXAMPLES_TITLE and returns its
+    heading from title().
+    """
+
+    MAX_EXAMPLES = 10
+    COUNTS: Tuple[str, ...] = ()
+    EXAMPLES_TITLE = "first failures"
+
+    def __init__(self) -> None:
+        for name in self.COUNTS:
+            setattr(self, name, 0)
+        self.reasons = Counter()
+        self.examples = []
+
+    def title(self) -> str:
+        raise NotImplementedError
+
+    def add_failure(self, reason: str, example: str) -> None:
+        """
+        Count a failure under 'reason' and keep 'example' while there are fewer than MAX_EXAMPLES.
+
+        :param reason: Short reason the failures are grouped by, e.g. an error type.
+        :type reason: str
+        :param example: Description of this failure, e.g. "line 3: Invalid phone".
+        :type example: str
+        """
+        self.reasons[reason] += 1
+        if len(self.examples) < self.MAX_EXAMPLES:
+            self.examples.append(example)
+
+    def __str__(self) -> str:
+        width = max(map(len, self.COUNTS), default=0)
+        lines = [f"{self.title()}:"]
+        lines.extend(f"    {name:<{width}} : {getattr(self, name)}" for name in self.COUNTS)
+        for reason, count in self.reasons.most_common():
+            lines.append(f"        {count} x {reason}")
+        if self.examples:
+            lines.append(f"    {self.EXAMPLES_TITLE}:")
+            lines.extend(f"        {example}" for example in self.examples)
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,90 @@
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Type
+from utils.file_handler import FileHandler
+
+# Storage backends by name: (module, class). A backend is a FileHandler subclass
+# implementing read_file(), attach(), update_contacts(), checkpoint() and
+# write_in_file(); read_file() may return any mapping of full names to contacts
+# that AddressBook accepts. Modules are imported when their backend is selected,
+# so a start-up does not pay e.g. for multiprocessing of the sharded backend.
+STORAGE_BACKENDS = {
+    "pickle": ("utils.file_handler", "FileHandler"),
+    "journal": ("utils.storage.journal", "JournalFileHandler"),
+    "mmap": ("utils.storage.mmap_file", "MmapFileHandler"),
+    "sharded": ("utils.storage.sharded", "ShardedFileHandler"),
+    "sqlite": ("utils.storage.sqlite_file", "SqliteFileHandler"),
+}
+
+# Names exported by this package -> module defining them, imported on first access
+_LAZY_EXPORTS = {
+    "JournalFileHandler": "utils.storage.journal",
+    "MmapFileHandler": "utils.storage.mmap_file",
+    "migrate_pickle_to_mmap": "utils.storage.mmap_file",
+    "ShardedFileHandler": "utils.storage.sharded",
+    "SqliteFileHandler": "utils.storage.sqlite_file",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        return getattr(import_module(_LAZY_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_backend(storage: str) -> Type[FileHandler]:
+    """
+    Import and return the FileHandler class of a storage mode.
+
+    :param storage: Name of the storage mode (a key of STORAGE_BACKENDS).
+    :type storage: str
+    :rtype: Type[FileHandler]
+    :raises ValueError: If the storage mode is unknown.
+    """
+    if storage not in STORAGE_BACKENDS:
+        raise ValueError(
+            f'Unknown storage "{storage}". Available: {", ".join(STORAGE_BACKENDS)}.'
+        )
+    module, name = STORAGE_BACKENDS[storage]
+    return getattr(import_module(module), name)
+
+
+def create_file_handler(
+    storage: str,
+    path: Path,
+    durability: str = "flush",
+    checksum: bool = True,
+    **backend_options: Any,
+) -> FileHandler:
+    """
+    Create the file handler for the selected storage mode.
+
+    :param storage: Name of the storage mode (a key of STORAGE_BACKENDS).
+    :type storage: str
+    :param path: Path to the contacts file.
+    :type path: Path
+    :param durability: One of DURABILITY_MODES (see utils.file_handler).
+    :type durability: str
+    :param checksum: Append a CRC32 footer to pickle snapshots.
+    :type checksum: bool
+    :param backend_options: Keyword arguments only the selected backend takes,
+        e.g. shards and workers of ShardedFileHandler.
+    :return: File handler with the read_file/update_contacts/write_in_file contract.
+    :rtype: FileHandler
+    :raises ValueError: If the storage mode, the durability or a backend option is invalid.
+    """
+    return get_backend(storage)(
+        path, durability=durability, checksum=checksum, **backend_options
+    )
+
+
+__all__ = [
+    "STORAGE_BACKENDS",
+    "create_file_handler",
+    "get_backend",
+    "JournalFileHandler",
+    "MmapFileHandler",
+    "ShardedFileHandler",
+    "SqliteFileHandler",
+    "migrate_pickle_to_mmap",
+]
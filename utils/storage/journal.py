@@ -0,0 +1,216 @@
+import os
+import pickle
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional
+from app.contacts import AddressBook, Contact
+from app.logs import logger
+from utils.file_handler import FileHandler
+
+
+class JournalFileHandler(FileHandler):
+    """
+    Stores contacts as a pickle snapshot plus an append-only journal of changes.
+
+    Every add/update/delete made through the AddressBook is appended to the
+    journal file as one small pickled record, so the cost of a change does not
+    depend on the size of the book. When the journal grows past a threshold
+    it is compacted: the full book is written to a new snapshot and the
+    journal is truncated.
+
+    On startup the snapshot is loaded and the journal is replayed on top of it.
+    """
+
+    JOURNAL_SUFFIX = ".journal"
+
+    def __init__(
+        self,
+        path: Path,
+        data: Dict[str, Any] = None,
+        min_compact_records: int = 1000,
+        compact_ratio: float = 0.5,
+        durability: str = "flush",
+        checksum: bool = True,
+    ) -> None:
+        """
+        Initialize a JournalFileHandler object.
+
+        :param path: Path to the snapshot file (the journal is stored next to it).
+        :type path: Path
+        :param data: Initial dictionary of contact data (optional).
+        :type data: Dict[str, Any], optional
+        :param min_compact_records: Journal never gets compacted below this number of records.
+        :type min_compact_records: int
+        :param compact_ratio: Compact once the journal holds more records than this share of the book.
+        :type compact_ratio: float
+        :param durability: One of DURABILITY_MODES; "fsync" and "fsync+dir" also fsync every journal record.
+        :type durability: str
+        :param checksum: Append a CRC32 footer to the snapshot.
+        :type checksum: bool
+        """
+        super().__init__(path, data, durability=durability, checksum=checksum)
+        self.journal_path = Path(path).with_suffix(self.JOURNAL_SUFFIX)
+        self.min_compact_records = min_compact_records
+        self.compact_ratio = compact_ratio
+        self.records = 0
+        self.address_book: Optional[AddressBook] = None
+        self._journal: Optional[BinaryIO] = None
+
+    def read_file(self) -> Dict[str, Any]:
+        """
+        Load the snapshot and replay the journal on top of it.
+
+        A truncated last record (for example after a crash in the middle of
+        a write) is dropped and cut off the journal.
+
+        :return: Dictionary containing the contact data.
+        :rtype: Dict[str, Any]
+        """
+        super().read_file()
+
+        if not self.journal_path.exists():
+            return self.data
+
+        valid_size = 0
+        with self.journal_path.open("rb") as journal:
+            while True:
+                try:
+                    record = pickle.load(journal)
+                except EOFError:
+                    break
+                except (pickle.UnpicklingError, ValueError, TypeError) as e:
+                    logger.warning("Dropped a broken journal record: %s", e)
+                    break
+                self._replay(record)
+                self.records += 1
+                valid_size = journal.tell()
+
+        if valid_size < self.journal_path.stat().st_size:
+            os.truncate(self.journal_path, valid_size)
+
+        logger.debug(
+            "Replayed %s journal records from %s",
+            self.records,
+            self.journal_path,
+        )
+        return self.data
+
+    def _replay(self, record: tuple) -> None:
+        """
+        Apply one journal record to the loaded data.
+
+        :param record: Tuple (operation, first_name, last_name, phone, email).
+        :type record: tuple
+        """
+        operation, first_name, last_name, phone, email = record
+        contact = Contact(first_name, last_name, phone, email)
+
+        if operation == "delete":
+            self.data.pop(contact.fullname, None)
+        else:
+            self.data[contact.fullname] = contact
+
+    def attach(self, address_book: AddressBook) -> None:
+        """
+        Subscribe to the AddressBook so each change is appended to the journal.
+
+        :param address_book: AddressBook object populated from read_file().
+        :type address_book: AddressBook
+        """
+        super().attach(address_book)
+        self.address_book = address_book
+        address_book.subscribe(self.append)
+
+    def append(self, operation: str, contact: Contact) -> None:
+        """
+        Append one change to the journal and compact it when it gets too long.
+
+        :param operation: "add", "update" or "delete".
+        :type operation: str
+        :param contact: The affected contact.
+        :type contact: Contact
+        """
+        if self._journal is None:
+            self._journal = self.journal_path.open("ab")
+
+        record = (
+            operation,
+            contact.first_name,
+            contact.last_name,
+            contact.phone,
+            contact.email,
+        )
+        pickle.dump(record, self._journal, protocol=pickle.HIGHEST_PROTOCOL)
+        self._journal.flush()
+        if self.durability in ("fsync", "fsync+dir"):
+            os.fsync(self._journal.fileno())
+        self.records += 1
+
+        if self.needs_compaction():
+            self.compact()
+
+    def needs_compaction(self) -> bool:
+        """
+        Check whether the journal has grown past the compaction threshold.
+
+        :return: True if the journal should be compacted into a new snapshot.
+        :rtype: bool
+        """
+        size = len(self.address_book) if self.address_book is not None else len(self.data)
+        return self.records >= max(self.min_compact_records, size * self.compact_ratio)
+
+    def compact(self) -> None:
+        """
+        Write the current contacts to a new snapshot and truncate the journal.
+
+        The snapshot is written with write_snapshot(). Unless durability is
+        "none", it goes to a temporary file that is moved into place, so a crash
+        during compaction leaves the old snapshot and journal intact.
+        """
+        if self.address_book is not None:
+            self.data = self.address_book.data.copy()
+
+        self.write_snapshot(self.data, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self.close()
+        self.journal_path.open("wb").close()
+        self.records = 0
+        logger.info("Compacted journal into snapshot: %s", self.path)
+
+    def update_contacts(self, address_book: AddressBook) -> None:
+        """
+        Keep a reference to the final contacts; the changes are already in the journal.
+
+        :param address_book: AddressBook object containing contacts to update.
+        :type address_book: AddressBook
+        """
+        self.data = address_book.data
+
+    def checkpoint(self, address_book: AddressBook) -> None:
+        """
+        Compact the journal if it is over the threshold; every change is already in the journal.
+
+        :param address_book: AddressBook object containing contacts to save.
+        :type address_book: AddressBook
+        """
+        self.data = address_book.data
+        if self.records and self.needs_compaction():
+            self.compact()
+
+    def write_in_file(self) -> None:
+        """
+        Close the journal, compacting it first if it is over the threshold.
+
+        Unlike FileHandler.write_in_file, this does not rewrite the snapshot
+        on every exit.
+        """
+        if self.records and self.needs_compaction():
+            self.compact()
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the journal file if it is open.
+        """
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
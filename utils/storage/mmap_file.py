@@ -0,0 +1,145 @@
+import sys
+from pathlib import Path
+from typing import Any, Dict
+from app.contacts import AddressBook, MmapContacts, write_mmap_file
+from app.logs import logger
+from utils.file_handler import FileHandler, fsync_directory
+
+
+def migrate_pickle_to_mmap(pickle_path: Path, mmap_path: Path) -> int:
+    """
+    Convert a pickled contacts file into the memory-mapped format.
+
+    :param pickle_path: Existing contacts.bin written by FileHandler.
+    :type pickle_path: Path
+    :param mmap_path: Destination file in the memory-mapped format.
+    :type mmap_path: Path
+    :return: Number of migrated contacts.
+    :rtype: int
+    """
+    contacts = FileHandler(Path(pickle_path)).read_file()
+    count = write_mmap_file(Path(mmap_path), contacts.values())
+    logger.info("Migrated %s contacts from %s to %s", count, pickle_path, mmap_path)
+    return count
+
+
+class MmapFileHandler(FileHandler):
+    """
+    Stores contacts in a sorted binary file that is opened with mmap.
+
+    read_file() only maps the file and reads its header, so a command that
+    touches a single contact decodes only that contact's record. The file is
+    rewritten only if the book was changed since it was loaded or last saved.
+
+    The file lives next to contacts.bin with the MMAP_SUFFIX extension. If it
+    does not exist yet but a pickled contacts.bin does, the pickle is migrated
+    on the first start.
+    """
+
+    MMAP_SUFFIX = ".abm"
+
+    def __init__(
+        self,
+        path: Path,
+        data: Dict[str, Any] = None,
+        durability: str = "flush",
+        checksum: bool = True,
+    ) -> None:
+        """
+        Initialize a MmapFileHandler object.
+
+        The mmap file is always replaced atomically (write_mmap_file), even with
+        durability "none"; 'checksum' only applies to a pickle being migrated,
+        the mmap format has its own header.
+
+        :param path: Path to contacts.bin (the mmap file is stored next to it).
+        :type path: Path
+        :param data: Initial contact data (optional).
+        :type data: Dict[str, Any], optional
+        :param durability: One of DURABILITY_MODES.
+        :type durability: str
+        :param checksum: Verify the checksum footer of a pickle being migrated.
+        :type checksum: bool
+        """
+        super().__init__(path, data, durability=durability, checksum=checksum)
+        self.mmap_path = Path(path).with_suffix(self.MMAP_SUFFIX)
+
+    def read_file(self) -> MmapContacts:
+        """
+        Map the contacts file, migrating an existing pickle file first if needed.
+
+        :return: Lazily decoded contacts.
+        :rtype: MmapContacts
+        """
+        if not self.mmap_path.exists() and self.path.exists() and self.path.stat().st_size > 0:
+            migrate_pickle_to_mmap(self.path, self.mmap_path)
+
+        self.data = MmapContacts(self.mmap_path)
+        logger.debug("Mapped file: %s", self.mmap_path)
+        return self.data
+
+    def update_contacts(self, address_book: AddressBook) -> None:
+        """
+        Keep a reference to the book's contacts; they are written in write_in_file().
+
+        :param address_book: AddressBook object containing contacts to update.
+        :type address_book: AddressBook
+        """
+        self.data = address_book.data
+        self.dirty = self.changed(address_book)
+        self._data_mutations = address_book.mutations
+
+    def checkpoint(self, address_book: AddressBook) -> None:
+        """
+        Write the current contacts to a new mmap file without closing the open map.
+
+        write_mmap_file() replaces the file with os.replace(), so the old map
+        stays valid and the changes stay in its overlay until the final
+        write_in_file().
+
+        :param address_book: AddressBook object containing contacts to save.
+        :type address_book: AddressBook
+        """
+        self.data = address_book.data
+        if not self.changed(address_book):
+            return
+        if isinstance(self.data, MmapContacts):
+            contacts = list(self.data.iter_contacts())
+        else:
+            contacts = list(self.data.values())
+        self._write(contacts)
+        self.saved_mutations = address_book.mutations
+        logger.info("Wrote data to file: %s", self.mmap_path)
+
+    def _write(self, contacts: list) -> None:
+        write_mmap_file(
+            self.mmap_path, contacts, fsync=self.durability in ("fsync", "fsync+dir")
+        )
+        if self.durability == "fsync+dir":
+            fsync_directory(self.mmap_path.parent)
+
+    def write_in_file(self) -> None:
+        """
+        Rewrite the mmap file if the contacts were changed, then close the map.
+
+        Changes already written by checkpoint() are not written again.
+        """
+        if isinstance(self.data, MmapContacts) and (not self.dirty or not self.data.changed):
+            self.data.close()
+            return
+
+        if isinstance(self.data, MmapContacts):
+            contacts = list(self.data.iter_contacts())
+            self.data.close()
+        else:
+            contacts = list(self.data.values())
+        self._write(contacts)
+        self.saved_mutations = self._data_mutations
+        logger.info("Wrote data to file: %s", self.mmap_path)
+
+
+if __name__ == "__main__":
+    # Usage: python -m utils.storage.mmap_file <contacts.bin> [<contacts.abm>]
+    source = Path(sys.argv[1])
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else source.with_suffix(MmapFileHandler.MMAP_SUFFIX)
+    print(f"Migrated {migrate_pickle_to_mmap(source, target)} contacts to {target}.")
@@ -0,0 +1,212 @@
+import multiprocessing
+import pickle
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from app.contacts import AddressBook, Contact
+from app.logs import logger
+from utils.file_handler import CorruptedFileError, FileHandler
+
+
+def shard_of(fullname: str, shards: int) -> int:
+    """
+    Return the shard number of a contact: CRC32 of the normalized full name modulo 'shards'.
+
+    CRC32 is used instead of hash(), which differs between interpreter runs.
+    """
+    return zlib.crc32(AddressBook.normalize_name(fullname).encode("utf-8")) % shards
+
+
+def _load_shard(path: Path) -> Dict[str, Contact]:
+    # Runs in a worker process; errors are handled by the parent
+    if not path.exists() or path.stat().st_size == 0:
+        return {}
+    return FileHandler.load_snapshot(path)
+
+
+def _write_shard(job: Tuple[Path, Dict[str, Contact], str, bool]) -> None:
+    # Runs in a worker process
+    path, data, durability, checksum = job
+    FileHandler(path, durability=durability, checksum=checksum).write_snapshot(data)
+
+
+class ShardedFileHandler(FileHandler):
+    """
+    Stores contacts in several pickle files (shards) instead of one contacts.bin.
+
+    A contact goes to the shard given by shard_of() of its full name. The shards
+    live in the SHARDS_SUFFIX directory next to contacts.bin. Changes are
+    followed through AddressBook.subscribe(), so only the shards touched since
+    the last save are written again.
+
+    With workers > 1 the shards are loaded and written by a process pool. The
+    contacts still cross the process boundary as pickles, so this process
+    does about the same (un)pickling work as without the pool; it pays off
+    only when reading and writing the files, not pickling, is the bottleneck.
+
+    The number of shards is fixed when the directory is created; an existing
+    directory keeps its own number. An existing contacts.bin is split into
+    shards on the first save.
+    """
+
+    SHARDS_SUFFIX = ".shards"
+
+    def __init__(
+        self,
+        path: Path,
+        data: Dict[str, Any] = None,
+        shards: int = 8,
+        workers: int = 1,
+        durability: str = "flush",
+        checksum: bool = True,
+    ) -> None:
+        """
+        Initialize a ShardedFileHandler object.
+
+        :param path: Path to contacts.bin (the shard directory is stored next to it).
+        :type path: Path
+        :param data: Initial dictionary of contact data (optional).
+        :type data: Dict[str, Any], optional
+        :param shards: Number of shards of a new shard directory.
+        :type shards: int
+        :param workers: Number of worker processes; 1 loads and writes the shards in this process.
+        :type workers: int
+        :param durability: One of DURABILITY_MODES, applied to every shard.
+        :type durability: str
+        :param checksum: Append a CRC32 footer to every shard.
+        :type checksum: bool
+        :raises ValueError: If 'shards' or 'workers' is less than 1, or the durability is unknown.
+        """
+        if shards < 1 or workers < 1:
+            raise ValueError(
+                f"The number of shards and workers must be at least 1, got {shards} and {workers}."
+            )
+        super().__init__(path, data, durability=durability, checksum=checksum)
+        self.shard_directory = Path(path).with_suffix(self.SHARDS_SUFFIX)
+        # Shard files are named "shard-<number>-of-<shards>.bin"
+        existing = next(self.shard_directory.glob("shard-*-of-*.bin"), None)
+        self.shards = int(existing.stem.rsplit("-", 1)[1]) if existing else shards
+        self.workers = workers
+        # Keys stored in every shard and the shards changed since the last save
+        self.shard_keys: List[set] = [set() for _ in range(self.shards)]
+        self.dirty_shards = set()
+        self.address_book: Optional[AddressBook] = None
+
+    def shard_path(self, number: int) -> Path:
+        return self.shard_directory / f"shard-{number:03d}-of-{self.shards:03d}.bin"
+
+    def _map(self, function, jobs: list) -> list:
+        """
+        Run 'function' over 'jobs' in worker processes, or in this process for one worker.
+        """
+        if self.workers <= 1 or len(jobs) <= 1:
+            return [function(job) for job in jobs]
+        # "spawn" does not copy the threads of this process (e.g. the log writer) into a fork
+        with ProcessPoolExecutor(
+            min(self.workers, len(jobs)), mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            return list(pool.map(function, jobs))
+
+    def read_file(self) -> Dict[str, Contact]:
+        """
+        Load all shards and merge them into one dictionary.
+
+        Without a shard directory an existing contacts.bin is loaded instead;
+        it is split into shards the first time the book is saved. An unreadable
+        shard is moved aside like an unreadable contacts.bin (see FileHandler.read_file).
+
+        :return: Dictionary containing the contact data.
+        :rtype: Dict[str, Contact]
+        """
+        if not self.shard_directory.exists():
+            super().read_file()
+            for key in self.data:
+                self.shard_keys[shard_of(key, self.shards)].add(key)
+            return self.data
+
+        paths = [self.shard_path(number) for number in range(self.shards)]
+        try:
+            parts = self._map(_load_shard, paths)
+        except (pickle.UnpicklingError, EOFError, CorruptedFileError, OSError) as e:
+            logger.warning("Error reading shards in %s: %s", self.shard_directory, e)
+            parts = []
+            for path in paths:
+                try:
+                    parts.append(_load_shard(path))
+                except (pickle.UnpicklingError, EOFError, CorruptedFileError, OSError) as e:
+                    logger.warning("Error reading file %s: %s", path, e)
+                    self._move_aside(path)
+                    parts.append({})
+
+        self.data = {}
+        for number, part in enumerate(parts):
+            self.shard_keys[number] = set(part)
+            self.data.update(part)
+        logger.debug("Loaded %s shards from %s", self.shards, self.shard_directory)
+        return self.data
+
+    def attach(self, address_book: AddressBook) -> None:
+        """
+        Subscribe to the AddressBook to mark the shards of changed contacts.
+
+        :param address_book: AddressBook object populated from read_file().
+        :type address_book: AddressBook
+        """
+        super().attach(address_book)
+        self.address_book = address_book
+        address_book.subscribe(self._mark)
+
+    def _mark(self, operation: str, contact: Contact) -> None:
+        number = shard_of(contact.fullname, self.shards)
+        if operation == "delete":
+            self.shard_keys[number].discard(contact.fullname)
+        else:
+            self.shard_keys[number].add(contact.fullname)
+        self.dirty_shards.add(number)
+
+    def update_contacts(self, address_book: AddressBook) -> None:
+        """
+        Keep a reference to the book's contacts; the changed shards are written in write_in_file().
+
+        A book that was not attached is not followed, so all of its shards are written.
+
+        :param address_book: AddressBook object containing contacts to update.
+        :type address_book: AddressBook
+        """
+        self.data = address_book.data
+        self.dirty = self.changed(address_book)
+        self._data_mutations = address_book.mutations
+        if self.address_book is None:
+            self.shard_keys = [set() for _ in range(self.shards)]
+            for key in self.data:
+                self.shard_keys[shard_of(key, self.shards)].add(key)
+            self.dirty_shards = set(range(self.shards))
+
+    def write_in_file(self) -> None:
+        """
+        Write the shards changed since the last save, in parallel.
+
+        A new shard directory gets every shard, even empty ones.
+        """
+        if not self.dirty:
+            return
+
+        if not self.shard_directory.exists():
+            self.shard_directory.mkdir()
+            self.dirty_shards = set(range(self.shards))
+        jobs = [
+            (
+                self.shard_path(number),
+                {key: self.data[key] for key in self.shard_keys[number]},
+                self.durability,
+                self.checksum,
+            )
+            for number in sorted(self.dirty_shards)
+        ]
+        self._map(_write_shard, jobs)
+        logger.info(
+            "Wrote %s of %s shards to %s", len(jobs), self.shards, self.shard_directory
+        )
+        self.dirty_shards = set()
+        self.saved_mutations = self._data_mutations
@@ -0,0 +1,98 @@
+from pathlib import Path
+from typing import Any, Dict
+from app.contacts import AddressBook, SqliteContacts
+from app.logs import logger
+from utils.file_handler import FileHandler
+
+
+class SqliteFileHandler(FileHandler):
+    """
+    Stores contacts in an SQLite database (stdlib sqlite3) instead of a pickle file.
+
+    read_file() only opens the database; lookups, prefix searches and reverse
+    lookups are answered by its indexes and "all" streams rows from a cursor,
+    so the book is never loaded as a whole. Every change made through the
+    AddressBook is committed right away as one small transaction, so
+    write_in_file() only closes the database.
+
+    The database lives next to contacts.bin with the SQLITE_SUFFIX extension.
+    If it does not exist yet but a pickled contacts.bin does, the pickle is
+    copied into it on the first start.
+    """
+
+    SQLITE_SUFFIX = ".db"
+
+    def __init__(
+        self,
+        path: Path,
+        data: Dict[str, Any] = None,
+        durability: str = "flush",
+        checksum: bool = True,
+    ) -> None:
+        """
+        Initialize a SqliteFileHandler object.
+
+        :param path: Path to contacts.bin (the database is stored next to it).
+        :type path: Path
+        :param data: Initial contact data (optional).
+        :type data: Dict[str, Any], optional
+        :param durability: One of DURABILITY_MODES, mapped to PRAGMA synchronous
+            ("flush" is NORMAL, which in WAL mode survives a crash of the program).
+        :type durability: str
+        :param checksum: Verify the checksum footer of a pickle being migrated.
+        :type checksum: bool
+        """
+        super().__init__(path, data, durability=durability, checksum=checksum)
+        self.sqlite_path = Path(path).with_suffix(self.SQLITE_SUFFIX)
+
+    def read_file(self) -> SqliteContacts:
+        """
+        Open the database, copying an existing pickle file into it first if needed.
+
+        :return: Contacts read from the database on access.
+        :rtype: SqliteContacts
+        """
+        migrate = (
+            not self.sqlite_path.exists() and self.path.exists() and self.path.stat().st_size > 0
+        )
+        self.data = SqliteContacts(self.sqlite_path, self.durability)
+        if migrate:
+            contacts = FileHandler(self.path).read_file()
+            self.data.insert_many(contacts.values())
+            logger.info(
+                "Migrated %s contacts from %s to %s", len(contacts), self.path, self.sqlite_path
+            )
+
+        logger.debug("Opened database: %s", self.sqlite_path)
+        return self.data
+
+    def update_contacts(self, address_book: AddressBook) -> None:
+        """
+        Keep a reference to the book's contacts; every change is already committed.
+
+        :param address_book: AddressBook object containing contacts to update.
+        :type address_book: AddressBook
+        """
+        self.data = address_book.data
+
+    def checkpoint(self, address_book: AddressBook) -> None:
+        """
+        Nothing to do: every change is committed when it is made.
+
+        :param address_book: AddressBook object containing contacts to save.
+        :type address_book: AddressBook
+        """
+        self.data = address_book.data
+
+    def write_in_file(self) -> None:
+        """
+        Close the database; a book of another type is written into the database first.
+        """
+        if isinstance(self.data, SqliteContacts):
+            self.data.close()
+            return
+
+        database = SqliteContacts(self.sqlite_path, self.durability)
+        database.insert_many(self.data.values())
+        database.close()
+        logger.info("Wrote data to file: %s", self.sqlite_path)
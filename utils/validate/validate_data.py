@@ -1,5 +1,11 @@
 import re
-from utils.errors import InvalidCommandError, InvalidArgumentError
+from typing import Optional, Tuple
+from utils.errors import (
+    InvalidCommandError,
+    InvalidArgumentError,
+    MissingRequiredArgumentError,
+)
+from utils.commands import COMMANDS
 from app.logs import logger
 
 
@@ -14,26 +20,29 @@ class ValidateData:
     :ivar str | None email: Email parsed from arguments
     """
 
-    ALLOWED_COMMANDS = [
-        "exit",
-        "q",
-        "close",
-        "add",
-        "phone",
-        "email",
-        "change_phone",
-        "c_p",
-        "change_email",
-        "c_e",
-        "all",
-        "delete",
-        "del",
-    ]
+    # Every command name and alias -> its CommandSpec (the registry of utils.commands)
+    ALLOWED_COMMANDS = COMMANDS
 
     NAME_PATTERN = r"^[A-Za-z'-]+$"
     PHONE_PATTERN = r"^\+\d{1,3}\d{6,12}$"
     EMAIL_PATTERN = r"^[\w\.-]+@[\w\.-]+\.[\w\.-]+$"
 
+    # Precompiled patterns (shared with CommandHandler) and one combined pattern
+    # that classifies a token as name, phone or email in a single match
+    NAME_RE = re.compile(NAME_PATTERN)
+    PHONE_RE = re.compile(PHONE_PATTERN)
+    EMAIL_RE = re.compile(EMAIL_PATTERN)
+    TOKEN_RE = re.compile(
+        "|".join(
+            f"(?P<{group}>{pattern})"
+            for group, pattern in (
+                ("name", NAME_PATTERN),
+                ("phone", PHONE_PATTERN),
+                ("email", EMAIL_PATTERN),
+            )
+        )
+    )
+
     def __init__(self, command: str, args: list) -> None:
         """
         Initialize a ValidateData instance and parse arguments.
@@ -55,51 +64,109 @@ class ValidateData:
     def parse_args(self) -> None:
         """
         Parse command arguments and classify them into first name, last name, phone, or email.
+
+        Every argument is classified with one match of the combined TOKEN_RE pattern.
+        The alternatives are tried in the same order as before (name, phone, email).
         """
+        # Arguments of commands like "import <file>" are not contact data
+        # (CommandSpec.raw_args); they are kept as they are in 'args'
+        if self.ALLOWED_COMMANDS[self.command].raw_args:
+            return
+
         parts_name = []
 
         # Parse the command arguments and classify them into first name, last name, phone, or email.
         # If an argument does not match any expected pattern, raise an InvalidArgumentError.
         # Assign first_name and last_name based on the order of name parts detected.
         for item in self.args:
-            if re.match(self.NAME_PATTERN, item):
-                parts_name.append(item.strip().capitalize())
-                logger.debug(f"Detected name part: {item.strip().capitalize()}")
+            match = self.TOKEN_RE.match(item)
+            kind = match.lastgroup if match else None
+
+            if kind == "name":
+                name_part = item.strip().capitalize()
+                parts_name.append(name_part)
+                logger.debug("Detected name part: %s", name_part)
                 continue
 
-            if re.match(self.PHONE_PATTERN, item):
+            if kind == "phone":
                 self.phone = item.strip()
-                logger.debug(f"Detected phone: {self.phone}")
+                logger.debug("Detected phone: %s", self.phone)
                 continue
 
-            if re.match(self.EMAIL_PATTERN, item):
+            if kind == "email":
                 self.email = item.strip()
-                logger.debug(f"Detected email: {self.email}")
+                logger.debug("Detected email: %s", self.email)
                 continue
 
-            logger.warning(f"Invalid argument detected: '{item}'")
+            logger.warning("Invalid argument detected: '%s'", item)
             raise InvalidArgumentError(f"Invalid argument detected: '{item}'")
 
         # Determine first_name and last_name based on the parts_name list
         if len(parts_name) >= 1:
             self.first_name = parts_name[0]
-            logger.debug(f"Set first_name: {self.first_name}")
+            logger.debug("Set first_name: %s", self.first_name)
 
         if len(parts_name) >= 2:
             self.last_name = parts_name[1]
-            logger.debug(f"Set last_name: {self.last_name}")
+            logger.debug("Set last_name: %s", self.last_name)
+
+    @classmethod
+    def validate_fields(
+        cls,
+        first_name: Optional[str],
+        last_name: Optional[str],
+        phone: Optional[str],
+        email: Optional[str],
+    ) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+        """
+        Validate already separated contact fields (for example a row of an imported file).
+
+        Applies the same rules as parse_args: names must match NAME_PATTERN and are
+        capitalized, the phone and email must match their patterns, and at least one
+        of them is required. Empty strings are treated as missing values.
+
+        :return: Tuple (first_name, last_name, phone, email) with normalized values.
+        :rtype: Tuple[str, Optional[str], Optional[str], Optional[str]]
+        :raises MissingRequiredArgumentError: If the first name or both phone and email are missing.
+        :raises InvalidArgumentError: If a field does not match its pattern.
+        """
+        first_name, last_name, phone, email = (
+            value.strip() or None if value else None
+            for value in (first_name, last_name, phone, email)
+        )
+
+        if first_name is None:
+            raise MissingRequiredArgumentError("Required argument not provided: name.")
+        if phone is None and email is None:
+            raise MissingRequiredArgumentError("Required argument not provided: phone or email.")
+
+        for value, pattern in (
+            (first_name, cls.NAME_RE),
+            (last_name, cls.NAME_RE),
+            (phone, cls.PHONE_RE),
+            (email, cls.EMAIL_RE),
+        ):
+            if value is not None and not pattern.match(value):
+                raise InvalidArgumentError(f"Invalid argument detected: '{value}'")
+
+        return (
+            first_name.capitalize(),
+            last_name.capitalize() if last_name else None,
+            phone,
+            email,
+        )
 
     @staticmethod
     def validate_command(command: str) -> str:
         """
-        Validate if the command exists in the allowed commands.
+        Validate if the command is registered in ALLOWED_COMMANDS (one dictionary lookup).
 
         :param str command: The command to validate
         :return str: The validated command
         """
         if command not in ValidateData.ALLOWED_COMMANDS:
-            logger.warning(f"Invalid command detected: '{command}'")
+            logger.warning("Invalid command detected: '%s'", command)
             raise InvalidCommandError(f'Entered command does not exist: "{command}".')
         else:
-            logger.info(f"Valid command detected: {command}.")
+            logger.info("Valid command detected: %s.", command)
             return command
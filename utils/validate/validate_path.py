@@ -23,8 +23,9 @@ class ValidatePath:
         """
         Validates the file path and ensures its parent directory exists.
 
-        Attempts to convert the stored path to a Path object. If the parent
-        directory does not exist, it will be created.
+        Attempts to convert the stored path to a Path object. An existing file is
+        returned right away; otherwise, if the parent directory does not exist,
+        it will be created.
 
         :returns: The validated Path object or None if an error occurred.
         :rtype: Path | None
@@ -32,17 +33,21 @@ class ValidatePath:
         try:
             self.path = Path(self.path)
         except OSError as e:
-            logger.warning(f"Error resolving path: {e}")
+            logger.warning("Error resolving path: %s", e)
             return None
 
+        # The usual case: the file is already there, so the directory needs no checks
+        if self.path.is_file():
+            return self.path
+
         # If the directory does not exist — create it
         if not self.path.parent.exists():
-            logger.warning(f"Directory does not exist: {self.path.parent}.")
+            logger.warning("Directory does not exist: %s.", self.path.parent)
             print()
             self.path.parent.mkdir(parents=True, exist_ok=True)
-            logger.info(f"Directory created: {self.path.parent}.")
+            logger.info("Directory created: %s.", self.path.parent)
             print(f'Path directory - "{self.path.parent}" created')
         else:
-            logger.info(f"The directory at path {self.path.parent} already exists.")
+            logger.info("The directory at path %s already exists.", self.path.parent)
 
         return self.path